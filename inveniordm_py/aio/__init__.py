@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# inveniordm-py is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+"""Asynchronous (asyncio) client."""
+
+from .client import AsyncInvenioAPI
+
+__all__ = ("AsyncInvenioAPI",)
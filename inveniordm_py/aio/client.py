@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# inveniordm-py is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Asynchronous Invenio REST API client."""
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+from ..codec import get_codec
+from .records import AsyncRecordList
+
+
+class AsyncInvenioAPI:
+    """Asynchronous InvenioRDM REST API client.
+
+    Usage:
+
+    .. code-block:: python
+
+        async with AsyncInvenioAPI(base_url, token) as api:
+            draft = await api.records.create()
+            record = await api.records("1234").get()
+
+    Requires the optional ``httpx`` dependency (``pip install
+    inveniordm-py[async]``).
+    """
+
+    def __init__(
+        self,
+        base_url,
+        access_token,
+        session=None,
+        max_connections=100,
+        max_keepalive_connections=20,
+        timeout=30.0,
+        transport=None,
+        lazy_metadata=False,
+        codec=None,
+        instrumentation=None,
+    ):
+        """Initialize client.
+
+        :param session: an ``httpx.AsyncClient`` to use instead of creating one.
+        :param max_connections: maximum number of concurrent connections.
+        :param max_keepalive_connections: maximum number of idle connections
+            kept in the pool.
+        :param timeout: default timeout (in seconds) of a request.
+        :param transport: an ``httpx`` async transport, e.g. an
+            ``httpx.MockTransport`` or ``httpx.ASGITransport`` to run the
+            client against an in-process server.
+        :param lazy_metadata: keep the raw bodies of the responses and only
+            decode them when their metadata is accessed.
+        :param codec: JSON codec of the request and response bodies, see
+            :func:`~inveniordm_py.codec.get_codec`.
+        :param instrumentation: an
+            :class:`~inveniordm_py.instrumentation.Instrumentation` recording
+            the requests of the client.
+        """
+        from inveniordm_py import __version__
+
+        if httpx is None:
+            raise RuntimeError(
+                "The asynchronous client requires 'httpx', install it with "
+                "'pip install inveniordm-py[async]'."
+            )
+
+        self._base_url = base_url[:-1] if base_url.endswith("/") else base_url
+        self._access_token = access_token
+        self.lazy_metadata = lazy_metadata
+        self.codec = get_codec(codec)
+        self.instrumentation = instrumentation
+        self.session = session or httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+            ),
+            timeout=timeout,
+            transport=transport,
+        )
+        self.session.headers["User-Agent"] = f"Invenio API Client/{__version__}"
+        self.session.headers["Authorization"] = f"Bearer {self._access_token}"
+
+    async def __aenter__(self):
+        """Enter the client context."""
+        return self
+
+    async def __aexit__(self, *exc_info):
+        """Close the client connection pool."""
+        await self.aclose()
+
+    async def aclose(self):
+        """Close the client connection pool."""
+        await self.session.aclose()
+
+    @property
+    def records(self):
+        """Get a record list resource."""
+        return AsyncRecordList(client=self)
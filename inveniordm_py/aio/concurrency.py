@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# inveniordm-py is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Helpers to run many requests concurrently, with asyncio."""
+
+import asyncio
+from collections import deque
+
+from ..concurrency import BulkResult
+
+
+async def _call(func, index, item, semaphore):
+    """Await a function on an item, capturing its error in the result."""
+    try:
+        async with semaphore:
+            return BulkResult(index, item, result=await func(item))
+    except Exception as e:
+        return BulkResult(index, item, error=e)
+
+
+async def bulk_map(func, items, max_workers=4, ordered=True):
+    """Apply a coroutine function to items concurrently.
+
+    Asynchronous version of :func:`inveniordm_py.concurrency.bulk_map`: at
+    most ``2 * max_workers`` items are in flight, of which at most
+    ``max_workers`` are processed at a time.
+    """
+    window = 2 * max_workers
+    semaphore = asyncio.Semaphore(max_workers)
+    pending = deque() if ordered else set()
+    for index, item in enumerate(items):
+        task = asyncio.ensure_future(_call(func, index, item, semaphore))
+        if ordered:
+            pending.append(task)
+            if len(pending) >= window:
+                yield await pending.popleft()
+        else:
+            pending.add(task)
+            if len(pending) >= window:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    yield task.result()
+    if ordered:
+        while pending:
+            yield await pending.popleft()
+    else:
+        for task in asyncio.as_completed(pending):
+            yield await task
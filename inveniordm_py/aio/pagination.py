@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# inveniordm-py is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Asynchronous pagination classes."""
+
+import asyncio
+from collections import deque
+
+from ..pagination import PartitionedPagination, _done
+
+
+async def _drain(queue):
+    """Yield the items of a queue until done, raising the errors put in it."""
+    while True:
+        item = await queue.get()
+        if item is _done:
+            return
+        if isinstance(item, Exception):
+            raise item
+        yield item
+
+
+class AsyncPrefetchPagination:
+    """Asynchronous iterator over the hits of all the pages of a search.
+
+    Same as :class:`~inveniordm_py.pagination.PrefetchPagination`, with the
+    pages being fetched by a background task instead of a thread.
+    """
+
+    __slots__ = ("_fetch_page", "_factory", "_prefetch")
+
+    _done = object()
+
+    def __init__(self, fetch_page, factory, prefetch=2):
+        """Initialize pagination object."""
+        self._fetch_page = fetch_page
+        self._factory = factory
+        self._prefetch = prefetch
+
+    async def _produce(self, queue):
+        """Fetch pages into the queue, following the next links."""
+        url = None
+        try:
+            while True:
+                page = await self._fetch_page(url)
+                await queue.put(page)
+                url = page.links.get("next")
+                if not url or not page.hits:
+                    break
+        except Exception as e:
+            await queue.put(e)
+        else:
+            await queue.put(self._done)
+
+    async def pages(self):
+        """Iterator over the pages of the search results."""
+        queue = asyncio.Queue(maxsize=max(self._prefetch, 1))
+        producer = asyncio.ensure_future(self._produce(queue))
+        try:
+            while True:
+                page = await queue.get()
+                if page is self._done:
+                    return
+                if isinstance(page, Exception):
+                    raise page
+                yield page
+        finally:
+            producer.cancel()
+
+    async def __aiter__(self):
+        """Iterator over the search hits of all the pages."""
+        async for page in self.pages():
+            for h in page.hits:
+                yield self._factory(h)
+
+
+class AsyncPartitionedPagination(PartitionedPagination):
+    """Asynchronous iterator over all the hits of a search, beyond its window.
+
+    Same as :class:`~inveniordm_py.pagination.PartitionedPagination`, with the
+    partitions being counted and fetched by at most ``max_workers`` tasks
+    instead of threads. ``count`` and ``scan`` respectively return a
+    coroutine and an asynchronous iterable.
+    """
+
+    __slots__ = ()
+
+    async def partitions(self):
+        """Compute the partitions, sorted by range.
+
+        :returns: a list of ``(lower, upper, total)`` tuples.
+        """
+        semaphore = asyncio.Semaphore(self._max_workers)
+
+        async def count(lower, upper):
+            async with semaphore:
+                return lower, upper, await self._count(self.query(lower, upper))
+
+        result = []
+        pending = {asyncio.ensure_future(count(self._lower, self._upper))}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    lower, upper, total = task.result()
+                    if total > self._partition_size:
+                        for half in self._split(lower, upper):
+                            pending.add(asyncio.ensure_future(count(*half)))
+                    elif total > 0:
+                        result.append((lower, upper, total))
+        finally:
+            for task in pending:
+                task.cancel()
+        return sorted(result)
+
+    async def _produce(self, q, queue):
+        """Fetch the hits of a partition into the queue."""
+        try:
+            async for hit in self._scan(q):
+                await queue.put(hit)
+        except Exception as e:
+            await queue.put(e)
+        else:
+            await queue.put(_done)
+
+    def __iter__(self):
+        """Synchronous iteration is not supported, use ``async for``."""
+        raise TypeError("Use 'async for' to iterate over the partitioned hits.")
+
+    async def __aiter__(self):
+        """Iterator over the search hits of all the partitions."""
+        producers = deque()
+        try:
+            for lower, upper, _ in await self.partitions():
+                queue = asyncio.Queue(maxsize=self._buffer_size)
+                q = self.query(lower, upper)
+                producers.append(
+                    (queue, asyncio.ensure_future(self._produce(q, queue)))
+                )
+                if len(producers) >= self._max_workers:
+                    async for hit in _drain(producers[0][0]):
+                        yield hit
+                    producers.popleft()
+            while producers:
+                async for hit in _drain(producers[0][0]):
+                    yield hit
+                producers.popleft()
+        finally:
+            # Also reached when the consumer stops iterating early.
+            for _, producer in producers:
+                producer.cancel()
@@ -0,0 +1,496 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# inveniordm-py is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Asynchronous record resources.
+
+Each resource extends its synchronous counterpart, so that the endpoints and
+the metadata classes are shared between both clients. Only the methods
+instantiating related resources are overridden, to return the asynchronous
+variant.
+"""
+
+import os
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+from inveniordm_py.files.metadata import FileMetadata, IncomingStream, OutgoingStream
+from inveniordm_py.files.transfer import ChecksumVerifier, content_size, remove_file
+from inveniordm_py.records.metadata import (
+    DraftMetadata,
+    RecordListMetadata,
+    RecordMetadata,
+)
+from inveniordm_py.records.resources import (
+    Draft,
+    DraftFile,
+    DraftFilesList,
+    FileResource,
+    GetManyResult,
+    Record,
+    RecordCommunitiesList,
+    RecordFile,
+    RecordFilesList,
+    RecordList,
+    RecordVersions,
+)
+from inveniordm_py.sync import SyncCheckpoint
+
+from .concurrency import bulk_map
+from .pagination import AsyncPartitionedPagination
+from .resources import AsyncResource
+from .transfer import AsyncMultipartUpload, AsyncSegmentedDownload
+
+
+class AsyncRecord(AsyncResource, Record):
+    """Asynchronous version of :class:`~inveniordm_py.records.resources.Record`."""
+
+    __slots__ = ()
+
+    @property
+    def draft(self):
+        """Creates and returns a record draft API object."""
+        return AsyncDraft(self._client, **self.endpoint_args)
+
+    @property
+    def versions(self):
+        """Creates and returns record versions API object."""
+        return AsyncRecordVersions(self._client, **self.endpoint_args)
+
+    @property
+    def files(self):
+        """Record files."""
+        return AsyncRecordFilesList(self._client, **self.endpoint_args)
+
+    @property
+    def communities(self):
+        """Creates and returns a record communities API object."""
+        return AsyncRecordCommunitiesList(self._client, **self.endpoint_args)
+
+
+class AsyncRecordVersions(AsyncResource, RecordVersions):
+    """Asynchronous version of :class:`~inveniordm_py.records.resources.RecordVersions`."""
+
+    __slots__ = ()
+
+    async def create(self):
+        """Create a new draft version of a published record."""
+        return await self._post(
+            DraftMetadata, resource=AsyncDraft(self._client, **self.endpoint_args)
+        )
+
+    async def latest(self):
+        """Get the latest version of a record."""
+        return await self._get(
+            RecordMetadata,
+            url_suffix="/latest",
+            resource=AsyncRecord(self._client, **self.endpoint_args),
+        )
+
+    async def search(self, q="", page=1, size=10, sort="newest", allversions=True):
+        """Search for record versions."""
+        params = dict(q=q, page=page, size=size, sort=sort)
+        if allversions:
+            params["allversions"] = "1"
+
+        return await self._search(
+            params,
+            RecordListMetadata,
+            self._make_factory(AsyncRecord),
+            self._partial(self.search, params, page=params["page"] - 1),
+            self._partial(self.search, params, page=params["page"] + 1),
+        )
+
+    def scan(self, q="", size=100, sort="newest", allversions=True, prefetch=2):
+        """Iterate (``async for``) over all the versions of a record."""
+        params = dict(q=q, size=size, sort=sort)
+        if allversions:
+            params["allversions"] = "1"
+        return self._scan(
+            params,
+            RecordListMetadata,
+            self._make_factory(AsyncRecord),
+            prefetch=prefetch,
+        )
+
+
+class AsyncDraft(AsyncResource, Draft):
+    """Asynchronous version of :class:`~inveniordm_py.records.resources.Draft`."""
+
+    __slots__ = ()
+
+    @property
+    def files(self):
+        """Draft files."""
+        return AsyncDraftFilesList(self._client, **self.endpoint_args)
+
+    async def publish(self):
+        """Publish draft."""
+        return await self._post(
+            RecordMetadata,
+            url_suffix="/actions/publish",
+            resource=AsyncRecord(self._client, **self.endpoint_args),
+        )
+
+
+class AsyncRecordList(AsyncResource, RecordList):
+    """Asynchronous version of :class:`~inveniordm_py.records.resources.RecordList`."""
+
+    __slots__ = ()
+
+    def __call__(self, id_):
+        """Instantiate a record item resource."""
+        return AsyncRecord(self._client, id_=id_)
+
+    @property
+    def draft(self):
+        """Creates and returns a record draft API object."""
+        return AsyncDraft(self._client, **self.endpoint_args)
+
+    def bulk_create(self, items, concurrency=4, ordered=True):
+        """Create many drafts concurrently (``async for``)."""
+
+        async def create(data):
+            if not isinstance(data, DraftMetadata):
+                data = DraftMetadata(**data)
+            return await self.create(data)
+
+        return bulk_map(create, items, max_workers=concurrency, ordered=ordered)
+
+    async def search(self, q="", page=1, size=10, sort="newest", allversions=False):
+        """Search for records."""
+        params = dict(q=q, page=page, size=size, sort=sort)
+        if allversions:
+            params["allversions"] = "1"
+        return await self._search(
+            params,
+            RecordListMetadata,
+            self._make_factory(AsyncRecord),
+            self._partial(self.search, params, page=params["page"] - 1),
+            self._partial(self.search, params, page=params["page"] + 1),
+        )
+
+    def scan(self, q="", size=100, sort="newest", allversions=False, prefetch=2):
+        """Iterate (``async for``) over all the records matching a query."""
+        params = dict(q=q, size=size, sort=sort)
+        if allversions:
+            params["allversions"] = "1"
+        return self._scan(
+            params,
+            RecordListMetadata,
+            self._make_factory(AsyncRecord),
+            prefetch=prefetch,
+        )
+
+    async def deep_scan(
+        self,
+        q="",
+        field="created",
+        size=100,
+        partition_size=10000,
+        max_workers=4,
+        allversions=False,
+    ):
+        """Iterate (``async for``) over all the records matching a query.
+
+        See :meth:`RecordList.deep_scan`, at most ``max_workers`` partitions
+        are counted and fetched at a time.
+        """
+        asc, desc = self.partition_sort_options[field]
+        first = await self.search(q=q, size=1, sort=asc, allversions=allversions)
+        if not len(first):
+            return
+        last = await self.search(q=q, size=1, sort=desc, allversions=allversions)
+
+        async def count(q_):
+            page = await self.search(q=q_, size=1, sort=asc, allversions=allversions)
+            return page.total
+
+        def scan(q_):
+            return self.scan(
+                q=q_, size=size, sort=asc, allversions=allversions, prefetch=0
+            )
+
+        pagination = AsyncPartitionedPagination(
+            count,
+            scan,
+            q,
+            field,
+            next(iter(first)).data[field],
+            next(iter(last)).data[field],
+            partition_size=partition_size,
+            max_workers=max_workers,
+        )
+        async for record in pagination:
+            yield record
+
+    def export(self, *args, **kwargs):
+        """Exports are not supported, use the synchronous client.
+
+        See :meth:`RecordList.export`, which writes the file from threads.
+        """
+        raise TypeError(
+            "export() is not supported by the async client, use InvenioAPI."
+        )
+
+    async def sync(self, checkpoint, q="", overlap=300, size=100, allversions=False):
+        """Iterate (``async for``) over the records changed since the last sync.
+
+        See :meth:`RecordList.sync`. The checkpoint file is read and written
+        with blocking calls, which are short compared to the searches.
+        """
+        checkpoint = SyncCheckpoint.load(checkpoint)
+        factory = self._make_factory(AsyncRecord)
+        since = checkpoint.since(overlap)
+        while True:
+            fetched = 0
+            pages = self._sync_scan(q, since, size, allversions).pages()
+            try:
+                async for page in pages:
+                    fetched += len(page.hits)
+                    for data in page.hits:
+                        if checkpoint.is_new(data):
+                            yield factory(data)
+                    done, restart = self._sync_page(
+                        checkpoint, page, overlap, since, fetched
+                    )
+                    if done:
+                        return
+                    if restart:
+                        break
+                else:
+                    raise ValueError(
+                        f"Cannot sync more than {fetched} records updated at "
+                        f"{since}."
+                    )
+            finally:
+                await pages.aclose()
+            since = page.hits[-1]["updated"]
+
+    async def get_many(self, ids, chunk_size=100, max_query_length=4000, concurrency=4):
+        """Get many records by ID, see :meth:`RecordList.get_many`."""
+        results = GetManyResult.fromkeys(str(id_) for id_ in ids)
+
+        async def search(chunk):
+            q = self._id_query(chunk)
+            return list(await self.search(q=q, size=len(chunk), allversions=True))
+
+        chunks = self._id_chunks(results, chunk_size, max_query_length)
+        async for res in bulk_map(search, chunks, max_workers=concurrency):
+            self._add_found(results, res)
+
+        async def get(id_):
+            return await self(id_).get()
+
+        async for res in bulk_map(get, results.missing, max_workers=concurrency):
+            self._add_fetched(results, res)
+        return results
+
+
+class AsyncRecordFilesList(AsyncResource, RecordFilesList):
+    """Asynchronous version of :class:`~inveniordm_py.records.resources.RecordFilesList`."""
+
+    __slots__ = ()
+
+    def __call__(self, key):
+        """Instantiate a record item resource."""
+        return AsyncRecordFile(self._client, filename=key, **self._endpoint_args)
+
+
+class AsyncFileResource(AsyncResource, FileResource):
+    """Asynchronous version of :class:`~inveniordm_py.records.resources.FileResource`."""
+
+    __slots__ = ()
+
+    async def iter_content(self, chunk_size=None):
+        """Iterate (``async for``) over the chunks of the file contents."""
+        response = await self.download()
+        try:
+            async for chunk in response.aiter_bytes(chunk_size or self.chunk_size):
+                yield chunk
+        finally:
+            await response.aclose()
+
+    async def _file_metadata(self):
+        """Get the file metadata, fetching it if not already known."""
+        if self._has_file_metadata():
+            return self.data
+        return (await self.get()).data
+
+    async def _fetch_range(self, start, end):
+        """Get the (streamed) response of a byte range of the file contents."""
+        return await self._get_raw(
+            IncomingStream,
+            url_suffix="/content",
+            headers={"range": f"bytes={start}-{end}"},
+            stream=True,
+        )
+
+    async def _content_size(self):
+        """Get the size of the file contents, from a one byte range request."""
+        response = await self._fetch_range(0, 0)
+        try:
+            return content_size(response)
+        finally:
+            await response.aclose()
+
+    async def download_to(self, path, chunk_size=None, verify=True):
+        """Download a file to the given path, with bounded memory usage.
+
+        The file is written with blocking calls, which are short compared to
+        the network reads. As with the synchronous client, it is downloaded
+        to ``<path>.part`` and only renamed to ``path`` once verified.
+        """
+        verifier = None
+        if verify:
+            verifier = ChecksumVerifier.from_metadata(await self._file_metadata())
+        tmp_path = f"{os.fspath(path)}.part"
+        try:
+            with open(tmp_path, "wb") as fp:
+                async for chunk in self.iter_content(chunk_size=chunk_size):
+                    fp.write(chunk)
+                    if verifier is not None:
+                        verifier.update(chunk)
+            if verifier is not None:
+                verifier.verify()
+        except BaseException:
+            remove_file(tmp_path)
+            raise
+        os.replace(tmp_path, path)
+        return path
+
+    async def download_segmented(
+        self,
+        path,
+        segment_size=64 * 1024 * 1024,
+        max_workers=4,
+        chunk_size=None,
+        verify=True,
+    ):
+        """Download a file to the given path, fetching byte ranges concurrently.
+
+        See :meth:`FileResource.download_segmented`, at most ``max_workers``
+        ranges are fetched at a time.
+        """
+        metadata = await self._file_metadata()
+        size = metadata._data.get("size")
+        if size is None:
+            size = await self._content_size()
+        if size is None:
+            return await self.download_to(path, chunk_size=chunk_size, verify=verify)
+
+        download = AsyncSegmentedDownload(
+            self._fetch_range,
+            path,
+            int(size),
+            segment_size=segment_size,
+            max_workers=max_workers,
+            chunk_size=chunk_size or self.chunk_size,
+            checksum=metadata._data.get("checksum"),
+        )
+        if not await download.run():
+            # Forget the segments of a previous download, if any.
+            download.finish()
+            return await self.download_to(path, chunk_size=chunk_size, verify=verify)
+        self._verify_segmented(download, metadata, verify)
+        return path
+
+
+class AsyncRecordFile(AsyncFileResource, RecordFile):
+    """Asynchronous version of :class:`~inveniordm_py.records.resources.RecordFile`."""
+
+    __slots__ = ()
+
+
+class AsyncDraftFilesList(AsyncResource, DraftFilesList):
+    """Asynchronous version of :class:`~inveniordm_py.records.resources.DraftFilesList`."""
+
+    __slots__ = ()
+
+    def __call__(self, key):
+        """Instantiate a record item resource."""
+        return AsyncDraftFile(self._client, filename=key, **self._endpoint_args)
+
+    def __iter__(self):
+        """Synchronous iteration is not supported, use ``async for``."""
+        raise TypeError("Use 'async for' to iterate over the files of a draft.")
+
+    async def __aiter__(self):
+        """Iterate over files of the draft, instantiated as `AsyncDraftFile`."""
+        files = await self.get()
+        for obj in files.data["entries"]:
+            if not obj:
+                return
+            metadata = FileMetadata(**obj)
+            file = AsyncDraftFile(
+                self._client, filename=metadata["key"], **self._endpoint_args
+            )
+            file.data = metadata
+            yield file
+
+
+class AsyncDraftFile(AsyncFileResource, DraftFile):
+    """Asynchronous version of :class:`~inveniordm_py.records.resources.DraftFile`."""
+
+    __slots__ = ()
+
+    async def set_contents(self, stream):
+        """Set file contents.
+
+        Paths, file objects and iterables of ``bytes`` chunks are streamed in
+        chunks, see :class:`~inveniordm_py.files.metadata.OutgoingStream`.
+        """
+        if not isinstance(stream, OutgoingStream):
+            stream = OutgoingStream(data=stream)
+        with stream.open() as data:
+            return await self._put(OutgoingStream, data=data, url_suffix="/content")
+
+    async def _upload_part(self, url, body):
+        """Upload a part of a multipart file transfer."""
+        headers = self.headers(data=OutgoingStream)
+        if not url.startswith(self._client._base_url):
+            # Pre-signed URLs of the storage, which reject other credentials.
+            headers["Authorization"] = None
+        resp = await self._request("PUT", url, content=body, headers=headers)
+        self.raise_on_error(resp)
+        return resp
+
+    async def upload_multipart(
+        self,
+        data,
+        part_size=64 * 1024 * 1024,
+        max_workers=4,
+        max_retries=3,
+    ):
+        """Upload a file with a multipart transfer, then commit it.
+
+        See :meth:`~inveniordm_py.records.resources.DraftFile.upload_multipart`.
+        """
+        upload = AsyncMultipartUpload(
+            data,
+            part_size=part_size,
+            max_workers=max_workers,
+            max_retries=max_retries,
+        )
+        files = await AsyncDraftFilesList(self._client, **self._endpoint_args).create(
+            self._multipart_entry(upload)
+        )
+        urls = self._part_urls(files)
+
+        async def upload_part(part, body):
+            return await self._upload_part(urls(part), body)
+
+        await upload.run(upload_part)
+        return await self.commit()
+
+
+class AsyncRecordCommunitiesList(AsyncResource, RecordCommunitiesList):
+    """Asynchronous version of :class:`~inveniordm_py.records.resources.RecordCommunitiesList`."""
+
+    __slots__ = ()
@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# inveniordm-py is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Asynchronous resource base class."""
+
+import asyncio
+import time
+
+from ..pagination import SimplePagination
+from ..resources import Resource
+from ..transports import httpx_content
+from .pagination import AsyncPrefetchPagination
+
+
+class AsyncResource(Resource):
+    """Asynchronous resource base class.
+
+    URL, header and endpoint argument handling is inherited from the
+    synchronous :class:`~inveniordm_py.resources.Resource`, only the HTTP
+    request methods are replaced by coroutines.
+    """
+
+    __slots__ = ()
+
+    #
+    # HTTP request methods
+    #
+    async def _iter_blocking(self, chunks):
+        """Iterate over a synchronous iterable, advanced in an executor.
+
+        Reading a file or running a generator may block, which would stall
+        the other tasks of the event loop.
+        """
+        loop = asyncio.get_running_loop()
+        chunks = iter(chunks)
+        while True:
+            chunk = await loop.run_in_executor(None, next, chunks, None)
+            if chunk is None:
+                return
+            yield chunk
+
+    def _content(self, content, headers):
+        """Convert a request body to content an ``AsyncClient`` can send.
+
+        ``httpx`` only sends asynchronous iterables with an ``AsyncClient``,
+        other bodies are converted as by the synchronous
+        :func:`~inveniordm_py.transports.httpx_content`, then read in an
+        executor.
+        """
+        if hasattr(content, "__aiter__"):
+            return content
+        content = httpx_content(content, headers)
+        if content is None or isinstance(content, (bytes, str)):
+            return content
+        return self._iter_blocking(content)
+
+    async def _request(self, method, url, headers=None, stream=False, **kwargs):
+        """Send a request through the client bound session.
+
+        Requests are measured by the instrumentation of the client, if any.
+        """
+        # Unlike ``requests``, ``httpx`` does not drop headers set to ``None``:
+        # they are removed from the built request, which also drops the
+        # default headers of the client (e.g. its ``Authorization``).
+        headers = headers or {}
+        removed = [k for k, v in headers.items() if v is None]
+        headers = {k: v for k, v in headers.items() if v is not None}
+        content = kwargs.get("content")
+        if content is not None:
+            kwargs["content"] = self._content(content, headers)
+        request = self.session.build_request(method, url, headers=headers, **kwargs)
+        for name in removed:
+            request.headers.pop(name, None)
+        instrumentation = getattr(self._client, "instrumentation", None)
+        if instrumentation is None:
+            return await self.session.send(request, stream=stream)
+
+        endpoint = self._endpoint_template(url)
+        start = time.perf_counter()
+        try:
+            response = await self.session.send(request, stream=stream)
+        except Exception as e:
+            instrumentation.observe(method, endpoint, url, start, body=content, error=e)
+            raise
+        instrumentation.observe(
+            method,
+            endpoint,
+            url,
+            start,
+            body=content,
+            response=response,
+            stream=stream,
+        )
+        return response
+
+    async def _get(
+        self, metadata_class, url_suffix="", params=None, headers=None, resource=None
+    ):
+        """Make a GET request."""
+        resource = self._resource_or_self(resource)
+        headers = self.headers(accept=metadata_class, extra=headers)
+        resp = await self._request(
+            "GET", self.url(suffix=url_suffix), headers=headers, params=params
+        )
+        self.raise_on_error(resp)
+        resource.data = self._load(metadata_class, resp)
+        return resource
+
+    async def _post(
+        self, metadata_class, data=None, url_suffix="", headers=None, resource=None
+    ):
+        """Make a POST request."""
+        resource = self._resource_or_self(resource)
+        headers = self.headers(accept=metadata_class, data=data, extra=headers)
+        request_data = self._dump(data)
+        resp = await self._request(
+            "POST", self.url(suffix=url_suffix), headers=headers, content=request_data
+        )
+        self.raise_on_error(resp)
+        resource.data = self._load(metadata_class, resp)
+        return resource
+
+    async def _put(
+        self, metadata_class, data=None, url_suffix="", headers=None, resource=None
+    ):
+        """Make a PUT request."""
+        resource = self._resource_or_self(resource)
+        headers = self.headers(accept=metadata_class, data=data, extra=headers)
+        request_data = self._dump(data)
+        resp = await self._request(
+            "PUT", self.url(suffix=url_suffix), headers=headers, content=request_data
+        )
+        self.raise_on_error(resp)
+        resource.data = self._load(metadata_class, resp)
+        return resource
+
+    async def _get_raw(
+        self, metadata_class, url_suffix="", params=None, headers=None, stream=False
+    ):
+        """Make a GET request and return the raw response.
+
+        If ``stream`` is true, the response body is not read upfront and the
+        response must be closed with ``await response.aclose()``.
+        """
+        headers = self.headers(accept=metadata_class, extra=headers)
+        resp = await self._request(
+            "GET",
+            self.url(suffix=url_suffix),
+            headers=headers,
+            params=params,
+            stream=stream,
+        )
+        self.raise_on_error(resp)
+        return resp
+
+    async def _delete(self, url_suffix="", headers=None):
+        """Make a DELETE request."""
+        headers = self.headers(extra=headers)
+        resp = await self._request(
+            "DELETE", self.url(suffix=url_suffix), headers=headers
+        )
+        self.raise_on_error(resp)
+        return True
+
+    async def _search(
+        self,
+        params,
+        metadata_class,
+        hit_factory,
+        prev_page,
+        next_page,
+        url_suffix="",
+        headers=None,
+    ):
+        """Make a GET request with pagination.
+
+        The ``next_page()`` and ``prev_page()`` methods of the returned
+        pagination object return coroutines.
+        """
+        headers = self.headers(accept=metadata_class, extra=headers)
+        response = await self._request(
+            "GET", self.url(suffix=url_suffix), params=params, headers=headers
+        )
+        self.raise_on_error(response)
+        data_list = self._load(metadata_class, response)
+        return SimplePagination(
+            data_list,
+            hit_factory,
+            prev_page=prev_page,
+            next_page=next_page,
+        )
+
+    def _scan(
+        self,
+        params,
+        metadata_class,
+        hit_factory,
+        prefetch=2,
+        url_suffix="",
+        headers=None,
+    ):
+        """Iterate (``async for``) over all the pages of a search."""
+        headers = self.headers(accept=metadata_class, extra=headers)
+
+        async def fetch_page(url):
+            if url is None:
+                url, url_params = self.url(suffix=url_suffix), params
+            else:
+                url_params = None
+            response = await self._request(
+                "GET", url, params=url_params, headers=headers
+            )
+            self.raise_on_error(response)
+            return self._load(metadata_class, response)
+
+        return AsyncPrefetchPagination(fetch_page, hit_factory, prefetch=prefetch)
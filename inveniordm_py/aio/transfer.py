@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# inveniordm-py is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Asynchronous file transfer helpers."""
+
+import asyncio
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+from ..files.transfer import MultipartUpload, SegmentedDownload, is_retryable
+
+
+async def gather_bounded(coros, limit):
+    """Run coroutines concurrently, at most ``limit`` at a time.
+
+    If one of them fails, the others are cancelled and the error is raised.
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(coro):
+        try:
+            async with semaphore:
+                return await coro
+        finally:
+            # Coroutines cancelled before being started are never awaited.
+            coro.close()
+
+    tasks = [asyncio.ensure_future(run(coro)) for coro in coros]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+class AsyncSegmentedDownload(SegmentedDownload):
+    """Asynchronous version of :class:`~inveniordm_py.files.transfer.SegmentedDownload`.
+
+    ``fetch_range`` is a coroutine function returning a streamed ``httpx``
+    response, and at most ``max_workers`` segments are fetched at a time.
+    """
+
+    async def _write_segment(self, segment, response):
+        """Write the (streamed) response of a segment at its offset."""
+        _, start, _ = segment
+        written = 0
+        try:
+            with open(self.part_path, "r+b") as fp:
+                fp.seek(start)
+                async for chunk in response.aiter_bytes(self.chunk_size):
+                    fp.write(chunk)
+                    written += len(chunk)
+                self._sync_segment(fp)
+        finally:
+            await response.aclose()
+        self._segment_written(segment, written)
+
+    async def _download_segment(self, segment):
+        """Fetch a segment and write it."""
+        _, start, end = segment
+        await self._write_segment(segment, await self._fetch_range(start, end))
+
+    async def run(self):
+        """Download the missing segments.
+
+        :returns: ``False`` if the server does not support range requests, in
+            which case nothing was written.
+        """
+        self._done = self._load_state()
+        pending = [s for s in self.segments if s[0] not in self._done]
+        if not pending:
+            self._truncate()
+            return True
+
+        # The first segment tells whether the server honours range requests.
+        first = pending.pop(0)
+        response = await self._fetch_range(first[1], first[2])
+        if response.status_code != 206:
+            await response.aclose()
+            return False
+
+        self._truncate()
+        await gather_bounded(
+            [self._write_segment(first, response)]
+            + [self._download_segment(s) for s in pending],
+            self.max_workers,
+        )
+        return True
+
+
+class AsyncMultipartUpload(MultipartUpload):
+    """Asynchronous version of :class:`~inveniordm_py.files.transfer.MultipartUpload`.
+
+    ``upload_part`` is a coroutine function, and at most ``max_workers`` parts
+    are uploaded at a time.
+    """
+
+    errors = (OSError,) if httpx is None else (OSError, httpx.HTTPError)
+
+    async def _upload(self, upload_part, part):
+        """Upload a part, retrying on errors."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                with self._body(part) as body:
+                    return await upload_part(part, body)
+            except self.errors as e:
+                if attempt == self.max_retries or not is_retryable(e):
+                    raise
+                await asyncio.sleep(self._delay(e, attempt))
+
+    async def run(self, upload_part):
+        """Upload all the parts.
+
+        :param upload_part: coroutine function uploading a part, given its
+            number (starting at 1) and its body.
+        """
+        return await gather_bounded(
+            [self._upload(upload_part, part) for part in range(1, self.parts + 1)],
+            self.max_workers,
+        )
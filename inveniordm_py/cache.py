@@ -0,0 +1,439 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# inveniordm-py is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""HTTP response caching."""
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlencode
+
+
+def is_under(url, prefix, paths=True):
+    """Whether a URL is a prefix, or a path or query string below it.
+
+    ``/records/12`` is under itself and ``/records/12/draft``, but not under
+    ``/records/1``.
+
+    :param paths: whether the paths below the prefix are under it, otherwise
+        only its query strings are.
+    """
+    if url == prefix:
+        return True
+    return url.startswith((f"{prefix}/", f"{prefix}?") if paths else f"{prefix}?")
+
+
+class CachedResponse:
+    """Response served from the cache.
+
+    Provides the subset of the ``requests.Response`` interface used by the
+    metadata classes.
+    """
+
+    status_code = 200
+
+    def __init__(self, url, content, headers, entry=None):
+        """Initialize response.
+
+        :param entry: the :class:`CacheEntry` of the response, which keeps
+            the metadata decoded from it.
+        """
+        self.url = url
+        self.content = content
+        self.headers = headers
+        self.entry = entry
+
+    def json(self):
+        """Decode the JSON body."""
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        """Cached responses are always successful."""
+
+    def close(self):
+        """Nothing to release."""
+
+
+class CacheEntry:
+    """Body and validators of a cached response."""
+
+    def __init__(self, url, content, etag=None, last_modified=None, expires=None):
+        """Initialize entry.
+
+        :param expires: UNIX timestamp after which the response must be
+            revalidated, ``None`` if it never expires.
+        """
+        self.url = url
+        self.content = content
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires = expires
+        #: Metadata decoded from the body, kept in memory only.
+        self.metadata = None
+
+    @property
+    def size(self):
+        """Size of the body, in bytes."""
+        return len(self.content)
+
+    @property
+    def fresh(self):
+        """Whether the response can be used without revalidation."""
+        return self.expires is None or time.time() < self.expires
+
+    def response(self):
+        """Create a response from the entry."""
+        headers = {}
+        if self.etag is not None:
+            headers["ETag"] = self.etag
+        if self.last_modified is not None:
+            headers["Last-Modified"] = self.last_modified
+        return CachedResponse(self.url, self.content, headers, entry=self)
+
+
+class CacheBackend:
+    """Storage of cached responses.
+
+    Keys are ``(url, accept)`` tuples and values :class:`CacheEntry` objects.
+    """
+
+    def get(self, key):
+        """Get an entry, or ``None``."""
+        raise NotImplementedError
+
+    def set(self, key, entry):
+        """Store an entry."""
+        raise NotImplementedError
+
+    def delete_prefix(self, prefix, paths=True):
+        """Remove the entries of a URL and of the URLs under it.
+
+        See :func:`is_under`.
+        """
+        raise NotImplementedError
+
+    def clear(self):
+        """Remove all the entries."""
+        raise NotImplementedError
+
+    def __len__(self):
+        """Number of entries."""
+        raise NotImplementedError
+
+
+class MemoryBackend(CacheBackend):
+    """In-memory storage, evicting the least recently used entries.
+
+    Entries are evicted once the backend holds more than ``max_entries``
+    entries or ``max_bytes`` bytes.
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=64 * 1024 * 1024):
+        """Initialize backend."""
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Number of entries."""
+        return len(self._entries)
+
+    def get(self, key):
+        """Get an entry, or ``None``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        """Store an entry, evicting the least recently used ones."""
+        if entry.size > self.max_bytes:
+            return
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = entry
+            self.size += entry.size
+            while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key):
+        """Remove an entry, with the lock held."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry.size
+
+    def delete_prefix(self, prefix, paths=True):
+        """Remove the entries of a URL and of the URLs under it."""
+        with self._lock:
+            for key in [k for k in self._entries if is_under(k[0], prefix, paths)]:
+                self._remove(key)
+
+    def clear(self):
+        """Remove all the entries."""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+class SQLiteBackend(CacheBackend):
+    """Persistent storage in a SQLite database file.
+
+    The cache survives restarts of the program, so that e.g. published
+    records are not downloaded again by each run of a batch job. Once the
+    database holds more than ``max_entries`` entries, the least recently used
+    ones are evicted.
+    """
+
+    def __init__(self, path, max_entries=100000):
+        """Initialize backend.
+
+        :param path: path of the database file, created if needed.
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "url TEXT, accept TEXT, content BLOB, etag TEXT, "
+                "last_modified TEXT, expires REAL, used REAL, "
+                "PRIMARY KEY (url, accept))"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS responses_used ON responses (used)"
+            )
+
+    def __len__(self):
+        """Number of entries."""
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def get(self, key):
+        """Get an entry, or ``None``."""
+        with self._lock, self._db:
+            row = self._db.execute(
+                "SELECT content, etag, last_modified, expires FROM responses "
+                "WHERE url = ? AND accept = ?",
+                key,
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute(
+                "UPDATE responses SET used = ? WHERE url = ? AND accept = ?",
+                (time.time(), *key),
+            )
+        content, etag, last_modified, expires = row
+        return CacheEntry(key[0], bytes(content), etag, last_modified, expires)
+
+    def set(self, key, entry):
+        """Store an entry, evicting the least recently used ones."""
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    *key,
+                    entry.content,
+                    entry.etag,
+                    entry.last_modified,
+                    entry.expires,
+                    time.time(),
+                ),
+            )
+            self._db.execute(
+                "DELETE FROM responses WHERE rowid IN (SELECT rowid FROM responses "
+                "ORDER BY used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def delete_prefix(self, prefix, paths=True):
+        """Remove the entries of a URL and of the URLs under it."""
+        below = f"{prefix}/" if paths else f"{prefix}?"
+        with self._lock, self._db:
+            self._db.execute(
+                "DELETE FROM responses WHERE url = ? OR substr(url, 1, ?) IN (?, ?)",
+                (prefix, len(prefix) + 1, below, f"{prefix}?"),
+            )
+
+    def clear(self):
+        """Remove all the entries."""
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM responses")
+
+    def close(self):
+        """Close the database."""
+        self._db.close()
+
+
+class CacheStats:
+    """Hit and miss statistics of a cache."""
+
+    def __init__(self):
+        """Initialize statistics."""
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def record(self, outcome):
+        """Count a ``hits``, ``revalidated`` or ``misses`` lookup."""
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    @property
+    def hit_rate(self):
+        """Fraction of the lookups served from the cache."""
+        total = self.hits + self.revalidated + self.misses
+        return (self.hits + self.revalidated) / total if total else 0.0
+
+    def __repr__(self):
+        """String representation."""
+        return (
+            f"<CacheStats hits={self.hits} revalidated={self.revalidated} "
+            f"misses={self.misses}>"
+        )
+
+
+class HTTPCache:
+    """Cache of GET responses, revalidated with conditional requests.
+
+    Responses are stored per URL and ``Accept`` header in a
+    :class:`CacheBackend`, in memory by default. Each type of resource has a
+    time to live (see ``default_ttls``), during which its cached responses
+    are used without contacting the server: five minutes for published
+    records, which can still be edited and published again (possibly by
+    someone else), and a few seconds for drafts and search pages. Once
+    expired, responses with an ``ETag`` or ``Last-Modified`` header are
+    revalidated with ``If-None-Match`` and ``If-Modified-Since`` headers, and
+    used again if the server answers ``304 Not Modified``.
+
+    Writes to a record (e.g. updating or publishing its draft) invalidate
+    all the cached responses of the record. Writes to a collection (e.g.
+    creating a record) only invalidate the collection, e.g. its searches.
+
+    The metadata decoded from a cached response are kept with it in memory
+    and returned again by the next requests served from the cache, they must
+    not be modified in place.
+
+    Usage:
+
+    .. code-block:: python
+
+        cache = HTTPCache(backend=SQLiteBackend("responses.db"))
+        client = InvenioAPI(base_url, token, cache=cache)
+        client.records("1234").get()  # Downloaded.
+        client.records("1234").get()  # Served from the cache.
+        print(cache.stats)
+    """
+
+    #: Time to live of the responses, in seconds, per resource type.
+    #: ``None`` keeps the responses forever, ``0`` always revalidates them.
+    default_ttls = {"record": 300, "draft": 5, "search": 5}
+
+    _record_url = re.compile(r"^(.*?/records/[^/?]+)")
+
+    def __init__(self, backend=None, ttls=None, **kwargs):
+        """Initialize cache.
+
+        :param backend: a :class:`CacheBackend`, by default a
+            :class:`MemoryBackend` created with the keyword arguments.
+        :param ttls: dictionary of resource types to times to live, updating
+            ``default_ttls``.
+        """
+        self.backend = backend if backend is not None else MemoryBackend(**kwargs)
+        self.ttls = {**self.default_ttls, **(ttls or {})}
+        self.stats = CacheStats()
+
+    def __len__(self):
+        """Number of cached responses."""
+        return len(self.backend)
+
+    def key(self, url, headers=None, params=None):
+        """Get the cache key of a request."""
+        accept = (headers or {}).get("accept", "")
+        if params:
+            url = f"{url}?{urlencode(sorted(params.items()), doseq=True)}"
+        return (url, accept)
+
+    def get(self, key):
+        """Get a cached entry, fresh or not, or ``None``."""
+        return self.backend.get(key)
+
+    def lookup(self, key):
+        """Get a cached entry, counting a hit if it is fresh."""
+        entry = self.backend.get(key)
+        if entry is not None and entry.fresh:
+            self.stats.record("hits")
+        return entry
+
+    def expires(self, cache_type):
+        """Get the expiry timestamp of a response stored now."""
+        ttl = self.ttls.get(cache_type, 0)
+        return None if ttl is None else time.time() + ttl
+
+    def invalidate(self, url):
+        """Remove the cached responses affected by a write to a URL.
+
+        Writes under ``/records/<id>`` invalidate everything cached for the
+        record, e.g. both its draft and its published version. Other writes,
+        e.g. to the ``/records`` collection, only invalidate the URL and its
+        query strings, not the records below it.
+        """
+        match = self._record_url.match(url)
+        if match:
+            self.backend.delete_prefix(match.group(1))
+        else:
+            url = url.split("?", 1)[0].rstrip("/")
+            self.backend.delete_prefix(url, paths=False)
+
+    def clear(self):
+        """Remove all the cached responses."""
+        self.backend.clear()
+
+    def conditional_headers(self, entry):
+        """Get the headers to revalidate a cached entry."""
+        headers = {}
+        if entry is None:
+            return headers
+        if entry.etag is not None:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified is not None:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def update(self, key, response, entry=None, cache_type=None):
+        """Store or revalidate a cached entry with the server response.
+
+        :param entry: the entry that was revalidated, if any.
+        :returns: the response to use, from the cache if the server answered
+            ``304 Not Modified``, in which case the metadata already decoded
+            from the entry are reused.
+        """
+        if response.status_code == 304 and entry is not None:
+            response.close()
+            entry.expires = self.expires(cache_type)
+            self.backend.set(key, entry)
+            self.stats.record("revalidated")
+            return entry.response()
+
+        if response.status_code == 200:
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            expires = self.expires(cache_type)
+            if etag or last_modified or expires is None or expires > time.time():
+                entry = CacheEntry(
+                    key[0], response.content, etag, last_modified, expires
+                )
+                self.backend.set(key, entry)
+        self.stats.record("misses")
+        return response
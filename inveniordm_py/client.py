@@ -8,25 +8,161 @@
 """Invenio REST API client.."""
 
 import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
-from requests import Session
+from requests import RequestException
 
+from .codec import get_codec
 from .records.resources import RecordList
+from .transports import HTTPXTransport, RequestsTransport
 
 
 class InvenioAPI:
     """InvenioRDM REST API client."""
 
-    def __init__(self, base_url, access_token, session=None):
-        """Initialize client."""
+    def __init__(
+        self,
+        base_url,
+        access_token,
+        session=None,
+        pool_connections=10,
+        pool_maxsize=10,
+        timeout=None,
+        keep_alive=True,
+        rate_limiter=None,
+        cache=None,
+        lazy_metadata=False,
+        codec=None,
+        instrumentation=None,
+        transport=None,
+        http2=False,
+        max_streams=100,
+    ):
+        """Initialize client.
+
+        :param session: a ``requests.Session`` to use instead of creating one,
+            with the default transport. Its connection pools are kept, and
+            only grown by :meth:`ensure_pool_size`.
+        :param pool_connections: number of hosts whose connection pools are
+            kept (e.g. the API and a file storage).
+        :param pool_maxsize: maximum number of connections kept open per host,
+            increased automatically by the concurrent helpers of the client.
+        :param timeout: default timeout (in seconds) of a request, either a
+            number or a ``(connect, read)`` tuple.
+        :param keep_alive: reuse connections across requests.
+        :param rate_limiter: a :class:`~inveniordm_py.ratelimit.RateLimiter`
+            shared by all the requests of the client.
+        :param cache: an :class:`~inveniordm_py.cache.HTTPCache` of the
+            responses to GET requests of records, drafts and searches.
+        :param lazy_metadata: keep the raw bodies of the responses and only
+            decode them when their metadata is accessed.
+        :param codec: JSON codec of the request and response bodies, see
+            :func:`~inveniordm_py.codec.get_codec`.
+        :param instrumentation: an
+            :class:`~inveniordm_py.instrumentation.Instrumentation` recording
+            the requests of the client.
+        :param transport: a :class:`~inveniordm_py.transports.Transport`
+            sending the requests, by default a
+            :class:`~inveniordm_py.transports.RequestsTransport`.
+        :param http2: send the requests over HTTP/2 with an
+            :class:`~inveniordm_py.transports.HTTPXTransport`, so that the
+            concurrent requests of the client (e.g. of
+            ``records.get_many()``) are multiplexed over a single connection
+            per host instead of opening one connection each. Requires
+            ``pip install inveniordm-py[http2]``.
+        :param max_streams: maximum number of concurrent requests in HTTP/2
+            mode; further requests wait for one to complete.
+        """
         from inveniordm_py import __version__
 
         self._base_url = base_url[:-1] if base_url.endswith("/") else base_url
         self._access_token = access_token
-        self.session = session or Session()
-        atexit.register(self.session.close)
-        self.session.headers["User-Agent"] = f"Invenio API Client/{__version__}"
-        self.session.headers["Authorization"] = f"Bearer {self._access_token}"
+        if http2 and (session is not None or transport is not None):
+            raise ValueError("A session or transport cannot be given with http2.")
+        if http2:
+            transport = HTTPXTransport(http2=True, max_concurrent_streams=max_streams)
+        elif transport is None:
+            transport = RequestsTransport(session)
+        elif session is not None:
+            raise ValueError("A session cannot be given with a transport.")
+        self.transport = transport
+        atexit.register(self.transport.close)
+        headers = self.transport.headers
+        headers["User-Agent"] = f"Invenio API Client/{__version__}"
+        headers["Authorization"] = f"Bearer {self._access_token}"
+        if not keep_alive:
+            headers["Connection"] = "close"
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.lazy_metadata = lazy_metadata
+        self.codec = get_codec(codec)
+        self.instrumentation = instrumentation
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self._pool_lock = threading.Lock()
+        if session is None:
+            self._mount_adapters()
+
+    @property
+    def session(self):
+        """Get the session of the transport, if any."""
+        return getattr(self.transport, "session", None)
+
+    def _mount_adapters(self):
+        """Resize the connection pools of the transport."""
+        self.transport.set_pool_size(self.pool_connections, self.pool_maxsize)
+
+    def ensure_pool_size(self, size):
+        """Grow the connection pools to hold at least ``size`` connections.
+
+        Called by the concurrent helpers of the client with their number of
+        workers, so that connections are not discarded and re-opened because
+        the pools are full. Growing the pools replaces them, closing their
+        idle connections: call it before :meth:`warmup`, which sizes the
+        pools itself.
+        """
+        with self._pool_lock:
+            if size <= self.pool_maxsize:
+                return
+            self.pool_maxsize = size
+            self._mount_adapters()
+
+    def warmup(self, n=None):
+        """Open connections to the API ahead of a burst of requests.
+
+        Sends ``n`` concurrent ``HEAD`` requests to the API, which leave their
+        connections open in the pool. Each response is only released once all
+        the requests are answered, so that no connection is reused by another
+        of the requests.
+
+        :param n: number of connections to open, by default the pool size.
+        """
+        n = n or self.pool_maxsize
+        self.ensure_pool_size(n)
+        barrier = threading.Barrier(n)
+
+        def connect(_):
+            barrier.wait()
+            response = None
+            try:
+                response = self.transport.request(
+                    "HEAD", self._base_url, stream=True, timeout=self.timeout
+                )
+            except RequestException:
+                pass
+            finally:
+                barrier.wait()
+            if response is None:
+                return False
+            # Read the (empty) body, so that the connection returns to the pool.
+            response.content
+            response.close()
+            return True
+
+        with ThreadPoolExecutor(max_workers=n) as executor:
+            return sum(executor.map(connect, range(n)))
 
     @property
     def records(self):
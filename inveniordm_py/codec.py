@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# inveniordm-py is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""JSON codecs of request and response bodies."""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+class JSONCodec:
+    """JSON codec of the standard library."""
+
+    name = "json"
+
+    def dumps(self, obj):
+        """Encode an object to a request body."""
+        return json.dumps(obj)
+
+    def loads(self, data):
+        """Decode a JSON document, as ``bytes`` or ``str``."""
+        return json.loads(data)
+
+    def load_response(self, response):
+        """Decode the body of a response."""
+        return response.json()
+
+
+class OrjsonCodec(JSONCodec):
+    """JSON codec using ``orjson``, from and to ``bytes``."""
+
+    name = "orjson"
+
+    def dumps(self, obj):
+        """Encode an object to a request body."""
+        return orjson.dumps(obj)
+
+    def loads(self, data):
+        """Decode a JSON document, as ``bytes`` or ``str``."""
+        return orjson.loads(data)
+
+    def load_response(self, response):
+        """Decode the body of a response, without decoding it to text first."""
+        return orjson.loads(response.content)
+
+
+class UjsonCodec(JSONCodec):
+    """JSON codec using ``ujson``."""
+
+    name = "ujson"
+
+    def dumps(self, obj):
+        """Encode an object to a request body."""
+        return ujson.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+    def loads(self, data):
+        """Decode a JSON document, as ``bytes`` or ``str``."""
+        return ujson.loads(data)
+
+    def load_response(self, response):
+        """Decode the body of a response, without decoding it to text first."""
+        return ujson.loads(response.content)
+
+
+#: Codecs by name, with their module (``None`` if not installed).
+codecs = {
+    "orjson": (OrjsonCodec, orjson),
+    "ujson": (UjsonCodec, ujson),
+    "json": (JSONCodec, json),
+}
+
+default_codec = JSONCodec()
+
+
+def get_codec(codec=None):
+    """Get a JSON codec.
+
+    :param codec: a codec object, the name of a codec (``"json"``,
+        ``"orjson"`` or ``"ujson"``), ``"auto"`` for the fastest installed
+        codec, or ``None`` for the standard library.
+    """
+    if codec is None:
+        return default_codec
+    if not isinstance(codec, str):
+        return codec
+    if codec == "auto":
+        codec = next(name for name, (_, module) in codecs.items() if module)
+    try:
+        codec_class, module = codecs[codec]
+    except KeyError:
+        raise ValueError(f"Unknown JSON codec: {codec!r}.")
+    if module is None:
+        raise RuntimeError(
+            f"The {codec!r} JSON codec requires {codec!r}, install it with "
+            f"'pip install {codec}'."
+        )
+    return codec_class()
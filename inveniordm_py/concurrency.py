@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# inveniordm-py is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Helpers to run many requests concurrently."""
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+
+
+class BulkResult:
+    """Result of one item of a bulk operation.
+
+    Either ``result`` is set, or ``error`` holds the exception raised while
+    processing the item.
+    """
+
+    def __init__(self, index, item, result=None, error=None):
+        """Initialize result."""
+        self.index = index
+        self.item = item
+        self.result = result
+        self.error = error
+
+    @property
+    def ok(self):
+        """Whether the item was processed successfully."""
+        return self.error is None
+
+    def __repr__(self):
+        """String representation."""
+        outcome = f"error={self.error!r}" if self.error else f"result={self.result!r}"
+        return f"<BulkResult index={self.index} {outcome}>"
+
+
+def _call(func, index, item):
+    """Call a function on an item, capturing its error in the result."""
+    try:
+        return BulkResult(index, item, result=func(item))
+    except Exception as e:
+        return BulkResult(index, item, error=e)
+
+
+def bulk_map(func, items, max_workers=4, ordered=True):
+    """Apply a function to items concurrently, yielding `BulkResult` objects.
+
+    Items are consumed lazily: at most ``2 * max_workers`` items are in
+    flight at any time, so that ``items`` can be a long-running generator.
+    A failed item does not abort the others, its exception is stored in its
+    result.
+
+    :param func: function called with each item, from a worker thread.
+    :param max_workers: number of worker threads.
+    :param ordered: yield the results in the order of the items, otherwise in
+        the order of completion.
+    """
+    window = 2 * max_workers
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        if ordered:
+            pending = deque()
+            for index, item in enumerate(items):
+                pending.append(executor.submit(_call, func, index, item))
+                if len(pending) >= window:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        else:
+            pending = set()
+            for index, item in enumerate(items):
+                pending.add(executor.submit(_call, func, index, item))
+                if len(pending) >= window:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            for future in as_completed(pending):
+                yield future.result()
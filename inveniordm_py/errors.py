@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# inveniordm-py is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Errors raised by the client."""
+
+
+class ChecksumError(ValueError):
+    """The checksum of a downloaded file does not match the expected one."""
+
+    def __init__(self, expected, actual):
+        """Initialize error."""
+        super().__init__(f"Checksum mismatch: expected {expected}, got {actual}.")
+        self.expected = expected
+        self.actual = actual
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# inveniordm-py is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Resumable export of search results to JSON Lines files.
+
+The hits of each page are written as soon as they are parsed from the
+response, so the memory used does not depend on the size of the export.
+After each page the output file is flushed and a cursor, saved next to it
+(``<path>.cursor``), records the position of the export: an interrupted
+export truncates the output back to the last complete page and continues
+from there.
+
+Compressed outputs write each page as a separate gzip member or zstd frame,
+which readers decompress as a single stream, so that they can be truncated
+and appended to as well.
+"""
+
+import gzip
+import os
+from contextlib import contextmanager
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from .state import load_state, save_state
+
+#: Export formats, with their compression.
+formats = {
+    "jsonl": None,
+    "jsonl.gz": "gzip",
+    "jsonl.zst": "zstd",
+}
+
+
+def guess_format(path):
+    """Guess the export format of a path from its extension."""
+    path = str(path)
+    if path.endswith(".gz"):
+        return "jsonl.gz"
+    if path.endswith(".zst"):
+        return "jsonl.zst"
+    return "jsonl"
+
+
+@contextmanager
+def compressor(format, fileobj):
+    """Writable stream compressing into a file object, left open on exit."""
+    compression = formats[format]
+    if compression is None:
+        yield fileobj
+    elif compression == "gzip":
+        with gzip.GzipFile(fileobj=fileobj, mode="wb", mtime=0) as stream:
+            yield stream
+    else:
+        with zstandard.ZstdCompressor().stream_writer(fileobj, closefd=False) as stream:
+            yield stream
+
+
+class ExportCursor:
+    """Position of an export, persisted in a JSON file.
+
+    :attr params: parameters of the export, which must match to resume it.
+    :attr queries: queries of the partitions of the search.
+    :attr partition: index of the partition being exported.
+    :attr page: next page of the partition to export.
+    :attr offset: size of the output file up to the last exported page.
+    :attr count: number of hits exported.
+    """
+
+    __slots__ = ("path", "params", "queries", "partition", "page", "offset", "count")
+
+    def __init__(self, path, params, queries, partition=0, page=1, offset=0, count=0):
+        """Initialize cursor."""
+        self.path = path
+        self.params = params
+        self.queries = queries
+        self.partition = partition
+        self.page = page
+        self.offset = offset
+        self.count = count
+
+    @classmethod
+    def load(cls, path):
+        """Load a cursor, or return ``None`` if there is none.
+
+        An unreadable cursor is ignored, i.e. the export starts over.
+        """
+        state = load_state(path)
+        if isinstance(state, dict):
+            try:
+                return cls(path, **state)
+            except TypeError:
+                pass
+        return None
+
+    def save(self):
+        """Save the cursor, atomically replacing the previous one."""
+        save_state(
+            self.path, {name: getattr(self, name) for name in self.__slots__[1:]}
+        )
+
+    def delete(self):
+        """Delete the cursor once the export is complete."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class SearchExport:
+    """Resumable export of the hits of partitioned searches.
+
+    Usage:
+
+    .. code-block:: python
+
+        export = SearchExport("records.jsonl.gz", params={"q": q})
+        count = export.run(compute_queries, fetch_page)
+    """
+
+    __slots__ = ("path", "format", "params", "cursor_path", "codec")
+
+    def __init__(self, path, format=None, params=None, cursor_path=None, codec=None):
+        """Initialize export.
+
+        :param path: path of the output file.
+        :param format: one of :data:`formats`, guessed from the extension of
+            the path by default.
+        :param params: parameters of the export (e.g. its query), an existing
+            cursor is only resumed if they are the same.
+        :param cursor_path: path of the cursor, ``<path>.cursor`` by default.
+        :param codec: the :mod:`~inveniordm_py.codec` encoding the hits.
+        """
+        self.path = os.fspath(path)
+        self.format = format or guess_format(self.path)
+        if self.format not in formats:
+            raise ValueError(f"Unknown export format: {self.format!r}.")
+        if formats[self.format] == "zstd" and zstandard is None:
+            raise RuntimeError(
+                "The zstd compression requires 'zstandard', install it with "
+                "'pip install inveniordm-py[zstd]'."
+            )
+        self.params = dict(params or {}, format=self.format)
+        self.cursor_path = cursor_path or f"{self.path}.cursor"
+        self.codec = codec
+
+    def _cursor(self, queries):
+        """Load the cursor of an interrupted export, or start a new one."""
+        cursor = ExportCursor.load(self.cursor_path)
+        if (
+            cursor is not None
+            and cursor.params == self.params
+            and os.path.exists(self.path)
+        ):
+            return cursor
+        return ExportCursor(self.cursor_path, self.params, list(queries()))
+
+    def _encode(self, hit):
+        """Encode a hit as a line."""
+        line = hit.data.to_request(codec=self.codec)
+        if isinstance(line, str):
+            line = line.encode("utf-8")
+        return line + b"\n"
+
+    def _write_page(self, fp, page):
+        """Write the hits of a page, returning their number."""
+        count = 0
+        with compressor(self.format, fp) as stream:
+            for hit in page:
+                stream.write(self._encode(hit))
+                count += 1
+        return count
+
+    def run(self, queries, fetch_page):
+        """Export the hits, resuming the previous export if interrupted.
+
+        :param queries: callable returning the queries of the partitions to
+            export, only called when a new export is started.
+        :param fetch_page: callable returning a page of the hits of a query,
+            given the query and the page number.
+        :returns: the total number of hits exported.
+        """
+        cursor = self._cursor(queries)
+        mode = "r+b" if cursor.offset else "wb"
+        with open(self.path, mode) as fp:
+            fp.truncate(cursor.offset)
+            fp.seek(cursor.offset)
+            cursor.save()
+            while cursor.partition < len(cursor.queries):
+                page = fetch_page(cursor.queries[cursor.partition], cursor.page)
+                count = self._write_page(fp, page)
+                fp.flush()
+                os.fsync(fp.fileno())
+                cursor.offset = fp.tell()
+                cursor.count += count
+                if count and page.links.get("next"):
+                    cursor.page += 1
+                else:
+                    cursor.partition += 1
+                    cursor.page = 1
+                cursor.save()
+        cursor.delete()
+        return cursor.count
@@ -7,12 +7,18 @@
 
 """Record metadata classes."""
 
+import mmap
+import os
+from contextlib import contextmanager
+
 from inveniordm_py.metadata import ListMetadata, Metadata
 
 
 class FileMetadata(Metadata):
     """File metadata."""
 
+    __slots__ = ()
+
     accept = "application/json"
     content_type = "application/json"
 
@@ -25,6 +31,8 @@ class FileMetadata(Metadata):
 class FilesListMetadata(ListMetadata):
     """Metadata of a list of files."""
 
+    __slots__ = ()
+
     accept = "application/json"
     content_type = "application/json"
 
@@ -37,6 +45,7 @@ class FilesListMetadata(ListMetadata):
 
         .. note:: this is a bit of a hack, but it works for now.
         """
+        super().__init__()
         if data:
             self._data = data
         if kwargs:
@@ -51,28 +60,62 @@ class FilesListMetadata(ListMetadata):
 class Stream(FileMetadata):
     """Stream metadata."""
 
-    def to_request(self):
-        """Return the stream data."""
+    __slots__ = ()
+
+    def to_request(self, codec=None):
+        """Return the stream data, which is not encoded."""
         return self._data
 
     @classmethod
-    def from_response(cls, response):
-        """Create metadata object from response."""
+    def from_response(cls, response, lazy=False, codec=None):
+        """Create metadata object from response.
+
+        The content is returned as is, ``lazy`` and ``codec`` are ignored.
+        """
         yield response.content
 
 
 class OutgoingStream(Stream):
     """Outgoing stream metadata.
 
-    This is used to upload a file.
+    This is used to upload a file. The data is either:
+
+    - a path to a file (``str`` or ``os.PathLike``), opened when uploading,
+    - a binary file object,
+    - a bytes-like object, e.g. ``bytes``, ``memoryview`` or ``mmap``,
+    - an iterable of ``bytes`` chunks, e.g. a generator.
+
+    Data is streamed without being copied in memory. A ``Content-Length`` is
+    sent when the size of the data is known (i.e. for all but iterables),
+    otherwise the data is sent with a chunked transfer encoding.
     """
 
+    __slots__ = ()
+
     content_type = "application/octet-stream"
     accept = "application/json"
 
-    def to_request(self):
+    @property
+    def is_path(self):
+        """Whether the data is a path to a file."""
+        return isinstance(self._data.get("data"), (str, os.PathLike))
+
+    @contextmanager
+    def open(self):
+        """Open the data for the upload, i.e. open the file of a path."""
+        if not self.is_path:
+            yield self
+            return
+        with open(self._data["data"], "rb") as fp:
+            yield OutgoingStream(**{**self._data, "data": fp})
+
+    def to_request(self, codec=None):
         """Return the stream data."""
-        return self._data.get("data", None)
+        data = self._data.get("data", None)
+        if isinstance(data, (memoryview, mmap.mmap)):
+            # A view of bytes, so that its length is its size in bytes.
+            return memoryview(data).cast("B")
+        return data
 
 
 class IncomingStream(Stream):
@@ -81,5 +124,15 @@ class IncomingStream(Stream):
     This is used to download a file.
     """
 
+    __slots__ = ()
+
     content_type = None
     accept = None
+
+    @classmethod
+    def from_response(cls, response, chunk_size=1024 * 1024):
+        """Iterate over the chunks of a streamed response, then close it."""
+        try:
+            yield from response.iter_content(chunk_size=chunk_size)
+        finally:
+            response.close()
@@ -0,0 +1,389 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# inveniordm-py is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""File transfer helpers."""
+
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+
+from inveniordm_py.errors import ChecksumError
+from inveniordm_py.ratelimit import retry_after
+from inveniordm_py.state import load_state, save_state
+
+
+def remove_file(path):
+    """Remove a file, if it exists."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def content_size(response):
+    """Get the size of a file from the headers of a (range) response.
+
+    :returns: the total size of a ``Content-Range``, the ``Content-Length`` of
+        a complete response, or ``None`` if unknown.
+    """
+    total = response.headers.get("Content-Range", "").rpartition("/")[2]
+    if total.isdigit():
+        return int(total)
+    length = response.headers.get("Content-Length", "")
+    if response.status_code == 200 and length.isdigit():
+        return int(length)
+    return None
+
+
+class ChecksumVerifier:
+    """Compute the checksum of a file on the fly and verify it.
+
+    Checksums are formatted as ``<algorithm>:<hexdigest>``, e.g.
+    ``md5:6ef4267f0e710357c895627e931f16cd``, as returned in the ``checksum``
+    of the file metadata.
+    """
+
+    def __init__(self, checksum):
+        """Initialize verifier."""
+        self.algorithm, _, self.expected = checksum.partition(":")
+        self._hash = hashlib.new(self.algorithm)
+
+    @classmethod
+    def from_metadata(cls, metadata):
+        """Create a verifier from a file metadata, if it has a checksum."""
+        checksum = metadata._data.get("checksum")
+        return cls(checksum) if checksum else None
+
+    def update(self, chunk):
+        """Update the checksum with a chunk of data."""
+        self._hash.update(chunk)
+
+    def update_from_file(self, path, chunk_size=1024 * 1024):
+        """Update the checksum with the contents of a file."""
+        with open(path, "rb") as fp:
+            for chunk in iter(lambda: fp.read(chunk_size), b""):
+                self._hash.update(chunk)
+
+    @property
+    def checksum(self):
+        """Checksum of the data seen so far."""
+        return f"{self.algorithm}:{self._hash.hexdigest()}"
+
+    def verify(self):
+        """Verify the checksum of the data seen so far."""
+        actual = self._hash.hexdigest()
+        if actual != self.expected:
+            raise ChecksumError(
+                f"{self.algorithm}:{self.expected}", f"{self.algorithm}:{actual}"
+            )
+
+
+class SegmentedDownload:
+    """Download a file in byte ranges, fetched concurrently.
+
+    The file is downloaded to ``<path>.part``, which is preallocated and
+    where each segment is written at its offset by its own worker. The
+    completed segments are recorded in a ``.segments`` file next to the
+    output, so that an interrupted download is resumed by only fetching the
+    missing segments. The ``.part`` file is only renamed to ``path`` by
+    :meth:`complete`, so that ``path`` never holds a partial download.
+    """
+
+    def __init__(
+        self,
+        fetch_range,
+        path,
+        size,
+        segment_size=64 * 1024 * 1024,
+        max_workers=4,
+        chunk_size=1024 * 1024,
+        checksum=None,
+    ):
+        """Initialize download.
+
+        :param fetch_range: callable returning the (streamed) response of the
+            ``[start, end]`` byte range of the file.
+        :param path: path of the output file.
+        :param size: size of the file.
+        :param checksum: checksum of the file, a resumed download is discarded
+            if the checksum of the file changed.
+        """
+        self._fetch_range = fetch_range
+        self.path = os.fspath(path)
+        self.part_path = f"{self.path}.part"
+        self.state_path = f"{self.path}.segments"
+        self.size = size
+        self.segment_size = segment_size
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.checksum = checksum
+        self._lock = threading.Lock()
+        self._done = set()
+
+    @property
+    def segments(self):
+        """List of ``(index, start, end)`` of all the segments."""
+        return [
+            (i, start, min(start + self.segment_size, self.size) - 1)
+            for i, start in enumerate(range(0, self.size, self.segment_size))
+        ]
+
+    def _load_state(self):
+        """Load the completed segments of a previous download."""
+        expected = {
+            "size": self.size,
+            "segment_size": self.segment_size,
+            "checksum": self.checksum,
+        }
+        state = load_state(self.state_path)
+        if not isinstance(state, dict) or not os.path.exists(self.part_path):
+            return set()
+        if any(state.get(k) != v for k, v in expected.items()):
+            return set()
+        return set(state["done"])
+
+    def _save_state(self):
+        """Record the completed segments."""
+        state = {
+            "size": self.size,
+            "segment_size": self.segment_size,
+            "checksum": self.checksum,
+            "done": sorted(self._done),
+        }
+        save_state(self.state_path, state)
+
+    def _write_segment(self, segment, response):
+        """Write the (streamed) response of a segment at its offset."""
+        _, start, _ = segment
+        written = 0
+        try:
+            with open(self.part_path, "r+b") as fp:
+                fp.seek(start)
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    fp.write(chunk)
+                    written += len(chunk)
+                self._sync_segment(fp)
+        finally:
+            response.close()
+        self._segment_written(segment, written)
+
+    def _sync_segment(self, fp):
+        """Flush a written segment to the disk.
+
+        The segment is only recorded as completed afterwards, so that a
+        resumed download does not skip segments lost by a crash.
+        """
+        fp.flush()
+        os.fsync(fp.fileno())
+
+    def _segment_written(self, segment, written):
+        """Record a segment as completed, once all its bytes were written."""
+        index, start, end = segment
+        if written != end - start + 1:
+            raise IOError(
+                f"Incomplete segment {start}-{end} of {self.path}: "
+                f"got {written} bytes."
+            )
+        with self._lock:
+            self._done.add(index)
+            self._save_state()
+
+    def _download_segment(self, segment):
+        """Fetch a segment and write it."""
+        _, start, end = segment
+        self._write_segment(segment, self._fetch_range(start, end))
+
+    def run(self):
+        """Download the missing segments.
+
+        :returns: ``False`` if the server does not support range requests, in
+            which case nothing was written.
+        """
+        self._done = self._load_state()
+        pending = [s for s in self.segments if s[0] not in self._done]
+        if not pending:
+            self._truncate()
+            return True
+
+        # The first segment tells whether the server honours range requests.
+        first = pending.pop(0)
+        response = self._fetch_range(first[1], first[2])
+        if response.status_code != 206:
+            response.close()
+            return False
+
+        self._truncate()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self._write_segment, first, response)]
+            futures += [executor.submit(self._download_segment, s) for s in pending]
+            for future in futures:
+                future.result()
+        return True
+
+    def _truncate(self):
+        """Create or preallocate the ``.part`` file to its final size."""
+        mode = "r+b" if os.path.exists(self.part_path) else "wb"
+        with open(self.part_path, mode) as fp:
+            fp.truncate(self.size)
+
+    def finish(self):
+        """Remove the record of the completed segments."""
+        remove_file(self.state_path)
+
+    def complete(self):
+        """Rename the downloaded ``.part`` file to the output path."""
+        os.replace(self.part_path, self.path)
+
+
+class FileSlice:
+    """Read-only file-like view of a byte range of a file.
+
+    Used to upload a part of a file as a request body, streamed from the disk
+    with its length known upfront.
+    """
+
+    def __init__(self, path, offset, length):
+        """Initialize slice."""
+        self._fp = open(path, "rb")
+        self._fp.seek(offset)
+        self._length = length
+        self._remaining = length
+
+    def __len__(self):
+        """Length of the slice."""
+        return self._length
+
+    def read(self, size=-1):
+        """Read up to ``size`` bytes of the slice."""
+        if size is None or size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._fp.read(size)
+        self._remaining -= len(data)
+        return data
+
+    def close(self):
+        """Close the underlying file."""
+        self._fp.close()
+
+    def __enter__(self):
+        """Enter the context."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Close the underlying file."""
+        self.close()
+
+
+#: Client errors worth retrying: request timeouts and rate limiting.
+RETRYABLE_STATUSES = (408, 429)
+
+
+def is_retryable(error):
+    """Whether a failed request is worth retrying.
+
+    Connection errors, server errors (5xx), timeouts (408) and rate limiting
+    (429) are, other client errors (4xx), e.g. an expired pre-signed URL or a
+    rejected part, are not.
+    """
+    response = getattr(error, "response", None)
+    if response is None:
+        return True
+    return response.status_code >= 500 or response.status_code in RETRYABLE_STATUSES
+
+
+class MultipartUpload:
+    """Upload the parts of a file concurrently, retrying failed parts.
+
+    The data is either a path to a file, whose parts are streamed from the
+    disk, or a bytes-like object, whose parts are sent as memory views.
+    """
+
+    #: Errors of the requests, retried if :func:`is_retryable`. Connection and
+    #: HTTP errors of ``requests`` are OSErrors.
+    errors = (OSError,)
+
+    def __init__(
+        self,
+        data,
+        part_size=64 * 1024 * 1024,
+        max_workers=4,
+        max_retries=3,
+        backoff=0.5,
+    ):
+        """Initialize upload.
+
+        :param max_retries: maximum number of retries of a failed part.
+        :param backoff: delay before the first retry of a part, doubled on
+            each subsequent retry, unless the response of the part has a
+            ``Retry-After`` header.
+        """
+        self.data = data
+        self.part_size = part_size
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+        if isinstance(data, (str, os.PathLike)):
+            self.size = os.path.getsize(data)
+        else:
+            self.data = memoryview(data).cast("B")
+            self.size = self.data.nbytes
+
+    @property
+    def parts(self):
+        """Number of parts."""
+        return max(1, -(-self.size // self.part_size))
+
+    def _body(self, part):
+        """Body of a part."""
+        offset = (part - 1) * self.part_size
+        length = min(self.part_size, self.size - offset)
+        if isinstance(self.data, memoryview):
+            return nullcontext(self.data[offset : offset + length])
+        return FileSlice(self.data, offset, length)
+
+    def _delay(self, error, attempt):
+        """Delay before retrying a failed part."""
+        response = getattr(error, "response", None)
+        delay = None if response is None else retry_after(response)
+        return self.backoff * 2**attempt if delay is None else delay
+
+    def _upload(self, upload_part, part):
+        """Upload a part, retrying on errors."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                with self._body(part) as body:
+                    return upload_part(part, body)
+            except self.errors as e:
+                if attempt == self.max_retries or not is_retryable(e):
+                    raise
+                time.sleep(self._delay(e, attempt))
+
+    def run(self, upload_part):
+        """Upload all the parts.
+
+        :param upload_part: callable uploading a part, given its number
+            (starting at 1) and its body.
+
+        If a part fails, the parts not started yet are cancelled and the
+        error is raised.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [
+                executor.submit(self._upload, upload_part, part)
+                for part in range(1, self.parts + 1)
+            ]
+            try:
+                for future in as_completed(futures):
+                    future.result()
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+            return [future.result() for future in futures]
@@ -0,0 +1,348 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# inveniordm-py is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Instrumentation of the HTTP requests of a client."""
+
+import json
+import threading
+import time
+from collections import Counter
+
+
+class RequestEvent:
+    """Measurements of one HTTP request.
+
+    ``endpoint`` is the endpoint template of the request, e.g.
+    ``/records/{id_}/draft``. Sizes are ``None`` when unknown, e.g. for
+    streamed bodies, and ``status`` is ``None`` if the request failed with
+    ``error``.
+    """
+
+    __slots__ = (
+        "method",
+        "endpoint",
+        "url",
+        "status",
+        "latency",
+        "ttfb",
+        "request_bytes",
+        "response_bytes",
+        "retries",
+        "error",
+    )
+
+    def __init__(
+        self,
+        method,
+        endpoint,
+        url,
+        status=None,
+        latency=0.0,
+        ttfb=None,
+        request_bytes=None,
+        response_bytes=None,
+        retries=0,
+        error=None,
+    ):
+        """Initialize event."""
+        self.method = method
+        self.endpoint = endpoint
+        self.url = url
+        self.status = status
+        self.latency = latency
+        self.ttfb = ttfb
+        self.request_bytes = request_bytes
+        self.response_bytes = response_bytes
+        self.retries = retries
+        self.error = error
+
+    def __repr__(self):
+        """String representation."""
+        return (
+            f"<RequestEvent {self.method} {self.endpoint} status={self.status} "
+            f"latency={self.latency:.3f}s>"
+        )
+
+
+class Histogram:
+    """Histogram of observed values, with cumulative buckets."""
+
+    def __init__(self, buckets):
+        """Initialize histogram.
+
+        :param buckets: sorted upper bounds of the buckets.
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        """Add a value."""
+        with self._lock:
+            self.count += 1
+            self.sum += value
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self.counts[i] += 1
+                    break
+
+    def cumulative(self):
+        """List of ``(upper bound, number of values)``, up to infinity."""
+        total, result = 0, []
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            result.append((bound, total))
+        result.append((float("inf"), self.count))
+        return result
+
+    def as_dict(self):
+        """Dictionary representation."""
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "buckets": {str(b): c for b, c in self.cumulative()},
+        }
+
+
+def _body_size(body):
+    """Size of a request body, or ``None`` if unknown."""
+    if body is None:
+        return 0
+    if isinstance(body, memoryview):
+        return body.nbytes
+    if isinstance(body, (bytes, bytearray, str)) or hasattr(body, "__len__"):
+        return len(body)
+    return None
+
+
+def _response_size(response, stream):
+    """Size of a response body, or ``None`` if unknown."""
+    length = response.headers.get("Content-Length")
+    if length is not None:
+        try:
+            return int(length)
+        except (TypeError, ValueError):
+            pass
+    if stream:
+        # Reading the content would consume the stream.
+        return None
+    return len(response.content)
+
+
+def _elapsed(response):
+    """Time until the response headers were received, if available."""
+    try:
+        return response.elapsed.total_seconds()
+    except (AttributeError, RuntimeError):
+        return None
+
+
+def _escape(value):
+    """Escape a Prometheus label value."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels):
+    """Format Prometheus labels."""
+    return ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+
+
+def _bound(value):
+    """Format a bucket bound for Prometheus."""
+    return "+Inf" if value == float("inf") else repr(float(value))
+
+
+class Instrumentation:
+    """Measurements of the HTTP requests of a client.
+
+    Each request sent by the resources of the client is recorded per method
+    and endpoint template: latency, time to first byte, request and response
+    sizes in histograms, and the number of requests per status and retries in
+    counters. Callbacks registered with :meth:`add_callback` receive the
+    :class:`RequestEvent` of each request.
+
+    Usage:
+
+    .. code-block:: python
+
+        instrumentation = Instrumentation()
+        instrumentation.add_callback(lambda event: print(event))
+        client = InvenioAPI(base_url, token, instrumentation=instrumentation)
+        ...
+        print(instrumentation.to_prometheus())
+    """
+
+    latency_buckets = (
+        0.005,
+        0.01,
+        0.025,
+        0.05,
+        0.1,
+        0.25,
+        0.5,
+        1.0,
+        2.5,
+        5.0,
+        10.0,
+        30.0,
+        60.0,
+    )
+    size_buckets = tuple(256 * 4**i for i in range(13))
+
+    _histograms = {
+        "latency": ("request_duration_seconds", "Duration of the requests."),
+        "ttfb": ("time_to_first_byte_seconds", "Time until the response headers."),
+        "request_bytes": ("request_size_bytes", "Size of the request bodies."),
+        "response_bytes": ("response_size_bytes", "Size of the response bodies."),
+    }
+
+    def __init__(self, namespace="inveniordm"):
+        """Initialize instrumentation.
+
+        :param namespace: prefix of the Prometheus metric names.
+        """
+        self.namespace = namespace
+        self.callbacks = []
+        self._endpoints = {}
+        self._statuses = Counter()
+        self._retries = Counter()
+        self._lock = threading.Lock()
+
+    def add_callback(self, callback):
+        """Register a callable called with the event of each request."""
+        self.callbacks.append(callback)
+
+    def remove_callback(self, callback):
+        """Unregister a callback."""
+        self.callbacks.remove(callback)
+
+    def _histograms_of(self, key):
+        """Get the histograms of an endpoint, creating them if needed."""
+        histograms = self._endpoints.get(key)
+        if histograms is None:
+            with self._lock:
+                histograms = self._endpoints.setdefault(
+                    key,
+                    {
+                        "latency": Histogram(self.latency_buckets),
+                        "ttfb": Histogram(self.latency_buckets),
+                        "request_bytes": Histogram(self.size_buckets),
+                        "response_bytes": Histogram(self.size_buckets),
+                    },
+                )
+        return histograms
+
+    def observe(
+        self,
+        method,
+        endpoint,
+        url,
+        start,
+        body=None,
+        response=None,
+        stream=False,
+        retries=0,
+        error=None,
+    ):
+        """Record a request sent at ``start`` (a ``time.perf_counter()``)."""
+        latency = time.perf_counter() - start
+        event = RequestEvent(
+            method,
+            endpoint,
+            url,
+            latency=latency,
+            request_bytes=_body_size(body),
+            retries=retries,
+            error=error,
+        )
+        if response is not None:
+            event.status = response.status_code
+            event.ttfb = _elapsed(response)
+            event.response_bytes = _response_size(response, stream)
+        self.record(event)
+        return event
+
+    def record(self, event):
+        """Record a request event and pass it to the callbacks."""
+        key = (event.method, event.endpoint)
+        histograms = self._histograms_of(key)
+        histograms["latency"].observe(event.latency)
+        for name in ("ttfb", "request_bytes", "response_bytes"):
+            value = getattr(event, name)
+            if value is not None:
+                histograms[name].observe(value)
+        status = event.status if event.status is not None else "error"
+        with self._lock:
+            self._statuses[key + (status,)] += 1
+            if event.retries:
+                self._retries[key] += event.retries
+        for callback in self.callbacks:
+            callback(event)
+
+    def reset(self):
+        """Remove all the measurements."""
+        with self._lock:
+            self._endpoints.clear()
+            self._statuses.clear()
+            self._retries.clear()
+
+    def as_dict(self):
+        """Measurements, per ``"<method> <endpoint>"``."""
+        result = {}
+        for (method, endpoint), histograms in sorted(self._endpoints.items()):
+            result[f"{method} {endpoint}"] = {
+                **{name: h.as_dict() for name, h in histograms.items()},
+                "statuses": {
+                    str(s): n
+                    for (m, e, s), n in self._statuses.items()
+                    if (m, e) == (method, endpoint)
+                },
+                "retries": self._retries[method, endpoint],
+            }
+        return result
+
+    def to_json(self, **kwargs):
+        """Export the measurements as JSON."""
+        return json.dumps(self.as_dict(), **kwargs)
+
+    def to_prometheus(self):
+        """Export the measurements in the Prometheus text format."""
+        ns = self.namespace
+        lines = []
+        endpoints = sorted(self._endpoints.items())
+        for name, (metric, doc) in self._histograms.items():
+            lines += [f"# HELP {ns}_{metric} {doc}", f"# TYPE {ns}_{metric} histogram"]
+            for (method, endpoint), histograms in endpoints:
+                h = histograms[name]
+                labels = _labels(method=method, endpoint=endpoint)
+                for bound, count in h.cumulative():
+                    lines.append(
+                        f'{ns}_{metric}_bucket{{{labels},le="{_bound(bound)}"}} {count}'
+                    )
+                lines.append(f"{ns}_{metric}_sum{{{labels}}} {h.sum}")
+                lines.append(f"{ns}_{metric}_count{{{labels}}} {h.count}")
+
+        lines += [
+            f"# HELP {ns}_requests_total Number of requests per status.",
+            f"# TYPE {ns}_requests_total counter",
+        ]
+        for (method, endpoint, status), n in sorted(
+            self._statuses.items(), key=lambda item: tuple(map(str, item[0]))
+        ):
+            labels = _labels(method=method, endpoint=endpoint, status=status)
+            lines.append(f"{ns}_requests_total{{{labels}}} {n}")
+
+        lines += [
+            f"# HELP {ns}_request_retries_total Number of retried requests.",
+            f"# TYPE {ns}_request_retries_total counter",
+        ]
+        for (method, endpoint), n in sorted(self._retries.items()):
+            labels = _labels(method=method, endpoint=endpoint)
+            lines.append(f"{ns}_request_retries_total{{{labels}}} {n}")
+        return "\n".join(lines) + "\n"
@@ -7,32 +7,80 @@
 
 """Base metadata class."""
 
-import json
+from collections.abc import Sequence
+
+from .codec import default_codec
 
 
 class Metadata:
     """Base metadata class."""
 
+    __slots__ = ("_raw", "_decoded", "_codec")
+
     accept = ""
     content_type = ""
 
     @classmethod
-    def from_response(cls, response):
-        """Create metadata object from response."""
-        data = response.json()
+    def from_response(cls, response, lazy=False, codec=None):
+        """Create metadata object from response.
+
+        :param lazy: keep the raw response body, and only decode it when the
+            data is first accessed.
+        :param codec: the :mod:`~inveniordm_py.codec` decoding the body.
+        """
+        codec = codec or default_codec
+        if lazy:
+            return cls.from_bytes(response.content, codec=codec)
+        data = codec.load_response(response)
         return cls(**data)
 
+    @classmethod
+    def from_dict(cls, data):
+        """Create a metadata object holding a dictionary, without copying it.
+
+        Used for the hits of search pages, which share their dictionaries
+        with the page.
+        """
+        obj = cls.__new__(cls)
+        obj._codec = default_codec
+        obj._data = data
+        return obj
+
+    @classmethod
+    def from_bytes(cls, raw, codec=None):
+        """Create a lazy metadata object from a raw JSON document."""
+        obj = cls()
+        obj._raw = raw
+        if codec is not None:
+            obj._codec = codec
+        return obj
+
+    @property
+    def _data(self):
+        """Metadata dictionary, decoded on first access in lazy mode."""
+        if self._raw is not None:
+            self._decoded = self._codec.loads(self._raw)
+            self._raw = None
+        return self._decoded
+
+    @_data.setter
+    def _data(self, value):
+        """Set the metadata dictionary."""
+        self._decoded = value
+        self._raw = None
+
     @property
     def endpoint_kwargs(self):
         """Endpoint kwargs, delegated to the implementation."""
         raise NotImplementedError
 
-    def to_request(self):
+    def to_request(self, codec=None):
         """Convert metadata to request body (JSON)."""
-        return json.dumps(self._data)
+        return (codec or default_codec).dumps(self._data)
 
     def __init__(self, **data):
         """Initialize metadata object."""
+        self._codec = default_codec
         self._data = data
 
     def __getitem__(self, key):
@@ -54,12 +102,33 @@ class Metadata:
 class ListMetadata(Metadata):
     """List metadata class."""
 
+    __slots__ = ("_hits",)
+
     item_class = None
 
+    def __init__(self, **data):
+        """Initialize metadata object."""
+        self._hits = None
+        super().__init__(**data)
+
     @property
     def hits(self):
-        """List of hits."""
-        return [self.item_class(**h) for h in self._data["hits"]["hits"]]
+        """Sequence of hits, each created on first access and memoized."""
+        hits = self._data["hits"]["hits"]
+        if self._hits is None or self._hits.source is not hits:
+            self._hits = LazyHits(hits, self._make_hit)
+        return self._hits
+
+    @classmethod
+    def from_dict(cls, data):
+        """Create a metadata object holding a dictionary, without copying it."""
+        obj = super().from_dict(data)
+        obj._hits = None
+        return obj
+
+    def _make_hit(self, hit):
+        """Create an item from the dictionary of a hit."""
+        return self.item_class.from_dict(hit)
 
     @property
     def total(self):
@@ -70,3 +139,46 @@ class ListMetadata(Metadata):
     def aggregations(self):
         """Search aggregations."""
         return self._data["aggregations"]
+
+    @property
+    def links(self):
+        """Links to the other pages of the search results."""
+        return self._data.get("links", {})
+
+
+class LazyHits(Sequence):
+    """Sequence of hits, created from their source on first access.
+
+    The created hits are memoized, so that iterating several times over the
+    sequence does not create new objects.
+    """
+
+    __slots__ = ("source", "_factory", "_items")
+
+    def __init__(self, source, factory):
+        """Initialize sequence.
+
+        :param source: sequence of the hits, e.g. dictionaries.
+        :param factory: callable creating an item from a hit of the source.
+        """
+        self.source = source
+        self._factory = factory
+        self._items = [None] * len(source)
+
+    def __len__(self):
+        """Number of hits."""
+        return len(self._items)
+
+    def __getitem__(self, index):
+        """Get a hit, or a list of hits for a slice."""
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._items)))]
+        item = self._items[index]
+        if item is None:
+            item = self._items[index] = self._factory(self.source[index])
+        return item
+
+    def __iter__(self):
+        """Iterate over the hits."""
+        for index in range(len(self._items)):
+            yield self[index]
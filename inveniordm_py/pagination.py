@@ -7,27 +7,187 @@
 
 """Pagination classes."""
 
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+from queue import Full, Queue
+
+from .metadata import LazyHits
+from .streaming import HitsParser
+
+_done = object()
+
+
+def _put(queue, stop, item):
+    """Put an item in a queue, unless the consumer stopped.
+
+    :returns: whether the item was put.
+    """
+    while not stop.is_set():
+        try:
+            queue.put(item, timeout=0.1)
+            return True
+        except Full:
+            continue
+    return False
+
+
+def _drain(queue):
+    """Yield the items of a queue until done, raising the errors put in it."""
+    while True:
+        item = queue.get()
+        if item is _done:
+            return
+        if isinstance(item, Exception):
+            raise item
+        yield item
+
 
 class SimplePagination:
     """Simple pagination class."""
 
+    __slots__ = (
+        "_data_list",
+        "_factory",
+        "_hits",
+        "_prev_page",
+        "_next_page",
+    )
+
     def __init__(self, data_list, factory, prev_page, next_page):
-        """Initialize pagination object."""
+        """Initialize pagination object.
+
+        The metadata of the page (e.g. lazily decoded ones) are only read on
+        first access. Items are created from the hits of the page on first
+        access, and memoized.
+        """
+        self._data_list = data_list
         self._factory = factory
-        self._hits = data_list.hits
-        self._total = data_list.total
-        self._aggregations = data_list.aggregations
+        self._hits = None
         self._prev_page = prev_page
         self._next_page = next_page
 
+    def _items(self):
+        """Sequence of the items of the page."""
+        if self._hits is None:
+            self._hits = LazyHits(self._data_list.hits, self._factory)
+        return self._hits
+
     def __iter__(self):
         """Iterator over search hits."""
-        for h in self._hits:
-            yield self._factory(h)
+        return iter(self._items())
 
     def __len__(self):
         """Number of search hits."""
-        return len(self._hits)
+        return len(self._items())
+
+    @property
+    def total(self):
+        """Total number of hits of the search."""
+        return self._data_list.total
+
+    @property
+    def aggregations(self):
+        """Search aggregations."""
+        return self._data_list.aggregations
+
+    def next_page(self):
+        """Get next page of the search results."""
+        return self._next_page()
+
+    def prev_page(self):
+        """Get previous page of the search results."""
+        return self._prev_page()
+
+
+class StreamingPagination:
+    """Page of search results, parsed while the response is downloaded.
+
+    Hits are yielded as soon as they are parsed, so that the first ones are
+    processed while the rest of the page is still being downloaded, and the
+    page is never held in memory at once. The hits can only be iterated
+    once. The total and aggregations are available once the whole response
+    has been parsed: accessing them earlier reads the rest of the response,
+    keeping the remaining hits for the iteration.
+    """
+
+    __slots__ = (
+        "_response",
+        "_parser",
+        "_factory",
+        "_chunk_size",
+        "_stream",
+        "_pending",
+        "_data",
+        "_prev_page",
+        "_next_page",
+    )
+
+    def __init__(
+        self,
+        response,
+        factory,
+        prev_page,
+        next_page,
+        codec=None,
+        chunk_size=64 * 1024,
+    ):
+        """Initialize pagination object.
+
+        :param response: the streamed search response.
+        :param factory: callable creating an item from the dictionary of a
+            hit.
+        """
+        self._response = response
+        self._parser = HitsParser(codec=codec)
+        self._factory = factory
+        self._chunk_size = chunk_size
+        self._stream = self._parse()
+        self._pending = deque()
+        self._data = None
+        self._prev_page = prev_page
+        self._next_page = next_page
+
+    def _parse(self):
+        """Parse the hits from the response, then the rest of the document."""
+        try:
+            for chunk in self._response.iter_content(chunk_size=self._chunk_size):
+                yield from self._parser.feed(chunk)
+            yield from self._parser.feed(b"", final=True)
+            self._data = self._parser.close()
+        finally:
+            self._response.close()
+
+    def _read_all(self):
+        """Parse the rest of the response, keeping the hits for iteration."""
+        if self._data is None:
+            self._pending.extend(self._stream)
+        return self._data
+
+    def __iter__(self):
+        """Iterator over search hits."""
+        while self._pending:
+            yield self._factory(self._pending.popleft())
+        for hit in self._stream:
+            yield self._factory(hit)
+        while self._pending:
+            yield self._factory(self._pending.popleft())
+
+    @property
+    def total(self):
+        """Total number of hits of the search."""
+        return self._read_all()["hits"]["total"]
+
+    @property
+    def aggregations(self):
+        """Search aggregations."""
+        return self._read_all()["aggregations"]
+
+    @property
+    def links(self):
+        """Links to the other pages of the search results."""
+        return self._read_all().get("links", {})
 
     def next_page(self):
         """Get next page of the search results."""
@@ -36,3 +196,223 @@ class SimplePagination:
     def prev_page(self):
         """Get previous page of the search results."""
         return self._prev_page()
+
+
+class PrefetchPagination:
+    """Iterator over the hits of all the pages of a search.
+
+    Pages are fetched by a background thread, which follows the ``links.next``
+    of each page and stays at most ``prefetch`` pages ahead of the consumer.
+    With ``prefetch=0`` pages are fetched on demand, in the calling thread.
+    """
+
+    __slots__ = ("_fetch_page", "_factory", "_prefetch")
+
+    def __init__(self, fetch_page, factory, prefetch=2):
+        """Initialize pagination object.
+
+        :param fetch_page: callable returning the page (a ``ListMetadata``) of
+            a given URL, or the first page if the URL is ``None``.
+        :param factory: callable creating an item from each hit.
+        :param prefetch: maximum number of pages fetched ahead.
+        """
+        self._fetch_page = fetch_page
+        self._factory = factory
+        self._prefetch = prefetch
+
+    def _pages(self, stop=None):
+        """Fetch the pages one after the other, following the next links."""
+        url = None
+        while stop is None or not stop.is_set():
+            page = self._fetch_page(url)
+            yield page
+            url = page.links.get("next")
+            if not url or not page.hits:
+                return
+
+    def _produce(self, queue, stop):
+        """Fetch pages into the queue, until exhausted or stopped."""
+        try:
+            for page in self._pages(stop):
+                _put(queue, stop, page)
+        except Exception as e:
+            _put(queue, stop, e)
+        else:
+            _put(queue, stop, _done)
+
+    def pages(self):
+        """Iterator over the pages of the search results."""
+        if self._prefetch <= 0:
+            yield from self._pages()
+            return
+
+        queue = Queue(maxsize=self._prefetch)
+        stop = threading.Event()
+        producer = threading.Thread(
+            target=self._produce, args=(queue, stop), daemon=True
+        )
+        producer.start()
+        try:
+            yield from _drain(queue)
+        finally:
+            # Also reached when the consumer stops iterating early.
+            stop.set()
+
+    def __iter__(self):
+        """Iterator over the search hits of all the pages."""
+        for page in self.pages():
+            for h in page.hits:
+                yield self._factory(h)
+
+
+def parse_datetime(value):
+    """Parse an ISO 8601 timestamp as returned by the REST API."""
+    if isinstance(value, datetime):
+        return value
+    # Python < 3.11 does not support the "Z" suffix.
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+class PartitionedPagination:
+    """Iterator over all the hits of a search, beyond the search window.
+
+    The search engine refuses to paginate past its result window (10000 hits
+    by default). To work around it, the range of values of a date ``field``
+    (e.g. ``created``) is split into half-open ``[lower, upper)`` partitions,
+    bisected until each of them contains at most ``partition_size`` hits, and
+    each partition is then paginated on its own.
+
+    Partitions are disjoint and cover the whole range, so no hit is returned
+    twice or skipped, provided that ``field`` is not modified while scanning.
+    Counting and fetching the partitions is done by a pool of ``max_workers``
+    threads, hits are yielded in the order of the partitions. Each worker
+    streams the hits of its partition through a queue of at most
+    ``buffer_size`` hits, so that the memory used does not depend on the
+    size of the partitions.
+    """
+
+    __slots__ = (
+        "_count",
+        "_scan",
+        "_q",
+        "_field",
+        "_lower",
+        "_upper",
+        "_partition_size",
+        "_max_workers",
+        "_buffer_size",
+    )
+
+    # The search engine stores dates with a millisecond precision.
+    resolution = timedelta(milliseconds=1)
+
+    def __init__(
+        self,
+        count,
+        scan,
+        q,
+        field,
+        lower,
+        upper,
+        partition_size=10000,
+        max_workers=4,
+        buffer_size=1000,
+    ):
+        """Initialize pagination object.
+
+        :param count: callable returning the number of hits of a query.
+        :param scan: callable returning an iterable over the hits of a query.
+        :param q: the search query.
+        :param field: the date field used to partition the search.
+        :param lower: lowest value (included) of ``field`` to scan.
+        :param upper: highest value (included) of ``field`` to scan.
+        :param buffer_size: maximum number of hits fetched ahead per
+            partition.
+        """
+        self._count = count
+        self._scan = scan
+        self._q = q
+        self._field = field
+        self._lower = self._truncate(parse_datetime(lower))
+        self._upper = self._truncate(parse_datetime(upper)) + self.resolution
+        self._partition_size = partition_size
+        self._max_workers = max_workers
+        self._buffer_size = buffer_size
+
+    def _truncate(self, value):
+        """Truncate a datetime to the resolution of the search engine."""
+        return value.replace(microsecond=value.microsecond // 1000 * 1000)
+
+    def _format(self, value):
+        """Format a datetime for a range query."""
+        return value.isoformat(timespec="milliseconds")
+
+    def query(self, lower, upper):
+        """Query restricted to the ``[lower, upper)`` partition."""
+        range_q = f'{self._field}:["{self._format(lower)}" TO "{self._format(upper)}"}}'
+        return f"({self._q}) AND {range_q}" if self._q else range_q
+
+    def _split(self, lower, upper):
+        """Split a partition in two halves."""
+        middle = self._truncate(lower + (upper - lower) / 2)
+        if middle <= lower:
+            raise ValueError(
+                f"Cannot split the search on '{self._field}' below "
+                f"{self._partition_size} hits, around {self._format(lower)}."
+            )
+        return (lower, middle), (middle, upper)
+
+    def partitions(self, executor):
+        """Compute the partitions, sorted by range.
+
+        :returns: a list of ``(lower, upper, total)`` tuples.
+        """
+        result = []
+        pending = {}
+
+        def submit(lower, upper):
+            future = executor.submit(self._count, self.query(lower, upper))
+            pending[future] = (lower, upper)
+
+        submit(self._lower, self._upper)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                lower, upper = pending.pop(future)
+                total = future.result()
+                if total > self._partition_size:
+                    for half in self._split(lower, upper):
+                        submit(*half)
+                elif total > 0:
+                    result.append((lower, upper, total))
+        return sorted(result)
+
+    def _produce(self, q, queue, stop):
+        """Fetch the hits of a partition into the queue."""
+        try:
+            for hit in self._scan(q):
+                if not _put(queue, stop, hit):
+                    return
+        except Exception as e:
+            _put(queue, stop, e)
+        else:
+            _put(queue, stop, _done)
+
+    def __iter__(self):
+        """Iterator over the search hits of all the partitions."""
+        stop = threading.Event()
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            try:
+                queues = deque()
+                for lower, upper, _ in self.partitions(executor):
+                    queue = Queue(maxsize=self._buffer_size)
+                    q = self.query(lower, upper)
+                    executor.submit(self._produce, q, queue, stop)
+                    queues.append(queue)
+                    if len(queues) >= self._max_workers:
+                        yield from _drain(queues.popleft())
+                while queues:
+                    yield from _drain(queues.popleft())
+            finally:
+                # Also reached when the consumer stops iterating early.
+                stop.set()
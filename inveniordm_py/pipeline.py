@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# inveniordm-py is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Pipelined deposit of records."""
+
+import threading
+import time
+from queue import Queue
+
+from .files.metadata import FilesListMetadata
+from .records.metadata import DraftMetadata
+
+
+class Deposit:
+    """A record to deposit, with its files.
+
+    Once processed by a :class:`DepositPipeline`, ``draft`` and ``record``
+    hold the created draft and published record, or ``error`` and ``stage``
+    the exception that stopped the deposit and the stage that raised it.
+    """
+
+    def __init__(self, metadata, files=None, publish=True):
+        """Initialize deposit.
+
+        :param metadata: draft metadata, as a ``DraftMetadata`` or dictionary.
+        :param files: dictionary of file keys to the data to upload, see
+            ``DraftFile.set_contents``.
+        :param publish: whether to publish the draft.
+        """
+        self.metadata = metadata
+        self.files = files or {}
+        self.publish = publish
+        self.draft = None
+        self.record = None
+        self.error = None
+        self.stage = None
+
+    @property
+    def ok(self):
+        """Whether the deposit went through all its stages."""
+        return self.error is None
+
+
+class StageStats:
+    """Statistics of a pipeline stage."""
+
+    def __init__(self, name, workers):
+        """Initialize statistics."""
+        self.name = name
+        self.workers = workers
+        self.succeeded = 0
+        self.failed = 0
+        self.busy = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, duration, error=None):
+        """Record the processing of a deposit."""
+        with self._lock:
+            self.busy += duration
+            if error is None:
+                self.succeeded += 1
+            else:
+                self.failed += 1
+
+
+class PipelineReport:
+    """Throughput and error report of a pipeline run."""
+
+    def __init__(self, stages, deposits, elapsed):
+        """Initialize report."""
+        self.stages = stages
+        self.deposits = deposits
+        self.elapsed = elapsed
+
+    @property
+    def succeeded(self):
+        """Number of deposits that went through all their stages."""
+        return sum(1 for d in self.deposits if d.ok)
+
+    @property
+    def errors(self):
+        """List of the failed deposits."""
+        return [d for d in self.deposits if not d.ok]
+
+    @property
+    def throughput(self):
+        """Number of successful deposits per second."""
+        return self.succeeded / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self):
+        """Summary of the run."""
+        lines = [
+            f"{len(self.deposits)} deposits in {self.elapsed:.2f}s: "
+            f"{self.succeeded} succeeded, {len(self.errors)} failed "
+            f"({self.throughput:.2f} deposits/s)"
+        ]
+        for stage in self.stages.values():
+            # Busy time of the workers over their available time.
+            available = stage.workers * self.elapsed
+            lines.append(
+                f"  {stage.name}: {stage.succeeded} succeeded, "
+                f"{stage.failed} failed, {stage.workers} workers, "
+                f"{100 * stage.busy / available if available else 0:.0f}% busy"
+            )
+        return "\n".join(lines)
+
+
+class DepositPipeline:
+    """Deposit records through concurrent stages.
+
+    Each deposit goes through three stages: creating the draft, uploading
+    its files (initializing, uploading and committing each of them), and
+    publishing it. Stages run concurrently with their own number of workers
+    and are connected by bounded queues, so that e.g. the draft of a record
+    is created while the files of the previous one are uploaded.
+
+    Usage:
+
+    .. code-block:: python
+
+        pipeline = DepositPipeline(client, upload_workers=8)
+        report = pipeline.run(
+            Deposit(metadata, files={"data.csv": "/path/to/data.csv"})
+            for metadata in records
+        )
+        print(report)
+    """
+
+    _stop = object()
+
+    def __init__(
+        self,
+        client,
+        create_workers=4,
+        upload_workers=4,
+        publish_workers=2,
+        queue_size=None,
+    ):
+        """Initialize pipeline.
+
+        :param queue_size: maximum number of deposits waiting between two
+            stages, by default twice the number of workers of the next stage.
+        """
+        self._client = client
+        self._workers = {
+            "create": create_workers,
+            "upload": upload_workers,
+            "publish": publish_workers,
+        }
+        self._queue_size = queue_size
+
+    def create(self, deposit):
+        """Create the draft of a deposit."""
+        metadata = deposit.metadata
+        if not isinstance(metadata, DraftMetadata):
+            metadata = DraftMetadata(**metadata)
+        deposit.draft = self._client.records.create(metadata)
+
+    def upload(self, deposit):
+        """Upload and commit the files of a deposit."""
+        if not deposit.files:
+            return
+        files = deposit.draft.files
+        files.create(FilesListMetadata([{"key": key} for key in deposit.files]))
+        for key, data in deposit.files.items():
+            f = files(key)
+            f.set_contents(data)
+            f.commit()
+
+    def publish(self, deposit):
+        """Publish the draft of a deposit."""
+        if deposit.publish:
+            deposit.record = deposit.draft.publish()
+
+    def _work(self, name, stats, inbox, outbox):
+        """Process deposits of a stage until stopped."""
+        process = getattr(self, name)
+        while True:
+            deposit = inbox.get()
+            if deposit is self._stop:
+                return
+            start = time.perf_counter()
+            try:
+                process(deposit)
+            except Exception as e:
+                deposit.error, deposit.stage = e, name
+            stats.record(time.perf_counter() - start, deposit.error)
+            if deposit.ok and outbox is not None:
+                outbox.put(deposit)
+
+    def run(self, deposits):
+        """Run the deposits through the pipeline, until all are processed.
+
+        :param deposits: iterable of :class:`Deposit`, consumed lazily.
+        :returns: a :class:`PipelineReport`.
+        """
+        start = time.perf_counter()
+        self._client.ensure_pool_size(sum(self._workers.values()))
+        names = list(self._workers)
+        stats = {name: StageStats(name, self._workers[name]) for name in names}
+        queues = [
+            Queue(maxsize=self._queue_size or 2 * self._workers[name]) for name in names
+        ]
+        threads = []
+        for i, name in enumerate(names):
+            outbox = queues[i + 1] if i + 1 < len(names) else None
+            threads.append(
+                [
+                    threading.Thread(
+                        target=self._work,
+                        args=(name, stats[name], queues[i], outbox),
+                        daemon=True,
+                    )
+                    for _ in range(self._workers[name])
+                ]
+            )
+            for thread in threads[-1]:
+                thread.start()
+
+        processed = []
+        for deposit in deposits:
+            processed.append(deposit)
+            queues[0].put(deposit)
+
+        # Stop the stages one after the other, once their inputs are drained.
+        for queue, stage_threads in zip(queues, threads):
+            for _ in stage_threads:
+                queue.put(self._stop)
+            for thread in stage_threads:
+                thread.join()
+
+        return PipelineReport(stats, processed, time.perf_counter() - start)
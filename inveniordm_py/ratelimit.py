@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# inveniordm-py is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Client-side rate limiting."""
+
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+
+
+def _number(value):
+    """Parse a numeric header value, or return ``None``."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def retry_after(response):
+    """Delay given by the ``Retry-After`` header of a response, in seconds.
+
+    :returns: ``None`` if the response has no (valid) header.
+    """
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    seconds = _number(value)
+    if seconds is not None:
+        return max(seconds, 0.0)
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Adaptive token bucket.
+
+    Requests take a token from the bucket, which is refilled at ``rate``
+    tokens per second up to ``burst`` tokens. The rate is adapted to the
+    responses of the server: it is multiplied by ``decrease`` when the
+    server throttles requests, and raised by ``increase`` on each successful
+    request, up to ``max_rate``. A bucket can also be paused, e.g. until the
+    time given by a ``Retry-After`` header.
+    """
+
+    def __init__(
+        self, max_rate=None, burst=None, min_rate=0.1, increase=0.1, decrease=0.5
+    ):
+        """Initialize bucket.
+
+        :param max_rate: maximum number of requests per second, ``None`` for
+            no limit until the server throttles requests.
+        :param burst: maximum number of requests sent at once, by default one
+            second of requests.
+        """
+        self.max_rate = max_rate
+        self.rate = max_rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.increase = increase
+        self.decrease = decrease
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._recent = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def _capacity(self):
+        """Maximum number of tokens."""
+        if self.burst is not None:
+            return self.burst
+        return max(self.rate or 1.0, 1.0)
+
+    def _refill(self, now):
+        """Add the tokens accumulated since the last update."""
+        if self.rate is not None:
+            elapsed = now - self._updated
+            self._tokens = min(self._capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def _observed_rate(self, now):
+        """Number of requests sent during the last second."""
+        while self._recent and self._recent[0] < now - 1.0:
+            self._recent.popleft()
+        return float(len(self._recent))
+
+    def acquire(self):
+        """Take a token, waiting until one is available."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                else:
+                    self._refill(now)
+                    if self.rate is None or self._tokens >= 1:
+                        if self.rate is not None:
+                            self._tokens -= 1
+                        self._recent.append(now)
+                        return
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        """Hold all the requests of the bucket for some time."""
+        with self._lock:
+            until = time.monotonic() + seconds
+            self._paused_until = max(self._paused_until, until)
+
+    def throttled(self):
+        """Slow down after the server throttled a request."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            current = self.rate or max(self._observed_rate(now), self.min_rate)
+            self.rate = max(self.min_rate, current * self.decrease)
+            self._tokens = min(self._tokens, 0.0)
+
+    def succeeded(self):
+        """Speed up after a successful request."""
+        with self._lock:
+            if self.rate is None:
+                return
+            self._refill(time.monotonic())
+            self.rate = self.rate + self.increase
+            if self.max_rate is not None:
+                self.rate = min(self.rate, self.max_rate)
+
+    def pace(self, remaining, seconds):
+        """Spread the remaining requests allowed by the server over a window.
+
+        :returns: whether the rate was lowered.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            rate = max(remaining / seconds, self.min_rate)
+            if self.rate is None or rate < self.rate:
+                self.rate = rate
+                self._tokens = min(self._tokens, self._capacity)
+                return True
+            return False
+
+
+class RateLimiter:
+    """Rate limiter shared by all the resources of a client.
+
+    Requests are grouped in categories, each with its own token bucket:
+    ``search`` (search and list requests), ``read`` (other GET requests),
+    ``write`` (POST, PUT and DELETE requests) and ``files`` (file contents).
+
+    Responses with a status in ``retry_statuses`` (429 and 503 by default)
+    are retried up to ``max_retries`` times, after the delay given by their
+    ``Retry-After`` header or an exponential backoff. The ``X-RateLimit-*``
+    headers of the responses are used to pace the requests below the limit
+    of the server.
+
+    Usage:
+
+    .. code-block:: python
+
+        limiter = RateLimiter(rates={"search": 5, "write": 10})
+        client = InvenioAPI(base_url, token, rate_limiter=limiter)
+    """
+
+    categories = ("search", "read", "write", "files")
+
+    def __init__(
+        self,
+        rates=None,
+        burst=None,
+        max_retries=5,
+        backoff=1.0,
+        max_backoff=60.0,
+        retry_statuses=(429, 503),
+    ):
+        """Initialize rate limiter.
+
+        :param rates: dictionary of the maximum number of requests per second
+            of each category, unlimited by default.
+        :param burst: maximum number of requests sent at once in a category.
+        :param max_retries: maximum number of retries of a throttled request.
+        :param backoff: delay before the first retry, if the server did not
+            send a ``Retry-After`` header. Doubled for each retry.
+        """
+        rates = rates or {}
+        self.buckets = {
+            c: TokenBucket(max_rate=rates.get(c), burst=burst) for c in self.categories
+        }
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.retry_statuses = retry_statuses
+
+    def acquire(self, category):
+        """Wait until a request of the category can be sent."""
+        self.buckets[category].acquire()
+
+    def feedback(self, category, response, attempt):
+        """Adapt the rate of a category to a response.
+
+        :returns: the delay before retrying the request, or ``None`` if the
+            response must not be retried.
+        """
+        bucket = self.buckets[category]
+        remaining = _number(response.headers.get("X-RateLimit-Remaining"))
+        reset = _number(response.headers.get("X-RateLimit-Reset"))
+        limited = False
+        if remaining is not None and reset is not None:
+            # The reset header is a UNIX timestamp.
+            window = reset - time.time()
+            if window > 0:
+                if remaining < 1:
+                    bucket.pause(window)
+                    limited = True
+                else:
+                    limited = bucket.pace(remaining, window)
+
+        if response.status_code not in self.retry_statuses:
+            # The rate set from the headers is not raised right away.
+            if not limited:
+                bucket.succeeded()
+            return None
+
+        bucket.throttled()
+        if attempt >= self.max_retries:
+            return None
+        delay = retry_after(response)
+        if delay is None:
+            delay = min(self.backoff * 2**attempt, self.max_backoff)
+        bucket.pause(delay)
+        return delay
@@ -6,14 +6,15 @@
 # under the terms of the MIT License; see LICENSE file for more details.
 
 """Record metadata classes."""
-import json
-
+from inveniordm_py.codec import default_codec
 from inveniordm_py.metadata import ListMetadata, Metadata
 
 
 class RecordMetadata(Metadata):
     """Record metadata class."""
 
+    __slots__ = ()
+
     accept = "application/json"
     content_type = "application/json"
 
@@ -26,6 +27,8 @@ class RecordMetadata(Metadata):
 class DraftMetadata(Metadata):
     """Draft metadata class."""
 
+    __slots__ = ()
+
     accept = "application/vnd.inveniordm.v1+json"
     content_type = "application/json"
 
@@ -38,6 +41,8 @@ class DraftMetadata(Metadata):
 class RecordListMetadata(ListMetadata):
     """Record list metadata class."""
 
+    __slots__ = ()
+
     accept = "application/vnd.inveniordm.v1+json"
     item_class = RecordMetadata
 
@@ -45,6 +50,8 @@ class RecordListMetadata(ListMetadata):
 class RecordCommunityMetadata(Metadata):
     """Record community metadata class."""
 
+    __slots__ = ()
+
     accept = "application/json"
     content_type = "application/json"
 
@@ -65,12 +72,14 @@ class RecordCommunityMetadata(Metadata):
             )
         return req
 
-    def to_request(self):
+    def to_request(self, codec=None):
         """Convert metadata to request body."""
-        return json.dumps(self._serialize_data())
+        return (codec or default_codec).dumps(self._serialize_data())
 
 
 class RecordCommunitiesListMetadata(ListMetadata):
     """Record communities list metadata class."""
 
+    __slots__ = ()
+
     item_class = RecordCommunityMetadata
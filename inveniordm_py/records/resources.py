@@ -7,14 +7,28 @@
 
 """Record resources."""
 
+import os
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
+from urllib.parse import quote_plus
 
+from inveniordm_py.concurrency import bulk_map
+from inveniordm_py.errors import ChecksumError
+from inveniordm_py.export import SearchExport
 from inveniordm_py.files.metadata import (
     FileMetadata,
     FilesListMetadata,
     IncomingStream,
     OutgoingStream,
 )
+from inveniordm_py.files.transfer import (
+    ChecksumVerifier,
+    MultipartUpload,
+    SegmentedDownload,
+    content_size,
+    remove_file,
+)
+from inveniordm_py.pagination import PartitionedPagination, parse_datetime
 from inveniordm_py.records.metadata import (
     DraftMetadata,
     RecordCommunitiesListMetadata,
@@ -23,6 +37,7 @@ from inveniordm_py.records.metadata import (
     RecordMetadata,
 )
 from inveniordm_py.resources import Resource
+from inveniordm_py.sync import SyncCheckpoint
 
 
 class Record(Resource):
@@ -31,7 +46,10 @@ class Record(Resource):
     This is the resource that is used to interact with the /api/records/{id_} endpoint.
     """
 
+    __slots__ = ()
+
     endpoint = "/records/{id_}"
+    cache_type = "record"
 
     def get(self):
         """Get a record."""
@@ -86,6 +104,8 @@ class RecordVersions(Resource):
     This is the resource that is used to interact with the /api/records/{id_}/versions endpoint.
     """
 
+    __slots__ = ()
+
     endpoint = "/records/{id_}/versions"
 
     def create(self):
@@ -116,6 +136,18 @@ class RecordVersions(Resource):
             self._partial(self.search, params, page=params["page"] + 1),
         )
 
+    def scan(self, q="", size=100, sort="newest", allversions=True, prefetch=2):
+        """Iterate over all the versions of a record, across all pages.
+
+        See :meth:`RecordList.scan`.
+        """
+        params = dict(q=q, size=size, sort=sort)
+        if allversions:
+            params["allversions"] = "1"
+        return self._scan(
+            params, RecordListMetadata, self._make_factory(Record), prefetch=prefetch
+        )
+
 
 class Draft(Resource):
     """Implements a Draft as a Resource.
@@ -123,7 +155,10 @@ class Draft(Resource):
     This is the resource that is used to interact with the /api/records/{id_}/draft endpoint.
     """
 
+    __slots__ = ()
+
     endpoint = "/records/{id_}/draft"
+    cache_type = "draft"
 
     def get(self):
         """Get a draft."""
@@ -147,17 +182,13 @@ class Draft(Resource):
         return DraftFilesList(self._client, **self.endpoint_args)
 
     def import_files(self):
-        """Run import files action."""
-        # TODO
-        self._post(
-            None,
-        )
-        resp = self.session.post(
-            self.url("/actions/files-import"), headers=self.headers({})
+        """Import the files of the previous version of the draft.
+
+        :returns: the files list of the draft.
+        """
+        return self._post(
+            FilesListMetadata, url_suffix="/actions/files-import", resource=self.files
         )
-        self.raise_on_error(resp)
-        self.data = self.item_class(resp)
-        return self
 
     def publish(self):
         """Publish draft."""
@@ -168,14 +199,49 @@ class Draft(Resource):
         )
 
 
+class GetManyResult(dict):
+    """Records fetched by :meth:`RecordList.get_many`.
+
+    A dictionary of the IDs, in order, to their record, or ``None`` if the
+    record does not exist, cannot be accessed or failed to be fetched.
+
+    :attr errors: dictionary of the IDs that failed to be fetched (e.g. on a
+        server or connection error) to their exception.
+    :attr search_errors: exceptions of the failed searches of chunks of IDs,
+        whose records were then fetched one by one instead.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Initialize result."""
+        super().__init__(*args, **kwargs)
+        self.errors = {}
+        self.search_errors = []
+
+    @property
+    def missing(self):
+        """List the IDs of the records not fetched."""
+        return [id_ for id_, record in self.items() if record is None]
+
+
 class RecordList(Resource):
     """Implements a RecordList as a Resource.
 
     This is the resource that is used to interact with the /api/records endpoint.
     """ ""
 
+    __slots__ = ()
+
     endpoint = "/records"
 
+    #: HTTP statuses of the records that cannot be fetched, by `get_many`.
+    missing_statuses = (403, 404, 410)
+
+    # Ascending and descending sort options of the fields used by `deep_scan`.
+    partition_sort_options = {
+        "created": ("oldest", "newest"),
+        "updated": ("updated-asc", "updated-desc"),
+    }
+
     def __call__(self, id_):
         """Instantiate a record item resource."""
         return Record(self._client, id_=id_)
@@ -189,8 +255,45 @@ class RecordList(Resource):
         """Create new draft."""
         return self._post(DraftMetadata, data=data, resource=self.draft)
 
-    def search(self, q="", page=1, size=10, sort="newest", allversions=False):
-        """Search for records."""
+    def bulk_create(self, items, concurrency=4, ordered=True):
+        """Create many drafts concurrently.
+
+        Usage:
+
+        .. code-block:: python
+
+            for res in client.records.bulk_create(items, concurrency=8):
+                if res.ok:
+                    print(res.result.data["id"])
+                else:
+                    print(f"Item {res.index} failed: {res.error}")
+
+        :param items: iterable of draft metadata, as ``DraftMetadata`` objects
+            or dictionaries. It is consumed lazily.
+        :param concurrency: number of drafts created concurrently.
+        :param ordered: yield the results in the order of the items, otherwise
+            in the order of completion.
+        :returns: an iterator of :class:`~inveniordm_py.concurrency.BulkResult`,
+            whose result is the created `Draft`.
+        """
+
+        def create(data):
+            if not isinstance(data, DraftMetadata):
+                data = DraftMetadata(**data)
+            return self.create(data)
+
+        self._client.ensure_pool_size(concurrency)
+        return bulk_map(create, items, max_workers=concurrency, ordered=ordered)
+
+    def search(
+        self, q="", page=1, size=10, sort="newest", allversions=False, stream=False
+    ):
+        """Search for records.
+
+        :param stream: yield the records while the page is downloaded, which
+            lowers the memory used by large pages. See
+            :class:`~inveniordm_py.pagination.StreamingPagination`.
+        """
         params = dict(q=q, page=page, size=size, sort=sort)
         if allversions:
             params["allversions"] = "1"
@@ -198,10 +301,316 @@ class RecordList(Resource):
             params,
             RecordListMetadata,
             self._make_factory(Record),
-            self._partial(self.search, params, page=params["page"] - 1),
-            self._partial(self.search, params, page=params["page"] + 1),
+            self._partial(self.search, params, page=params["page"] - 1, stream=stream),
+            self._partial(self.search, params, page=params["page"] + 1, stream=stream),
+            stream=stream,
+        )
+
+    def scan(self, q="", size=100, sort="newest", allversions=False, prefetch=2):
+        """Iterate over all the records matching a query, across all pages.
+
+        The next page is fetched in the background while the current one is
+        consumed, following the ``links.next`` returned by the server.
+
+        Usage:
+
+        .. code-block:: python
+
+            for record in client.records.scan(q="metadata.title:test"):
+                print(record.data["id"])
+
+        :param prefetch: maximum number of pages fetched ahead (``0`` disables
+            the background fetching).
+        """
+        params = dict(q=q, size=size, sort=sort)
+        if allversions:
+            params["allversions"] = "1"
+        return self._scan(
+            params, RecordListMetadata, self._make_factory(Record), prefetch=prefetch
+        )
+
+    def deep_scan(
+        self,
+        q="",
+        field="created",
+        size=100,
+        partition_size=10000,
+        max_workers=4,
+        allversions=False,
+    ):
+        """Iterate over all the records matching a query, without result limit.
+
+        Unlike :meth:`scan`, which is limited by the result window of the
+        search engine, the search is split into partitions of ``field``
+        ranges, fetched in parallel. Hits are not sorted within a partition
+        beyond the order of ``field``.
+
+        Usage:
+
+        .. code-block:: python
+
+            for record in client.records.deep_scan(max_workers=8):
+                print(record.data["id"])
+
+        :param field: date field to partition on, ``created`` or ``updated``.
+            It must not change during the scan to avoid duplicates or gaps,
+            which makes ``created`` the safe choice.
+        :param size: page size used to fetch each partition.
+        :param partition_size: maximum number of hits of a partition, must not
+            exceed the result window of the search engine.
+        :param max_workers: number of partitions counted and fetched in
+            parallel.
+        """
+        return self._partitioned(
+            q, field, size, partition_size, max_workers, allversions
+        ) or iter(())
+
+    def _partitioned(self, q, field, size, partition_size, max_workers, allversions):
+        """Partitioned pagination of a search, ``None`` if it has no hits."""
+        asc, desc = self.partition_sort_options[field]
+        self._client.ensure_pool_size(max_workers)
+        first = self.search(q=q, size=1, sort=asc, allversions=allversions)
+        if not len(first):
+            return None
+        last = self.search(q=q, size=1, sort=desc, allversions=allversions)
+
+        def count(q_):
+            return self.search(q=q_, size=1, sort=asc, allversions=allversions).total
+
+        def scan(q_):
+            return self.scan(
+                q=q_, size=size, sort=asc, allversions=allversions, prefetch=0
+            )
+
+        return PartitionedPagination(
+            count,
+            scan,
+            q,
+            field,
+            next(iter(first)).data[field],
+            next(iter(last)).data[field],
+            partition_size=partition_size,
+            max_workers=max_workers,
+        )
+
+    def export(
+        self,
+        q,
+        path,
+        format=None,
+        size=100,
+        field="created",
+        partition_size=10000,
+        max_workers=4,
+        allversions=False,
+    ):
+        """Export all the records matching a query to a JSON Lines file.
+
+        The search is split into partitions as in :meth:`deep_scan`, and the
+        pages of each partition are streamed to the file. If the export is
+        interrupted, calling it again with the same arguments resumes it from
+        the last exported page, see :mod:`~inveniordm_py.export`.
+
+        Usage:
+
+        .. code-block:: python
+
+            client.records.export("metadata.title:test", "records.jsonl.gz")
+
+        :param path: path of the output file, overwritten unless the export
+            is resumed.
+        :param format: ``jsonl``, ``jsonl.gz`` or ``jsonl.zst`` (requires
+            ``zstandard``), guessed from the extension of the path by default.
+        :param size: page size.
+        :returns: the number of exported records.
+        """
+        asc, _ = self.partition_sort_options[field]
+        params = dict(q=q, field=field, size=size, allversions=allversions)
+        export = SearchExport(path, format=format, params=params, codec=self.codec)
+
+        def queries():
+            pagination = self._partitioned(
+                q, field, size, partition_size, max_workers, allversions
+            )
+            if pagination is None:
+                return []
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                partitions = pagination.partitions(executor)
+            return [pagination.query(lower, upper) for lower, upper, _ in partitions]
+
+        def fetch_page(q_, page):
+            return self.search(
+                q=q_,
+                page=page,
+                size=size,
+                sort=asc,
+                allversions=allversions,
+                stream=True,
+            )
+
+        return export.run(queries, fetch_page)
+
+    def sync(self, checkpoint, q="", overlap=300, size=100, allversions=False):
+        """Iterate over the records created or updated since the last sync.
+
+        Records are searched by ascending ``updated`` timestamp, from the
+        high-water mark saved in the ``checkpoint`` file minus an ``overlap``
+        window. Records already seen with the same ``revision_id`` are
+        skipped, so that only new and changed records are yielded. The
+        checkpoint is saved after each page, once all its records have been
+        consumed: a record may be yielded again if a sync is interrupted, but
+        none is missed. See :mod:`~inveniordm_py.sync`.
+
+        A record updated during the sync moves to the end of the results,
+        which shifts the next pages. Instead of following the next page, the
+        search is therefore restarted after each page from the last record.
+
+        Usage:
+
+        .. code-block:: python
+
+            for record in client.records.sync("records.checkpoint"):
+                index(record.data)
+
+        :param checkpoint: path of the checkpoint file, created by the first
+            sync, which harvests all the records.
+        :param overlap: overlap window in seconds, larger than the maximum
+            delay before an update is searchable.
+        :param size: page size.
+        """
+        checkpoint = SyncCheckpoint.load(checkpoint)
+        factory = self._make_factory(Record)
+        since = checkpoint.since(overlap)
+        while True:
+            fetched = 0
+            for page in self._sync_scan(q, since, size, allversions).pages():
+                fetched += len(page.hits)
+                for data in page.hits:
+                    if checkpoint.is_new(data):
+                        yield factory(data)
+                done, restart = self._sync_page(
+                    checkpoint, page, overlap, since, fetched
+                )
+                if done:
+                    return
+                if restart:
+                    break
+                # All the records of the page are ties, follow the next page.
+            else:
+                # The result window was exhausted.
+                raise ValueError(
+                    f"Cannot sync more than {fetched} records updated at {since}."
+                )
+            since = page.hits[-1]["updated"]
+
+    def _sync_scan(self, q, since, size, allversions):
+        """Scan of the records of a sync, updated since a lower bound."""
+        if since is not None:
+            range_q = f'updated:["{since}" TO *]'
+            q = f"({q}) AND {range_q}" if q else range_q
+        return self.scan(
+            q=q, size=size, sort="updated-asc", allversions=allversions, prefetch=0
         )
 
+    def _sync_page(self, checkpoint, page, overlap, since, fetched):
+        """Save a consumed page of a sync, and tell how to continue it.
+
+        :returns: ``(done, restart)``, whether all the records were fetched,
+            and whether to restart the search from the last record of the
+            page rather than following the next page.
+        """
+        for data in page.hits:
+            checkpoint.add(data)
+        checkpoint.save(overlap)
+        if fetched >= page.total or not page.hits:
+            return True, False
+        last = page.hits[-1]["updated"]
+        return False, since is None or parse_datetime(last) != parse_datetime(since)
+
+    def _id_chunks(self, ids, chunk_size, max_query_length):
+        """Split IDs into chunks whose search query stays under a length."""
+        chunk, length = [], len(quote_plus("id:()"))
+        for id_ in ids:
+            term = len(quote_plus(self._quote_id(id_))) + len("+OR+")
+            if chunk and (len(chunk) >= chunk_size or length + term > max_query_length):
+                yield chunk
+                chunk, length = [], len(quote_plus("id:()"))
+            chunk.append(id_)
+            length += term
+        if chunk:
+            yield chunk
+
+    def _quote_id(self, id_):
+        """Quote an ID for a search query."""
+        escaped = str(id_).replace("\\", "\\\\").replace('"', '\\"')
+        return f'"{escaped}"'
+
+    def _id_query(self, chunk):
+        """Search query of a chunk of IDs."""
+        return f"id:({' OR '.join(self._quote_id(id_) for id_ in chunk)})"
+
+    def _add_found(self, results, res):
+        """Add the records found by the search of a chunk of IDs."""
+        if not res.ok:
+            # The IDs of a failed search are fetched one by one instead.
+            results.search_errors.append(res.error)
+            return
+        for record in res.result:
+            if record.data["id"] in results:
+                results[record.data["id"]] = record
+
+    def _add_fetched(self, results, res):
+        """Add a record fetched by ID, or the error fetching it."""
+        if res.ok:
+            results[res.item] = res.result
+            return
+        status = getattr(getattr(res.error, "response", None), "status_code", None)
+        if status not in self.missing_statuses:
+            results.errors[res.item] = res.error
+
+    def get_many(self, ids, chunk_size=100, max_query_length=4000, concurrency=4):
+        """Get many records by ID.
+
+        The records are searched by chunks of IDs, with queries such as
+        ``id:("abcd-1234" OR "efgh-5678")``. Records that the search does not
+        return (e.g. restricted ones) are then fetched one by one,
+        concurrently. Errors do not abort the other requests, they are
+        returned with the records.
+
+        Usage:
+
+        .. code-block:: python
+
+            records = client.records.get_many(["abcd-1234", "efgh-5678"])
+            missing = records.missing
+            for id_, error in records.errors.items():
+                ...
+
+        :param ids: iterable of record IDs.
+        :param chunk_size: maximum number of IDs searched at once, i.e. the
+            size of the search page.
+        :param max_query_length: maximum length of the URL-encoded query.
+        :param concurrency: number of requests sent concurrently.
+        :returns: a :class:`GetManyResult`.
+        """
+        results = GetManyResult.fromkeys(str(id_) for id_ in ids)
+        self._client.ensure_pool_size(concurrency)
+
+        def search(chunk):
+            q = self._id_query(chunk)
+            return list(self.search(q=q, size=len(chunk), allversions=True))
+
+        chunks = self._id_chunks(results, chunk_size, max_query_length)
+        for res in bulk_map(search, chunks, max_workers=concurrency):
+            self._add_found(results, res)
+
+        def get(id_):
+            return self(id_).get()
+
+        for res in bulk_map(get, results.missing, max_workers=concurrency):
+            self._add_fetched(results, res)
+        return results
+
 
 class RecordFilesList(Resource):
     """Implements a RecordFilesList as a Resource.
@@ -209,6 +618,8 @@ class RecordFilesList(Resource):
     This is the resource that is used to interact with the /api/records/{id_}/files endpoint.
     """
 
+    __slots__ = ()
+
     endpoint = "/records/{id_}/files"
 
     def get(self):
@@ -220,23 +631,168 @@ class RecordFilesList(Resource):
         return RecordFile(self._client, filename=key, **self._endpoint_args)
 
 
-class RecordFile(Resource):
-    """Implements a RecordFile as a Resource.
+class FileResource(Resource):
+    """Base class of the record and draft file resources."""
 
-    This is the resource that is used to interact with the /api/records/{id_}/files/{filename} endpoint.
-    """
+    __slots__ = ()
 
-    endpoint = "/records/{id_}/files/{filename}"
+    chunk_size = 1024 * 1024
 
     def get(self):
         """Get file metadata."""
         return self._get(FileMetadata)
 
     def download(self):
-        """Download a file."""
+        """Download a file.
+
+        Returns the response, whose body is streamed: it is only read from
+        the network when iterated over (e.g. ``response.iter_content()``) or
+        when accessing ``response.content``.
+        """
+        return self._get_raw(IncomingStream, url_suffix="/content", stream=True)
+
+    def iter_content(self, chunk_size=None):
+        """Iterate over the chunks of the file contents.
+
+        :param chunk_size: maximum size (in bytes) of a chunk.
+        """
+        return IncomingStream.from_response(
+            self.download(), chunk_size=chunk_size or self.chunk_size
+        )
+
+    def _has_file_metadata(self):
+        """Whether the checksum and size of the file are already known."""
+        return isinstance(self.data, FileMetadata) and all(
+            key in self.data._data for key in ("checksum", "size")
+        )
+
+    def _file_metadata(self):
+        """Get the file metadata, fetching it if not already known."""
+        if self._has_file_metadata():
+            return self.data
+        return self.get().data
+
+    def _fetch_range(self, start, end):
+        """Get the (streamed) response of a byte range of the file contents."""
         return self._get_raw(
-            IncomingStream, url_suffix="/content", params={"stream": True}
+            IncomingStream,
+            url_suffix="/content",
+            headers={"range": f"bytes={start}-{end}"},
+            stream=True,
+        )
+
+    def _content_size(self):
+        """Get the size of the file contents, from a one byte range request."""
+        response = self._fetch_range(0, 0)
+        try:
+            return content_size(response)
+        finally:
+            response.close()
+
+    def _verify_segmented(self, download, metadata, verify):
+        """Verify the checksum of a segmented download, then move it in place.
+
+        The download is deleted if its checksum differs.
+        """
+        try:
+            verifier = ChecksumVerifier.from_metadata(metadata) if verify else None
+            if verifier is not None:
+                verifier.update_from_file(download.part_path)
+                verifier.verify()
+        except ChecksumError:
+            remove_file(download.part_path)
+            raise
+        finally:
+            download.finish()
+        download.complete()
+
+    def download_to(self, path, chunk_size=None, verify=True):
+        """Download a file to the given path, with bounded memory usage.
+
+        :param chunk_size: maximum size (in bytes) of the chunks held in memory.
+        :param verify: verify the checksum of the file, computed while
+            downloading, against the one of the file metadata.
+        :raises inveniordm_py.errors.ChecksumError: if the checksums differ.
+
+        The file is downloaded to ``<path>.part``, which is only renamed to
+        ``path`` once verified, and deleted otherwise.
+        """
+        verifier = None
+        if verify:
+            verifier = ChecksumVerifier.from_metadata(self._file_metadata())
+        tmp_path = f"{os.fspath(path)}.part"
+        try:
+            with open(tmp_path, "wb") as fp:
+                for chunk in self.iter_content(chunk_size=chunk_size):
+                    fp.write(chunk)
+                    if verifier is not None:
+                        verifier.update(chunk)
+            if verifier is not None:
+                verifier.verify()
+        except BaseException:
+            remove_file(tmp_path)
+            raise
+        os.replace(tmp_path, path)
+        return path
+
+    def download_segmented(
+        self,
+        path,
+        segment_size=64 * 1024 * 1024,
+        max_workers=4,
+        chunk_size=None,
+        verify=True,
+    ):
+        """Download a file to the given path, fetching byte ranges in parallel.
+
+        The file is split in segments of ``segment_size`` bytes, based on the
+        size of the file metadata, which are fetched with HTTP range requests
+        by ``max_workers`` threads into ``<path>.part``, which is renamed to
+        ``path`` once complete and verified. Calling it again after an
+        interruption only fetches the missing segments. If the server does not
+        honour range requests, the file is downloaded in a single stream.
+
+        If the metadata has no size, it is taken from the ``Content-Range`` of
+        a one byte range request.
+
+        :param verify: verify the checksum of the downloaded file against the
+            one of the file metadata.
+        :raises inveniordm_py.errors.ChecksumError: if the checksums differ.
+        """
+        metadata = self._file_metadata()
+        size = metadata._data.get("size")
+        if size is None:
+            size = self._content_size()
+        if size is None:
+            return self.download_to(path, chunk_size=chunk_size, verify=verify)
+        self._client.ensure_pool_size(max_workers)
+
+        download = SegmentedDownload(
+            self._fetch_range,
+            path,
+            int(size),
+            segment_size=segment_size,
+            max_workers=max_workers,
+            chunk_size=chunk_size or self.chunk_size,
+            checksum=metadata._data.get("checksum"),
         )
+        if not download.run():
+            # Forget the segments of a previous download, if any.
+            download.finish()
+            return self.download_to(path, chunk_size=chunk_size, verify=verify)
+        self._verify_segmented(download, metadata, verify)
+        return path
+
+
+class RecordFile(FileResource):
+    """Implements a RecordFile as a Resource.
+
+    This is the resource that is used to interact with the /api/records/{id_}/files/{filename} endpoint.
+    """
+
+    __slots__ = ()
+
+    endpoint = "/records/{id_}/files/{filename}"
 
 
 class DraftFilesList(Resource):
@@ -245,6 +801,8 @@ class DraftFilesList(Resource):
     This is the resource that is used to interact with the /api/records/{id_}/draft/files endpoint.
     """
 
+    __slots__ = ("_it",)
+
     endpoint = "/records/{id_}/draft/files"
 
     def get(self):
@@ -275,36 +833,117 @@ class DraftFilesList(Resource):
         return file
 
 
-class DraftFile(Resource):
+class DraftFile(FileResource):
     """Implements a DraftFile as a Resource.
 
     This is the resource that is used to interact with the /api/records/{id_}/draft/files/{filename} endpoint.
     """
 
+    __slots__ = ()
+
     endpoint = "/records/{id_}/draft/files/{filename}"
 
     def set_contents(self, stream):
-        """Set file contents."""
-        return self._put(OutgoingStream, data=stream, url_suffix="/content")
+        """Set file contents.
+
+        The contents are streamed with bounded memory usage, see
+        :class:`~inveniordm_py.files.metadata.OutgoingStream` for the
+        supported data.
+
+        Usage:
+
+        .. code-block:: python
+
+            draft.files("data.bin").set_contents("/path/to/data.bin")
+            draft.files("data.bin").set_contents(OutgoingStream(data=fp))
+
+        :param stream: an ``OutgoingStream``, or the data to upload.
+        """
+        if not isinstance(stream, OutgoingStream):
+            stream = OutgoingStream(data=stream)
+        with stream.open() as data:
+            return self._put(OutgoingStream, data=data, url_suffix="/content")
 
     def commit(self):
         """Commit one file."""
         return self._post(FileMetadata, url_suffix="/commit")
 
-    def download(self):
-        """Download a file."""
-        return self._get_raw(
-            IncomingStream, url_suffix="/content", params={"stream": True}
+    def _multipart_entry(self, upload):
+        """Files metadata initializing a multipart transfer."""
+        transfer = {"type": "M", "parts": upload.parts, "part_size": upload.part_size}
+        return FilesListMetadata(
+            [
+                {
+                    "key": self.endpoint_args["filename"],
+                    "size": upload.size,
+                    "transfer": transfer,
+                }
+            ]
+        )
+
+    def _part_urls(self, files):
+        """Get the upload URL of a part, given the initialized files."""
+        key = self.endpoint_args["filename"]
+        entry = next(e for e in files.data["entries"] if e["key"] == key)
+        urls = {p["part"]: p["url"] for p in entry.get("links", {}).get("parts", [])}
+        return lambda part: urls.get(part) or self.url(f"/content/{part}")
+
+    def _upload_part(self, url, body):
+        """Upload a part of a multipart file transfer."""
+        headers = self.headers(data=OutgoingStream)
+        if not url.startswith(self._client._base_url):
+            # Pre-signed URLs of the storage, which reject other credentials.
+            headers["Authorization"] = None
+        resp = self._request("PUT", url, data=body, headers=headers)
+        self.raise_on_error(resp)
+        return resp
+
+    def upload_multipart(
+        self,
+        data,
+        part_size=64 * 1024 * 1024,
+        max_workers=4,
+        max_retries=3,
+    ):
+        """Upload a file with a multipart transfer, then commit it.
+
+        The file is initialized in the draft with its number of parts, which
+        are then uploaded concurrently. A failed part is retried on its own,
+        with an exponential backoff.
+
+        Usage:
+
+        .. code-block:: python
+
+            draft.files("data.bin").upload_multipart("/path/to/data.bin")
+
+        :param data: path to the file, or a bytes-like object (e.g. ``mmap``).
+        :param part_size: size of the parts in bytes.
+        :param max_workers: number of parts uploaded concurrently.
+        :param max_retries: maximum number of retries of a failed part.
+        """
+        upload = MultipartUpload(
+            data,
+            part_size=part_size,
+            max_workers=max_workers,
+            max_retries=max_retries,
         )
+        self._client.ensure_pool_size(max_workers)
+        files = DraftFilesList(self._client, **self._endpoint_args).create(
+            self._multipart_entry(upload)
+        )
+        urls = self._part_urls(files)
+
+        def upload_part(part, body):
+            return self._upload_part(urls(part), body)
+
+        upload.run(upload_part)
+        return self.commit()
 
     def delete(self):
         """Delete a file."""
         return self._delete()
 
-    def get(self):
-        """Get file information."""
-        return self._get(FileMetadata)
-
 
 class RecordCommunitiesList(Resource):
     """Implements a RecordCommunitiesList as a Resource.
@@ -312,6 +951,8 @@ class RecordCommunitiesList(Resource):
     This is the resource that is used to interact with the /api/records/{id_}/communities endpoint.s
     """
 
+    __slots__ = ()
+
     endpoint = "/records/{id_}/communities"
 
     def _normalize_data(self, data):
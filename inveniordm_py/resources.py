@@ -7,17 +7,27 @@
 
 """Resource base class."""
 
+import time
 from copy import copy
 from functools import partial
+from types import MappingProxyType
 
+from .cache import CachedResponse
+from .codec import default_codec
 from .metadata import *
-from .pagination import SimplePagination
+from .pagination import PrefetchPagination, SimplePagination, StreamingPagination
+
+_no_endpoint_args = MappingProxyType({})
 
 
 class Resource:
     """Resource base class."""
 
+    __slots__ = ("_client", "_endpoint_args", "_data")
+
     endpoint = ""
+    #: Type of the resource, setting the time to live of its cached responses.
+    cache_type = None
 
     def __init__(self, client, **kwargs):
         """Initialize a resource.
@@ -28,6 +38,19 @@ class Resource:
         self._endpoint_args = kwargs
         self._data = None
 
+    @classmethod
+    def from_data(cls, client, data):
+        """Create a resource from a metadata object.
+
+        The endpoint arguments are taken from the metadata, see
+        :attr:`endpoint_args`.
+        """
+        resource = cls.__new__(cls)
+        resource._client = client
+        resource._endpoint_args = _no_endpoint_args
+        resource._data = data
+        return resource
+
     @property
     def session(self):
         """Get the client bound session."""
@@ -43,7 +66,7 @@ class Resource:
         """Get endpoint arguments.
 
         Arguments are computed from the data and the resource.
-        Precedence is given to the data returned from the API call, as 
+        Precedence is given to the data returned from the API call, as
         the resource endpoint kwargs are in some cases already set before the API call
         """
         if isinstance(self.data, Metadata):
@@ -67,13 +90,7 @@ class Resource:
 
     def _make_factory(self, resource_cls):
         """Factory for creating a resource from a metadata object."""
-
-        def inner(data):
-            r = resource_cls(self._client, **data.endpoint_kwargs)
-            r.data = data
-            return r
-
-        return inner
+        return partial(resource_cls.from_data, self._client)
 
     #
     # Request helper methods
@@ -98,38 +115,166 @@ class Resource:
         """Check response for errors."""
         response.raise_for_status()
 
+    @property
+    def codec(self):
+        """Get the JSON codec of the client."""
+        return getattr(self._client, "codec", None) or default_codec
+
+    def _load(self, metadata_class, response):
+        """Create a metadata object from a response.
+
+        The metadata of a cached response are decoded once, and kept with its
+        cache entry.
+        """
+        entry = response.entry if isinstance(response, CachedResponse) else None
+        if entry is not None and type(entry.metadata) is metadata_class:
+            return entry.metadata
+        lazy = getattr(self._client, "lazy_metadata", False)
+        metadata = metadata_class.from_response(response, lazy=lazy, codec=self.codec)
+        if entry is not None:
+            entry.metadata = metadata
+        return metadata
+
+    def _dump(self, data):
+        """Convert a metadata object to a request body."""
+        return data.to_request(codec=self.codec) if data is not None else None
+
     #
     # HTTP request methods
     #
+    def _rate_limit_category(self, method, url):
+        """Get the rate limiting category of a request."""
+        if url.split("?", 1)[0].endswith("/content") or "/content/" in url:
+            return "files"
+        if method in ("GET", "HEAD"):
+            return "read"
+        return "write"
+
+    def _endpoint_template(self, url):
+        """Get the endpoint template of a URL, e.g. ``/records/{id_}/draft``."""
+        url = url.split("?", 1)[0]
+        try:
+            prefix = self.url()
+        except KeyError:
+            prefix = None
+        if prefix is not None and url.startswith(prefix):
+            return self.endpoint + url[len(prefix) :]
+        base_url = self._client._base_url
+        return url[len(base_url) :] if url.startswith(base_url) else url
+
+    def _request(self, method, url, **kwargs):
+        """Send a request through the transport of the client.
+
+        Writes invalidate the responses cached by the client for the resource.
+        Requests are measured by the instrumentation of the client, if any.
+        """
+        instrumentation = getattr(self._client, "instrumentation", None)
+        if instrumentation is None:
+            response, _ = self._send(method, url, **kwargs)
+        else:
+            response = self._instrumented_send(instrumentation, method, url, kwargs)
+        cache = getattr(self._client, "cache", None)
+        if cache is not None and method not in ("GET", "HEAD"):
+            cache.invalidate(url)
+        return response
+
+    def _instrumented_send(self, instrumentation, method, url, kwargs):
+        """Send a request, recording it in the instrumentation."""
+        endpoint = self._endpoint_template(url)
+        body = kwargs.get("data")
+        stream = kwargs.get("stream", False)
+        start = time.perf_counter()
+        try:
+            response, retries = self._send(method, url, **kwargs)
+        except Exception as e:
+            instrumentation.observe(method, endpoint, url, start, body=body, error=e)
+            raise
+        instrumentation.observe(
+            method,
+            endpoint,
+            url,
+            start,
+            body=body,
+            response=response,
+            stream=stream,
+            retries=retries,
+        )
+        return response
+
+    def _send(self, method, url, category=None, **kwargs):
+        """Send a request, waiting for the rate limiter of the client.
+
+        Throttled responses are retried, unless the request body is a stream
+        that cannot be sent again.
+
+        :returns: the response and the number of retries.
+        """
+        if self._client.timeout is not None:
+            kwargs.setdefault("timeout", self._client.timeout)
+        send = partial(self._client.transport.request, method)
+        limiter = getattr(self._client, "rate_limiter", None)
+        if limiter is None:
+            return send(url, **kwargs), 0
+
+        category = category or self._rate_limit_category(method, url)
+        data = kwargs.get("data")
+        retryable = data is None or isinstance(data, (bytes, str, memoryview))
+        attempt = 0
+        while True:
+            limiter.acquire(category)
+            response = send(url, **kwargs)
+            delay = limiter.feedback(category, response, attempt)
+            if delay is None or not retryable:
+                return response, attempt
+            response.close()
+            attempt += 1
+
     def _get(
         self, metadata_class, url_suffix="", params=None, headers=None, resource=None
     ):
         """Make a GET request."""
         resource = self._resource_or_self(resource)
         headers = self.headers(accept=metadata_class, extra=headers)
-        resp = self.session.get(
-            self.url(suffix=url_suffix),
-            headers=headers,
-            params=params,
+        resp = self._cached_get(
+            self.url(suffix=url_suffix), headers, params, cache_type=self.cache_type
         )
         self.raise_on_error(resp)
-        resource.data = metadata_class.from_response(resp)
+        resource.data = self._load(metadata_class, resp)
         return resource
 
+    def _cached_get(self, url, headers, params=None, cache_type=None, **kwargs):
+        """Make a GET request, using the response cache of the client.
+
+        :param cache_type: type of the resource, setting the time to live of
+            the cached response.
+        """
+        cache = getattr(self._client, "cache", None)
+        if cache is None:
+            return self._request("GET", url, headers=headers, params=params, **kwargs)
+
+        key = cache.key(url, headers, params)
+        entry = cache.lookup(key)
+        if entry is not None and entry.fresh:
+            return entry.response()
+        conditional = {**headers, **cache.conditional_headers(entry)}
+        resp = self._request("GET", url, headers=conditional, params=params, **kwargs)
+        return cache.update(key, resp, entry=entry, cache_type=cache_type)
+
     def _post(
         self, metadata_class, data=None, url_suffix="", headers=None, resource=None
     ):
         """Make a POST request."""
         resource = self._resource_or_self(resource)
         headers = self.headers(accept=metadata_class, data=data, extra=headers)
-        request_data = data.to_request() if data is not None else None
-        resp = self.session.post(
+        request_data = self._dump(data)
+        resp = self._request(
+            "POST",
             self.url(suffix=url_suffix),
             data=request_data,
             headers=headers,
         )
         self.raise_on_error(resp)
-        resource.data = metadata_class.from_response(resp)
+        resource.data = self._load(metadata_class, resp)
         return resource
 
     def _put(
@@ -138,20 +283,31 @@ class Resource:
         """Make a PUT request."""
         resource = self._resource_or_self(resource)
         headers = self.headers(accept=metadata_class, data=data, extra=headers)
-        request_data = data.to_request() if data is not None else None
-        resp = self.session.put(
+        request_data = self._dump(data)
+        resp = self._request(
+            "PUT",
             self.url(suffix=url_suffix),
             data=request_data,
             headers=headers,
         )
         self.raise_on_error(resp)
-        resource.data = metadata_class.from_response(resp)
+        resource.data = self._load(metadata_class, resp)
         return resource
 
-    def _get_raw(self, metadata_class, url_suffix="", params=None, headers=None):
+    def _get_raw(
+        self, metadata_class, url_suffix="", params=None, headers=None, stream=False
+    ):
+        """Make a GET request and return the raw response.
+
+        If ``stream`` is true, the response body is not read upfront.
+        """
         headers = self.headers(accept=metadata_class, extra=headers)
-        resp = self.session.get(
-            self.url(suffix=url_suffix), headers=headers, params=params
+        resp = self._request(
+            "GET",
+            self.url(suffix=url_suffix),
+            headers=headers,
+            params=params,
+            stream=stream,
         )
         self.raise_on_error(resp)
         return resp
@@ -159,7 +315,7 @@ class Resource:
     def _delete(self, url_suffix="", headers=None):
         """Make a DELETE request."""
         headers = self.headers(extra=headers)
-        resp = self.session.delete(self.url(suffix=url_suffix), headers=headers)
+        resp = self._request("DELETE", self.url(suffix=url_suffix), headers=headers)
         self.raise_on_error(resp)
         return True
 
@@ -172,17 +328,71 @@ class Resource:
         next_page,
         url_suffix="",
         headers=None,
+        stream=False,
     ):
-        """Make a GET request with pagination."""
+        """Make a GET request with pagination.
+
+        :param stream: parse the hits while the response is downloaded, see
+            :class:`~inveniordm_py.pagination.StreamingPagination`. Streamed
+            responses are not cached.
+        """
         headers = self.headers(accept=metadata_class, extra=headers)
-        response = self.session.get(
-            self.url(suffix=url_suffix), params=params, headers=headers
+        if stream:
+            response = self._request(
+                "GET",
+                self.url(suffix=url_suffix),
+                category="search",
+                params=params,
+                headers=headers,
+                stream=True,
+            )
+            self.raise_on_error(response)
+            item_class = metadata_class.item_class
+            return StreamingPagination(
+                response,
+                lambda hit: hit_factory(item_class.from_dict(hit)),
+                prev_page=prev_page,
+                next_page=next_page,
+                codec=self.codec,
+            )
+        response = self._cached_get(
+            self.url(suffix=url_suffix),
+            headers,
+            params,
+            cache_type="search",
+            category="search",
         )
         self.raise_on_error(response)
-        data_list = metadata_class.from_response(response)
+        data_list = self._load(metadata_class, response)
         return SimplePagination(
             data_list,
             hit_factory,
             prev_page=prev_page,
             next_page=next_page,
         )
+
+    def _scan(
+        self,
+        params,
+        metadata_class,
+        hit_factory,
+        prefetch=2,
+        url_suffix="",
+        headers=None,
+    ):
+        """Iterate over all the pages of a search, prefetching the next ones."""
+        headers = self.headers(accept=metadata_class, extra=headers)
+
+        def fetch_page(url):
+            if url is None:
+                url, url_params = self.url(suffix=url_suffix), params
+            else:
+                # The next links already contain the query parameters.
+                url_params = None
+            response = self._request(
+                "GET", url, category="search", params=url_params, headers=headers
+            )
+            self.raise_on_error(response)
+            return self._load(metadata_class, response)
+
+        return PrefetchPagination(fetch_page, hit_factory, prefetch=prefetch)
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# inveniordm-py is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""State files of resumable operations.
+
+Exports, harvests and downloads save their progress in small JSON files, so
+that they can continue where they stopped. A state file is replaced
+atomically and flushed to the disk, so that a crash leaves either the
+previous or the new state. An unreadable state (e.g. truncated by a full
+disk) is treated as missing, i.e. the operation starts over.
+"""
+
+import json
+import os
+
+
+def load_state(path):
+    """Load a state file, or return ``None`` if it is missing or unreadable."""
+    try:
+        with open(path, "r", encoding="utf-8") as fp:
+            return json.load(fp)
+    except (OSError, ValueError):
+        return None
+
+
+def _fsync_directory(path):
+    """Flush the entries of a directory, e.g. a renamed file, to the disk."""
+    if not hasattr(os, "O_DIRECTORY"):
+        # Directories cannot be opened on Windows.
+        return
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def save_state(path, state):
+    """Save a state file, atomically replacing the previous one.
+
+    The state is written to a temporary file, flushed to the disk, then
+    renamed over the previous one, whose directory is flushed as well.
+    """
+    path = os.fspath(path)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fp:
+        json.dump(state, fp)
+        fp.flush()
+        os.fsync(fp.fileno())
+    os.replace(tmp, path)
+    _fsync_directory(os.path.dirname(os.path.abspath(path)))
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# inveniordm-py is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Incremental parsing of search responses."""
+
+import codecs
+import json
+import re
+
+from .codec import default_codec
+
+
+class HitsParser:
+    """Incremental parser of the JSON body of a search response.
+
+    The body is fed chunk by chunk, and each element of ``hits.hits`` is
+    decoded as soon as it is complete. The rest of the document (e.g. the
+    total and the aggregations) is kept aside, with an empty list of hits,
+    and decoded once the whole body has been fed.
+
+    Outside of the hits, only strings and brackets are scanned to follow the
+    structure of the document. The hits are decoded by the ``json`` decoder
+    as soon as they are complete, an incomplete hit being retried once the
+    buffer has doubled, so that large hits are not decoded over and over.
+    """
+
+    _tokens = re.compile(r'"(?:[^"\\]|\\.)*"|"|[{}\[\]]')
+    _separators = re.compile(r"[\s,]*")
+    _key = '"hits"'
+    _decoder = json.JSONDecoder()
+
+    def __init__(self, codec=None):
+        """Initialize parser.
+
+        :param codec: the :mod:`~inveniordm_py.codec` decoding the rest of
+            the document.
+        """
+        self._codec = codec or default_codec
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._skeleton = []
+        # Position of the next token to scan.
+        self._pos = 0
+        # Open containers, with the last string seen in each of them.
+        self._stack = []
+        # Whether the parser is before, in (``True``) or after the hits.
+        self._in_hits = None
+        # Size of the buffer needed to retry decoding an incomplete hit.
+        self._retry_size = 0
+
+    def feed(self, chunk, final=False):
+        """Parse a chunk of the body.
+
+        :param final: whether this is the last chunk of the body.
+        :returns: the list of the hits completed by the chunk.
+        """
+        self._buffer += self._text.decode(chunk, final=final)
+        if final:
+            self._retry_size = 0
+        hits = []
+        while True:
+            if self._in_hits:
+                if not self._parse_hits(hits):
+                    break
+            elif not self._parse_structure():
+                break
+        self._trim()
+        return hits
+
+    def _parse_structure(self):
+        """Follow the structure of the document, until the hits.
+
+        :returns: whether the hits were reached.
+        """
+        buf, stack = self._buffer, self._stack
+        for match in self._tokens.finditer(buf, self._pos):
+            token = match.group()
+            if token == '"':
+                # The string is not complete yet.
+                return False
+            self._pos = match.end()
+            char = token[0]
+            depth = len(stack)
+            if char == '"':
+                if 0 < depth <= 2:
+                    stack[-1][1] = token
+            elif char in "{[":
+                stack.append([char, None])
+                if (
+                    self._in_hits is None
+                    and char == "["
+                    and depth == 2
+                    and stack[0][1] == stack[1][1] == self._key
+                ):
+                    self._in_hits = True
+                    self._skeleton.append(buf[: self._pos])
+                    self._buffer = buf[self._pos :]
+                    self._pos = 0
+                    return True
+            else:
+                stack.pop()
+        return False
+
+    def _parse_hits(self, hits):
+        """Decode the complete hits of the buffer.
+
+        :returns: whether the end of the hits was reached.
+        """
+        buf = self._buffer
+        while True:
+            pos = self._separators.match(buf, self._pos).end()
+            if pos == len(buf):
+                self._pos = pos
+                return False
+            if buf[pos] == "]":
+                # The closing bracket is scanned as part of the skeleton.
+                self._in_hits = False
+                self._buffer = buf[pos:]
+                self._pos = 0
+                return True
+            if len(buf) - pos < self._retry_size:
+                self._pos = pos
+                return False
+            try:
+                hit, end = self._decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                self._pos = pos
+                self._retry_size = 2 * (len(buf) - pos)
+                return False
+            hits.append(hit)
+            self._retry_size = 0
+            self._pos = end
+
+    def _trim(self):
+        """Drop the parsed part of the buffer."""
+        if not self._in_hits:
+            self._skeleton.append(self._buffer[: self._pos])
+        self._buffer = self._buffer[self._pos :]
+        self._pos = 0
+
+    def close(self):
+        """Finish parsing.
+
+        :returns: the decoded document, with an empty list of hits.
+        """
+        if self._stack or self._in_hits:
+            raise ValueError("Incomplete JSON document.")
+        return self._codec.loads("".join(self._skeleton) + self._buffer)
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# inveniordm-py is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Checkpoints of incremental harvests.
+
+A checkpoint is a small JSON file holding the high-water mark of a harvest,
+i.e. the highest ``updated`` timestamp of the records seen so far, and the
+revisions of the records seen within the overlap window below it.
+
+The next harvest searches the records updated since the mark minus the
+overlap, which catches the records whose timestamps were assigned out of
+order (e.g. clock skew between servers, or a late indexing), and skips those
+whose revision was already seen.
+"""
+
+from datetime import timedelta
+
+from .pagination import parse_datetime
+from .state import load_state, save_state
+
+
+class SyncCheckpoint:
+    """High-water mark of an incremental harvest, persisted in a JSON file.
+
+    :attr updated: highest ``updated`` timestamp seen, ``None`` before the
+        first harvest.
+    :attr seen: ``{id: [revision_id, updated]}`` of the records seen within
+        the overlap window.
+    """
+
+    __slots__ = ("path", "updated", "seen")
+
+    def __init__(self, path, updated=None, seen=None):
+        """Initialize checkpoint."""
+        self.path = path
+        self.updated = updated
+        self.seen = seen or {}
+
+    @classmethod
+    def load(cls, path):
+        """Load a checkpoint, or create an empty one if there is none.
+
+        An unreadable checkpoint is ignored, i.e. everything is harvested
+        again.
+        """
+        state = load_state(path)
+        if isinstance(state, dict):
+            try:
+                return cls(path, **state)
+            except TypeError:
+                pass
+        return cls(path)
+
+    def since(self, overlap):
+        """Lower bound of the next harvest, ``None`` to harvest everything.
+
+        :param overlap: overlap window, in seconds.
+        """
+        if self.updated is None:
+            return None
+        since = parse_datetime(self.updated) - timedelta(seconds=overlap)
+        return since.isoformat(timespec="milliseconds")
+
+    def is_new(self, record):
+        """Whether a record (its metadata) was not seen with its revision."""
+        seen = self.seen.get(record["id"])
+        return seen is None or seen[0] != record["revision_id"]
+
+    def add(self, record):
+        """Mark a record (its metadata) as seen, moving the mark forward."""
+        updated = record["updated"]
+        self.seen[record["id"]] = [record["revision_id"], updated]
+        if self.updated is None or parse_datetime(updated) > parse_datetime(
+            self.updated
+        ):
+            self.updated = updated
+
+    def save(self, overlap):
+        """Save the checkpoint, forgetting the records below the overlap."""
+        since = self.since(overlap)
+        if since is not None:
+            since = parse_datetime(since)
+            self.seen = {
+                id_: seen
+                for id_, seen in self.seen.items()
+                if parse_datetime(seen[1]) >= since
+            }
+        save_state(self.path, {"updated": self.updated, "seen": self.seen})
@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# inveniordm-py is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""In-process fake InvenioRDM, for tests and load tests."""
+
+from .adapter import AsyncWSGITransport, WSGIAdapter
+from .app import Conditions, FakeInvenioRDM
+from .server import LocalServer
+
+__all__ = (
+    "AsyncWSGITransport",
+    "Conditions",
+    "FakeInvenioRDM",
+    "LocalServer",
+    "WSGIAdapter",
+)
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# inveniordm-py is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Transport adapters of ``requests`` and ``httpx`` calling a WSGI application."""
+
+import asyncio
+import io
+import sys
+import time
+from urllib.parse import urlsplit
+
+from requests.adapters import BaseAdapter
+
+from ..transports import ChunksReader, build_response
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+
+def _body_stream(body):
+    """Get a request body as a readable stream and its length, if known."""
+    if body is None:
+        return io.BytesIO(), 0
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    if isinstance(body, (bytes, bytearray, memoryview)):
+        view = memoryview(body).cast("B")
+        return io.BytesIO(view), view.nbytes
+    if hasattr(body, "read"):
+        length = len(body) if hasattr(body, "__len__") else None
+        return body, length
+    chunks = [c.encode("utf-8") if isinstance(c, str) else bytes(c) for c in body]
+    data = b"".join(chunks)
+    return io.BytesIO(data), len(data)
+
+
+def build_environ(method, url, headers, body):
+    """Build the WSGI environment of a request.
+
+    :param url: URL of the request.
+    :param headers: headers of the request.
+    :param body: body of the request, e.g. ``bytes``, a file object or an
+        iterable of chunks.
+    """
+    url = urlsplit(url)
+    body, length = _body_stream(body)
+    environ = {
+        "REQUEST_METHOD": method,
+        "SCRIPT_NAME": "",
+        "PATH_INFO": url.path,
+        "QUERY_STRING": url.query,
+        "SERVER_NAME": url.hostname,
+        "SERVER_PORT": str(url.port or (443 if url.scheme == "https" else 80)),
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": url.scheme,
+        "wsgi.input": body,
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+        "HTTP_HOST": url.netloc,
+    }
+    if length is not None:
+        environ["CONTENT_LENGTH"] = str(length)
+    for name, value in headers.items():
+        key = name.upper().replace("-", "_")
+        if key == "TRANSFER_ENCODING" and length is not None:
+            # The chunks of the body were already joined.
+            continue
+        if key in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+            environ[key] = value
+        else:
+            environ[f"HTTP_{key}"] = value
+    return environ
+
+
+def call_app(app, environ):
+    """Call a WSGI application.
+
+    :returns: the status line, the headers and the iterable of the body.
+    """
+    status_headers = []
+
+    def start_response(status, headers, exc_info=None):
+        status_headers[:] = [status, headers]
+
+    chunks = app(environ, start_response)
+    if not status_headers:
+        # The status is only known once the first chunk is produced.
+        chunks = iter(chunks)
+        first = next(chunks, b"")
+        chunks = [first, *chunks]
+    status, headers = status_headers
+    return status, headers, chunks
+
+
+class WSGIAdapter(BaseAdapter):
+    """Transport adapter sending the requests of a session to a WSGI app.
+
+    Requests do not go through sockets, but through the same code paths of
+    ``requests`` as over the network (e.g. streamed bodies, ``raise_for_status``
+    and ``iter_content``).
+
+    Usage:
+
+    .. code-block:: python
+
+        session = requests.Session()
+        session.mount("https://inveniordm.test/", WSGIAdapter(app))
+    """
+
+    def __init__(self, app):
+        """Initialize adapter.
+
+        :param app: the WSGI application.
+        """
+        super().__init__()
+        self.app = app
+
+    def send(
+        self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None
+    ):
+        """Send a request to the app."""
+        start = time.perf_counter()
+        environ = build_environ(
+            request.method, request.url, request.headers, request.body
+        )
+        status, headers, chunks = call_app(self.app, environ)
+        code, _, reason = status.partition(" ")
+        response = build_response(
+            request.url,
+            int(code),
+            reason,
+            headers,
+            ChunksReader(chunks, close=getattr(chunks, "close", None)),
+            time.perf_counter() - start,
+        )
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self):
+        """Close the adapter."""
+
+
+class AsyncWSGITransport:
+    """Transport of an ``httpx.AsyncClient`` sending the requests to a WSGI app.
+
+    The app is called in a worker thread, so that e.g. the latency simulated
+    by the :class:`~inveniordm_py.testing.app.FakeInvenioRDM` does not block
+    the event loop, and concurrent requests are handled concurrently.
+
+    Usage:
+
+    .. code-block:: python
+
+        client = httpx.AsyncClient(transport=AsyncWSGITransport(app))
+    """
+
+    def __init__(self, app):
+        """Initialize transport.
+
+        :param app: the WSGI application.
+        """
+        self.app = app
+
+    def _call(self, request, body):
+        """Call the app, returning the status, headers and body."""
+        environ = build_environ(request.method, str(request.url), request.headers, body)
+        status, headers, chunks = call_app(self.app, environ)
+        try:
+            content = b"".join(chunks)
+        finally:
+            if hasattr(chunks, "close"):
+                chunks.close()
+        return int(status.partition(" ")[0]), headers, content
+
+    async def handle_async_request(self, request):
+        """Send a request to the app."""
+        body = await request.aread()
+        loop = asyncio.get_running_loop()
+        status, headers, content = await loop.run_in_executor(
+            None, self._call, request, body
+        )
+        return httpx.Response(status, headers=headers, content=content)
+
+    async def __aenter__(self):
+        """Enter the transport context."""
+        return self
+
+    async def __aexit__(self, *exc_info):
+        """Close the transport."""
+        await self.aclose()
+
+    async def aclose(self):
+        """There are no connections to close."""
@@ -0,0 +1,834 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# inveniordm-py is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Fake InvenioRDM, as a WSGI application."""
+
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from copy import deepcopy
+from datetime import datetime, timezone
+from urllib.parse import parse_qsl, urlencode
+
+from requests import Session
+
+from ..client import InvenioAPI
+from ..transports import WSGITransport
+from .adapter import AsyncWSGITransport, WSGIAdapter
+from .search import Query
+
+
+class Conditions:
+    """Network and server conditions simulated by the fake InvenioRDM.
+
+    Usage:
+
+    .. code-block:: python
+
+        conditions = Conditions(
+            latency=lambda: random.lognormvariate(-4, 0.5),
+            bandwidth=10 * 1024**2,
+            error_rate=0.01,
+            rate_limit=100,
+        )
+
+    :param latency: time (in seconds) waited before answering a request,
+        either a number or a callable drawing it from a distribution.
+    :param bandwidth: maximum transfer rate (in bytes per second) of the
+        request and response bodies, ``None`` for no limit.
+    :param error_rate: probability of answering a request with an error.
+    :param error_statuses: statuses of the injected errors.
+    :param rate_limit: maximum rate (in requests per second) of the
+        requests, exceeding requests are answered with ``429``.
+    :param burst: number of requests allowed at once by the rate limit.
+    :param seed: seed of the random draws, for reproducible runs.
+    """
+
+    def __init__(
+        self,
+        latency=0,
+        bandwidth=None,
+        error_rate=0.0,
+        error_statuses=(500, 502, 503),
+        rate_limit=None,
+        burst=None,
+        seed=None,
+    ):
+        """Initialize conditions."""
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.error_rate = error_rate
+        self.error_statuses = tuple(error_statuses)
+        self.rate_limit = rate_limit
+        self.burst = burst or rate_limit
+        self.random = random.Random(seed)
+        self._tokens = self.burst
+        self._refilled = time.monotonic()
+        self._lock = threading.Lock()
+
+    def delay(self):
+        """Draw the latency of a request."""
+        latency = self.latency() if callable(self.latency) else self.latency
+        return max(0.0, latency or 0.0)
+
+    def error(self):
+        """Draw whether a request fails, returning the status of the error."""
+        if self.error_rate and self.random.random() < self.error_rate:
+            return self.random.choice(self.error_statuses)
+        return None
+
+    def throttle(self):
+        """Take a token of the rate limit.
+
+        :returns: ``None`` if the request is allowed, otherwise the time (in
+            seconds) until a token is available.
+        """
+        if not self.rate_limit:
+            return None
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._refilled
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate_limit)
+            self._refilled = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return None
+            return (1 - self._tokens) / self.rate_limit
+
+    def transfer(self, size):
+        """Wait for the transfer of ``size`` bytes at the bandwidth."""
+        if self.bandwidth and size:
+            time.sleep(size / self.bandwidth)
+
+
+class HTTPError(Exception):
+    """Error answered by the fake InvenioRDM."""
+
+    def __init__(self, status, message=None, headers=None):
+        """Initialize error."""
+        super().__init__(message)
+        self.status = status
+        self.message = message or _reasons.get(status, "Error")
+        self.headers = headers or {}
+
+
+_reasons = {
+    200: "OK",
+    201: "Created",
+    202: "Accepted",
+    204: "No Content",
+    206: "Partial Content",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    410: "Gone",
+    416: "Range Not Satisfiable",
+    429: "Too Many Requests",
+    500: "Internal Server Error",
+    502: "Bad Gateway",
+    503: "Service Unavailable",
+}
+
+
+def now():
+    """Current time, as formatted by the REST API."""
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+
+
+def route(method, pattern):
+    """Register a method of the application as the handler of a route."""
+
+    def register(func):
+        func.route = (method, re.compile(f"^{pattern}$"))
+        return func
+
+    return register
+
+
+class FakeInvenioRDM:
+    """In-process fake InvenioRDM, as a WSGI application.
+
+    Records, drafts, files, versions and communities are kept in memory, and
+    the REST API endpoints used by the client are served under ``/api``, as
+    well as the network and server ``conditions`` (latency, bandwidth, errors
+    and rate limits). Restricted records are not returned by searches, but
+    can be fetched.
+
+    Usage:
+
+    .. code-block:: python
+
+        app = FakeInvenioRDM(conditions=Conditions(latency=0.01))
+        records = app.populate(1000)
+
+        # In-process, without sockets.
+        client = app.client()
+
+        # Over HTTP, on localhost.
+        with LocalServer(app) as server:
+            client = InvenioAPI(server.url, "token")
+
+        # With the asynchronous client, without sockets.
+        async with app.async_client() as api:
+            record = await api.records(records[0]["id"]).get()
+
+    :param max_result_window: maximum number of hits that can be paginated,
+        as the search engine.
+    :param storage_url: base URL of the pre-signed URLs returned for the
+        parts of multipart transfers, e.g. to simulate an S3 storage on
+        another host, by default the base URL of the requests. The parts
+        are also uploaded to the app, which ignores the host.
+    """
+
+    base_url = "https://inveniordm.test/api"
+
+    def __init__(
+        self, conditions=None, max_result_window=10000, seed=None, storage_url=None
+    ):
+        """Initialize application."""
+        self.conditions = conditions or Conditions()
+        self.max_result_window = max_result_window
+        self.storage_url = storage_url
+        self.records = {}
+        self.drafts = {}
+        self.tombstones = set()
+        self.files = {}
+        self.communities = {}
+        self.versions = {}
+        #: Number of handled requests, per ``(method, route name)``.
+        self.stats = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.RLock()
+        self._routes = [
+            (getattr(self, name).route, getattr(self, name))
+            for name in dir(type(self))
+            if hasattr(getattr(type(self), name), "route")
+        ]
+
+    #
+    # Clients
+    #
+    def session(self):
+        """Create a ``requests`` session sending its requests to the app."""
+        session = Session()
+        session.mount(self.base_url, WSGIAdapter(self))
+        return session
+
+    def client(self, access_token="token", **kwargs):
+        """Create a client of the app, without sockets."""
+        return InvenioAPI(
+            self.base_url, access_token, transport=WSGITransport(self), **kwargs
+        )
+
+    def async_client(self, access_token="token", transport=None, **kwargs):
+        """Create an asynchronous client of the app, without sockets.
+
+        Requires ``httpx``.
+
+        :param transport: an
+            :class:`~inveniordm_py.testing.adapter.AsyncWSGITransport` of the
+            app, created by default.
+        """
+        from ..aio import AsyncInvenioAPI
+
+        return AsyncInvenioAPI(
+            self.base_url,
+            access_token,
+            transport=transport or AsyncWSGITransport(self),
+            **kwargs,
+        )
+
+    #
+    # State
+    #
+    def new_id(self):
+        """Generate a record ID, e.g. ``abcde-12345``."""
+        letters = "abcdefghjkmnpqrstvwxyz0123456789"
+        while True:
+            id_ = "".join(self._random.choice(letters) for _ in range(5))
+            id_ += "-" + "".join(self._random.choice(letters) for _ in range(5))
+            if id_ not in self.records and id_ not in self.drafts:
+                return id_
+
+    def populate(self, n, **data):
+        """Publish ``n`` records directly, bypassing the REST API.
+
+        :param data: fields of the records, e.g. ``metadata`` or ``created``,
+            or callables called with the index of the record returning the
+            field.
+        :returns: the list of the created records.
+        """
+        created = []
+        with self._lock:
+            for i in range(n):
+                fields = {k: v(i) if callable(v) else v for k, v in data.items()}
+                draft = self._new_draft(
+                    {"metadata": {"title": f"Record {i}"}, **fields}
+                )
+                record = self._publish(draft["id"])
+                # Timestamps are set by the server, unless given.
+                for key in ("created", "updated"):
+                    if key in fields:
+                        record[key] = fields[key]
+                created.append(record)
+        return created
+
+    def update_record(self, id_, **data):
+        """Update a published record directly, bumping its revision."""
+        with self._lock:
+            record = self.records[id_]
+            record.update(deepcopy(data))
+            record["revision_id"] += 1
+            record["updated"] = now()
+            return record
+
+    def delete_record(self, id_):
+        """Delete a published record, which becomes a tombstone."""
+        with self._lock:
+            del self.records[id_]
+            self.tombstones.add(id_)
+
+    def _new_draft(self, data, parent=None):
+        """Create a draft."""
+        id_ = self.new_id()
+        timestamp = now()
+        parent = parent or self.new_id()
+        draft = {
+            "access": {"record": "public", "files": "public"},
+            "files": {"enabled": True},
+            "metadata": {},
+            **deepcopy(data),
+            "id": id_,
+            "created": timestamp,
+            "updated": timestamp,
+            "revision_id": 1,
+            "is_published": False,
+            "parent": {"id": parent},
+        }
+        self.drafts[id_] = draft
+        versions = self.versions.setdefault(parent, [])
+        versions.append(id_)
+        draft["versions"] = {"index": len(versions), "is_latest": False}
+        self.files[id_, "draft"] = {}
+        return draft
+
+    def _publish(self, id_):
+        """Publish a draft."""
+        draft = self.drafts.pop(id_)
+        entries = self.files.pop((id_, "draft"))
+        pending = [k for k, e in entries.items() if e["status"] != "completed"]
+        if pending:
+            self.drafts[id_] = draft
+            self.files[id_, "draft"] = entries
+            raise HTTPError(400, f"Files are not committed: {', '.join(pending)}.")
+        record = self.records.get(id_, {})
+        record.update(draft)
+        record["is_published"] = True
+        record["revision_id"] = record["revision_id"] + 1
+        record["updated"] = now()
+        self.records[id_] = record
+        self.files[id_, "record"] = entries
+        for other in self.versions[record["parent"]["id"]]:
+            if other in self.records:
+                self.records[other]["versions"]["is_latest"] = other == id_
+        return record
+
+    #
+    # WSGI
+    #
+    def __call__(self, environ, start_response):
+        """Handle a request."""
+        conditions = self.conditions
+        delay = conditions.delay()
+        if delay:
+            time.sleep(delay)
+        try:
+            retry_after = conditions.throttle()
+            if retry_after is not None:
+                raise HTTPError(
+                    429,
+                    headers={
+                        "Retry-After": f"{retry_after:.3f}",
+                        "X-RateLimit-Limit": str(conditions.rate_limit),
+                        "X-RateLimit-Remaining": "0",
+                    },
+                )
+            status = conditions.error()
+            if status is not None:
+                raise HTTPError(status, "Injected error.")
+            status, body, headers = self._dispatch(environ)
+        except HTTPError as e:
+            status, headers = e.status, e.headers
+            body = {"status": e.status, "message": e.message}
+
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode()
+            headers = {"Content-Type": "application/json", **headers}
+        headers = {"Content-Length": str(len(body)), **headers}
+        start_response(f"{status} {_reasons.get(status, '')}", list(headers.items()))
+        if environ["REQUEST_METHOD"] == "HEAD":
+            return []
+        return self._chunks(body)
+
+    def _chunks(self, body, chunk_size=64 * 1024):
+        """Send a response body at the bandwidth."""
+        for start in range(0, len(body), chunk_size):
+            chunk = body[start : start + chunk_size]
+            self.conditions.transfer(len(chunk))
+            yield chunk
+
+    def _read_body(self, environ, chunk_size=64 * 1024):
+        """Read the request body at the bandwidth."""
+        stream = environ["wsgi.input"]
+        if environ.get("HTTP_TRANSFER_ENCODING", "").lower() == "chunked":
+            return self._read_chunked(stream)
+        remaining = int(environ.get("CONTENT_LENGTH") or 0)
+        chunks = []
+        while remaining > 0:
+            chunk = stream.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            self.conditions.transfer(len(chunk))
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        return b"".join(chunks)
+
+    def _read_chunked(self, stream):
+        """Read a request body sent with a chunked transfer encoding."""
+        chunks = []
+        while True:
+            size = int(stream.readline().split(b";")[0], 16)
+            if size == 0:
+                stream.readline()
+                return b"".join(chunks)
+            chunk = stream.read(size)
+            self.conditions.transfer(len(chunk))
+            chunks.append(chunk)
+            stream.readline()
+
+    def _dispatch(self, environ):
+        """Route a request to its handler."""
+        method = environ["REQUEST_METHOD"]
+        path = environ.get("SCRIPT_NAME", "") + environ.get("PATH_INFO", "")
+        if not path.startswith("/api/"):
+            if method == "HEAD":
+                return 200, b"", {}
+            raise HTTPError(404)
+        path = path[len("/api") :]
+        handler_method = "GET" if method == "HEAD" else method
+        allowed = False
+        for (route_method, pattern), handler in self._routes:
+            match = pattern.match(path)
+            if match is None:
+                continue
+            allowed = True
+            if route_method != handler_method:
+                continue
+            request = Request(environ, path, self._read_body(environ))
+            self.stats[method, handler.__name__] += 1
+            with self._lock:
+                return handler(request, *match.groups())
+        raise HTTPError(405 if allowed else 404)
+
+    #
+    # Serialization
+    #
+    def _links(self, request, doc, draft=False):
+        """Add the links of a record or draft."""
+        base = f"{request.base_url}/records/{doc['id']}"
+        links = {
+            "self": f"{base}/draft" if draft else base,
+            "files": f"{base}/draft/files" if draft else f"{base}/files",
+            "versions": f"{base}/versions",
+            "latest": f"{base}/versions/latest",
+        }
+        if draft:
+            links["publish"] = f"{base}/draft/actions/publish"
+        return {**deepcopy(doc), "links": links}
+
+    def _file_entry(self, request, id_, entry, draft=True):
+        """Serialize a file entry."""
+        base = f"{request.base_url}/records/{id_}{'/draft' if draft else ''}/files"
+        base += f"/{entry['key']}"
+        links = {"self": base, "content": f"{base}/content"}
+        if draft:
+            links["commit"] = f"{base}/commit"
+            parts = entry.get("transfer", {}).get("parts")
+            if parts:
+                storage = base
+                if self.storage_url is not None:
+                    storage = base.replace(request.base_url, self.storage_url, 1)
+                links["parts"] = [
+                    {"part": p, "url": f"{storage}/content/{p}"}
+                    for p in range(1, parts + 1)
+                ]
+        fields = {k: v for k, v in entry.items() if not k.startswith("_")}
+        return {**fields, "links": links}
+
+    def _files_list(self, request, id_, draft=True):
+        """Serialize the files of a draft or record."""
+        entries = self._entries(id_, draft)
+        return {
+            "enabled": True,
+            "entries": [
+                self._file_entry(request, id_, e, draft) for e in entries.values()
+            ],
+            "order": [],
+            "links": {
+                "self": f"{request.base_url}/records/{id_}"
+                f"{'/draft' if draft else ''}/files"
+            },
+        }
+
+    def _search(self, request, docs):
+        """Search a list of documents, returning a page of results."""
+        args = request.args
+        try:
+            page = int(args.get("page", 1))
+            size = int(args.get("size", 10))
+            query = Query(args.get("q", ""))
+        except ValueError as e:
+            raise HTTPError(400, str(e))
+        if page < 1 or size < 1 or page * size > self.max_result_window:
+            raise HTTPError(400, "Page out of the result window.")
+        hits = [d for d in docs if query.matches(d)]
+        sort = args.get("sort", "newest")
+        field, reverse = {
+            "oldest": ("created", False),
+            "updated-asc": ("updated", False),
+            "updated-desc": ("updated", True),
+        }.get(sort, ("created", True))
+        hits.sort(key=lambda d: (d[field], d["id"]), reverse=reverse)
+
+        start = (page - 1) * size
+        links = {"self": request.page_url(page)}
+        if page > 1:
+            links["prev"] = request.page_url(page - 1)
+        if start + size < len(hits) and (page + 1) * size <= self.max_result_window:
+            links["next"] = request.page_url(page + 1)
+        return {
+            "hits": {
+                "hits": [self._links(request, d) for d in hits[start : start + size]],
+                "total": len(hits),
+            },
+            "aggregations": {},
+            "links": links,
+            "sortBy": sort,
+        }
+
+    #
+    # Lookups
+    #
+    def _record(self, id_):
+        """Get a published record."""
+        if id_ in self.tombstones:
+            raise HTTPError(410, "The record has been deleted.")
+        try:
+            return self.records[id_]
+        except KeyError:
+            raise HTTPError(404, "The persistent identifier does not exist.")
+
+    def _draft(self, id_):
+        """Get a draft."""
+        try:
+            return self.drafts[id_]
+        except KeyError:
+            raise HTTPError(404, "The draft does not exist.")
+
+    def _entries(self, id_, draft=True):
+        """Get the file entries of a draft or record."""
+        (self._draft if draft else self._record)(id_)
+        return self.files[id_, "draft" if draft else "record"]
+
+    def _entry(self, id_, key, draft=True):
+        """Get a file entry."""
+        try:
+            return self._entries(id_, draft)[key]
+        except KeyError:
+            raise HTTPError(404, "The file does not exist.")
+
+    #
+    # Records
+    #
+    @route("GET", "/records")
+    def search_records(self, request):
+        """Search the published records."""
+        docs = [
+            r
+            for r in self.records.values()
+            if r["access"].get("record") != "restricted"
+            and (request.args.get("allversions") or r["versions"]["is_latest"])
+        ]
+        return 200, self._search(request, docs), {}
+
+    @route("POST", "/records")
+    def create_draft(self, request):
+        """Create a draft."""
+        draft = self._new_draft(request.json)
+        return 201, self._links(request, draft, draft=True), {}
+
+    @route("GET", "/records/([^/]+)")
+    def read_record(self, request, id_):
+        """Get a published record."""
+        return 200, self._links(request, self._record(id_)), {}
+
+    @route("GET", "/records/([^/]+)/draft")
+    def read_draft(self, request, id_):
+        """Get a draft."""
+        return 200, self._links(request, self._draft(id_), draft=True), {}
+
+    @route("POST", "/records/([^/]+)/draft")
+    def edit_record(self, request, id_):
+        """Create a draft of a published record."""
+        if id_ not in self.drafts:
+            record = deepcopy(self._record(id_))
+            record["is_published"] = False
+            self.drafts[id_] = record
+            self.files[id_, "draft"] = deepcopy(self.files[id_, "record"])
+        return 201, self._links(request, self.drafts[id_], draft=True), {}
+
+    @route("PUT", "/records/([^/]+)/draft")
+    def update_draft(self, request, id_):
+        """Update a draft."""
+        draft = self._draft(id_)
+        protected = ("id", "created", "revision_id", "parent", "versions")
+        for key, value in request.json.items():
+            if key not in protected and key != "links":
+                draft[key] = value
+        draft["revision_id"] += 1
+        draft["updated"] = now()
+        return 200, self._links(request, draft, draft=True), {}
+
+    @route("DELETE", "/records/([^/]+)/draft")
+    def delete_draft(self, request, id_):
+        """Delete a draft."""
+        draft = self._draft(id_)
+        del self.drafts[id_]
+        del self.files[id_, "draft"]
+        if id_ not in self.records:
+            self.versions[draft["parent"]["id"]].remove(id_)
+        return 204, b"", {}
+
+    @route("POST", "/records/([^/]+)/draft/actions/publish")
+    def publish(self, request, id_):
+        """Publish a draft."""
+        self._draft(id_)
+        return 202, self._links(request, self._publish(id_)), {}
+
+    @route("POST", "/records/([^/]+)/draft/actions/files-import")
+    def import_files(self, request, id_):
+        """Import the files of the previous version of a draft."""
+        draft = self._draft(id_)
+        versions = self.versions[draft["parent"]["id"]]
+        previous = [v for v in versions if v in self.records and v != id_]
+        if not previous:
+            raise HTTPError(404, "There is no previous version.")
+        entries = deepcopy(self.files[previous[-1], "record"])
+        self.files[id_, "draft"].update(entries)
+        return 201, self._files_list(request, id_), {}
+
+    #
+    # Versions
+    #
+    @route("GET", "/records/([^/]+)/versions")
+    def search_versions(self, request, id_):
+        """Search the versions of a record."""
+        parent = self._record(id_)["parent"]["id"]
+        docs = [self.records[v] for v in self.versions[parent] if v in self.records]
+        return 200, self._search(request, docs), {}
+
+    @route("GET", "/records/([^/]+)/versions/latest")
+    def latest_version(self, request, id_):
+        """Get the latest version of a record."""
+        parent = self._record(id_)["parent"]["id"]
+        latest = [v for v in self.versions[parent] if v in self.records][-1]
+        return 200, self._links(request, self.records[latest]), {}
+
+    @route("POST", "/records/([^/]+)/versions")
+    def new_version(self, request, id_):
+        """Create a draft of a new version of a record."""
+        record = self._record(id_)
+        data = {
+            k: deepcopy(v)
+            for k, v in record.items()
+            if k in ("metadata", "access", "files")
+        }
+        draft = self._new_draft(data, parent=record["parent"]["id"])
+        return 201, self._links(request, draft, draft=True), {}
+
+    #
+    # Draft files
+    #
+    @route("GET", "/records/([^/]+)/draft/files")
+    def list_draft_files(self, request, id_):
+        """List the files of a draft."""
+        return 200, self._files_list(request, id_), {}
+
+    @route("POST", "/records/([^/]+)/draft/files")
+    def init_files(self, request, id_):
+        """Initialize files in a draft."""
+        entries = self._entries(id_)
+        created = []
+        for item in request.json:
+            timestamp = now()
+            entry = {
+                **item,
+                "key": item["key"],
+                "status": "pending",
+                "created": timestamp,
+                "updated": timestamp,
+                "metadata": item.get("metadata"),
+                "_content": None,
+                "_parts": {},
+            }
+            entries[entry["key"]] = entry
+            created.append(self._file_entry(request, id_, entry))
+        return 201, {"enabled": True, "entries": created, "order": []}, {}
+
+    @route("GET", "/records/([^/]+)/draft/files/([^/]+)")
+    def read_draft_file(self, request, id_, key):
+        """Get the metadata of a draft file."""
+        return 200, self._file_entry(request, id_, self._entry(id_, key)), {}
+
+    @route("DELETE", "/records/([^/]+)/draft/files/([^/]+)")
+    def delete_draft_file(self, request, id_, key):
+        """Delete a draft file."""
+        self._entry(id_, key)
+        del self.files[id_, "draft"][key]
+        return 204, b"", {}
+
+    @route("PUT", "/records/([^/]+)/draft/files/([^/]+)/content")
+    def upload_content(self, request, id_, key):
+        """Upload the content of a draft file."""
+        entry = self._entry(id_, key)
+        entry["_content"] = request.body
+        entry["status"] = "pending"
+        return 200, self._file_entry(request, id_, entry), {}
+
+    @route("PUT", "/records/([^/]+)/draft/files/([^/]+)/content/([0-9]+)")
+    def upload_part(self, request, id_, key, part):
+        """Upload a part of the content of a draft file."""
+        entry = self._entry(id_, key)
+        entry["_parts"][int(part)] = request.body
+        return 200, b"", {}
+
+    @route("POST", "/records/([^/]+)/draft/files/([^/]+)/commit")
+    def commit_file(self, request, id_, key):
+        """Commit the content of a draft file."""
+        entry = self._entry(id_, key)
+        if entry["_parts"]:
+            parts = entry.pop("_parts")
+            entry["_content"] = b"".join(parts[p] for p in sorted(parts))
+            entry["_parts"] = {}
+        content = entry["_content"]
+        if content is None:
+            raise HTTPError(400, "The file content was not uploaded.")
+        entry.update(
+            status="completed",
+            size=len(content),
+            checksum=f"md5:{hashlib.md5(content).hexdigest()}",
+            updated=now(),
+        )
+        return 200, self._file_entry(request, id_, entry), {}
+
+    @route("GET", "/records/([^/]+)/draft/files/([^/]+)/content")
+    def read_draft_content(self, request, id_, key):
+        """Download the content of a draft file."""
+        return self._content(request, self._entry(id_, key))
+
+    #
+    # Record files
+    #
+    @route("GET", "/records/([^/]+)/files")
+    def list_record_files(self, request, id_):
+        """List the files of a record."""
+        return 200, self._files_list(request, id_, draft=False), {}
+
+    @route("GET", "/records/([^/]+)/files/([^/]+)")
+    def read_record_file(self, request, id_, key):
+        """Get the metadata of a record file."""
+        entry = self._entry(id_, key, draft=False)
+        return 200, self._file_entry(request, id_, entry, draft=False), {}
+
+    @route("GET", "/records/([^/]+)/files/([^/]+)/content")
+    def read_record_content(self, request, id_, key):
+        """Download the content of a record file."""
+        return self._content(request, self._entry(id_, key, draft=False))
+
+    def _content(self, request, entry):
+        """Serve the content of a file, honouring range requests."""
+        content = entry["_content"]
+        if content is None:
+            raise HTTPError(404, "The file content was not uploaded.")
+        headers = {"Content-Type": "application/octet-stream", "Accept-Ranges": "bytes"}
+        match = re.match(r"bytes=(\d+)-(\d*)$", request.headers.get("RANGE", ""))
+        if match is None:
+            return 200, content, headers
+        start = int(match.group(1))
+        end = int(match.group(2)) if match.group(2) else len(content) - 1
+        end = min(end, len(content) - 1)
+        if start > end:
+            raise HTTPError(416, headers={"Content-Range": f"bytes */{len(content)}"})
+        headers["Content-Range"] = f"bytes {start}-{end}/{len(content)}"
+        return 206, content[start : end + 1], headers
+
+    #
+    # Communities
+    #
+    @route("GET", "/records/([^/]+)/communities")
+    def search_communities(self, request, id_):
+        """List the communities of a record."""
+        self._record(id_)
+        hits = self.communities.get(id_, [])
+        return 200, {"hits": {"hits": hits, "total": len(hits)}, "links": {}}, {}
+
+    @route("POST", "/records/([^/]+)/communities")
+    def add_communities(self, request, id_):
+        """Add a record to communities."""
+        self._record(id_)
+        communities = self.communities.setdefault(id_, [])
+        processed = []
+        for community in request.json.get("communities", []):
+            if community not in communities:
+                communities.append(community)
+            processed.append({"community_id": community["id"]})
+        return 200, {"processed": processed, "errors": []}, {}
+
+
+class Request:
+    """Request handled by the fake InvenioRDM."""
+
+    def __init__(self, environ, path, body):
+        """Initialize request.
+
+        :param path: path of the request, relative to the API.
+        """
+        self.environ = environ
+        self.body = body
+        self.args = dict(parse_qsl(environ.get("QUERY_STRING", "")))
+        self.headers = {
+            k[len("HTTP_") :]: v for k, v in environ.items() if k.startswith("HTTP_")
+        }
+        host = environ.get("HTTP_HOST") or environ.get("SERVER_NAME", "localhost")
+        self.base_url = f"{environ.get('wsgi.url_scheme', 'http')}://{host}/api"
+        self.url = self.base_url + path
+
+    @property
+    def json(self):
+        """Decode the JSON body."""
+        try:
+            return json.loads(self.body) if self.body else {}
+        except ValueError:
+            raise HTTPError(400, "Invalid JSON body.")
+
+    def page_url(self, page):
+        """URL of another page of a search."""
+        return f"{self.url}?{urlencode({**self.args, 'page': page})}"
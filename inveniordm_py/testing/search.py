@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# inveniordm-py is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Evaluation of search queries by the fake InvenioRDM.
+
+Supports the subset of the query string syntax used by the client: terms
+(``field:value``, ``field:"quoted value"``, wildcards), ranges
+(``field:[lower TO upper}``, with ``*`` for open bounds), grouping of values
+(``field:(a OR b)``), ``AND``, ``OR``, ``NOT`` and parentheses. Terms without
+a field match the title of the records.
+"""
+
+import fnmatch
+import re
+
+from ..pagination import parse_datetime
+
+_tokens = re.compile(
+    r'\s*(?:(?P<field>[\w.]+):|(?P<quoted>"(?:[^"\\]|\\.)*")|(?P<open>[(\[{])'
+    r'|(?P<close>[)\]}])|(?P<word>[^\s()\[\]{}"]+))'
+)
+
+
+def tokenize(q):
+    """Split a query into ``(kind, value)`` tokens."""
+    tokens, pos = [], 0
+    q = q.rstrip()
+    while pos < len(q):
+        match = _tokens.match(q, pos)
+        if match is None or match.end() == pos:
+            raise ValueError(f"Invalid query: {q!r}.")
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "quoted":
+            value = re.sub(r"\\(.)", r"\1", value[1:-1])
+        tokens.append((kind, value))
+        pos = match.end()
+    return tokens
+
+
+def get_field(doc, field):
+    """Get the values of a dotted field of a document, as a list."""
+    values = [doc]
+    for name in field.split("."):
+        found = []
+        for value in values:
+            value = value.get(name) if isinstance(value, dict) else None
+            if isinstance(value, list):
+                found.extend(value)
+            elif value is not None:
+                found.append(value)
+        values = found
+    return values
+
+
+def _comparable(value):
+    """Convert a value so that it can be compared, e.g. a date."""
+    if isinstance(value, (int, float)):
+        return value
+    value = str(value)
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return parse_datetime(value)
+    except ValueError:
+        return value
+
+
+def _compare(a, b):
+    """Compare two values, returning -1, 0 or 1."""
+    a, b = _comparable(a), _comparable(b)
+    try:
+        return (a > b) - (a < b)
+    except TypeError:
+        a, b = str(a), str(b)
+        return (a > b) - (a < b)
+
+
+class Query:
+    """Parsed search query, matching documents."""
+
+    default_field = "metadata.title"
+
+    def __init__(self, q):
+        """Parse a query."""
+        self._tokens = tokenize(q or "")
+        self._pos = 0
+        self._tree = self._expr(None) if self._tokens else None
+        if self._pos != len(self._tokens):
+            raise ValueError(f"Invalid query: {q!r}.")
+
+    def _peek(self):
+        """Get the next token."""
+        return (
+            self._tokens[self._pos] if self._pos < len(self._tokens) else (None, None)
+        )
+
+    def _next(self):
+        """Consume the next token."""
+        token = self._peek()
+        self._pos += 1
+        return token
+
+    def _expr(self, field):
+        """Parse a disjunction."""
+        nodes = [self._and(field)]
+        while self._peek() == ("word", "OR"):
+            self._next()
+            nodes.append(self._and(field))
+        return ("or", nodes) if len(nodes) > 1 else nodes[0]
+
+    def _and(self, field):
+        """Parse a conjunction, ``AND`` being implicit."""
+        nodes = [self._unary(field)]
+        while True:
+            kind, value = self._peek()
+            if kind is None or kind == "close" or (kind, value) == ("word", "OR"):
+                break
+            if (kind, value) == ("word", "AND"):
+                self._next()
+            nodes.append(self._unary(field))
+        return ("and", nodes) if len(nodes) > 1 else nodes[0]
+
+    def _unary(self, field):
+        """Parse a negation or a primary expression."""
+        if self._peek() == ("word", "NOT"):
+            self._next()
+            return ("not", self._unary(field))
+        return self._primary(field)
+
+    def _primary(self, field):
+        """Parse a group, a range or a term."""
+        kind, value = self._next()
+        if kind == "field":
+            return self._primary(value)
+        if kind == "open" and value == "(":
+            node = self._expr(field)
+            self._expect(")")
+            return node
+        if kind == "open":
+            lower = self._next()[1]
+            if self._next() != ("word", "TO"):
+                raise ValueError("Invalid range.")
+            upper = self._next()[1]
+            closing = self._next()[1]
+            return ("range", field, lower, upper, value == "[", closing == "]")
+        if kind in ("word", "quoted"):
+            return ("term", field, value, kind == "quoted")
+        raise ValueError(f"Unexpected token: {value!r}.")
+
+    def _expect(self, value):
+        """Consume a closing token."""
+        if self._next() != ("close", value):
+            raise ValueError(f"Expected {value!r}.")
+
+    def matches(self, doc):
+        """Whether a document matches the query."""
+        return self._tree is None or self._eval(self._tree, doc)
+
+    def _eval(self, node, doc):
+        """Evaluate a node of the query on a document."""
+        op = node[0]
+        if op == "or":
+            return any(self._eval(n, doc) for n in node[1])
+        if op == "and":
+            return all(self._eval(n, doc) for n in node[1])
+        if op == "not":
+            return not self._eval(node[1], doc)
+        if op == "range":
+            _, field, lower, upper, inc_lower, inc_upper = node
+            for value in get_field(doc, field):
+                if lower != "*":
+                    c = _compare(value, lower)
+                    if c < 0 or (c == 0 and not inc_lower):
+                        continue
+                if upper != "*":
+                    c = _compare(value, upper)
+                    if c > 0 or (c == 0 and not inc_upper):
+                        continue
+                return True
+            return False
+        _, field, term, quoted = node
+        if field is None:
+            # Free text, matched against the words of the title.
+            text = " ".join(map(str, get_field(doc, self.default_field))).lower()
+            return term == "*" or term.lower() in text
+        term = term.lower()
+        for value in get_field(doc, field):
+            value = str(value).lower()
+            if value == term or (not quoted and fnmatch.fnmatchcase(value, term)):
+                return True
+        return False
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# inveniordm-py is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""HTTP server on localhost, serving a WSGI application."""
+
+import threading
+from socketserver import ThreadingMixIn
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+
+class _ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    """WSGI server handling each connection in a thread."""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class _QuietHandler(WSGIRequestHandler):
+    """Request handler not logging the requests."""
+
+    def log_message(self, format, *args):
+        """Do not log."""
+
+
+class LocalServer:
+    """HTTP server on localhost, serving a WSGI application in a thread.
+
+    Used to measure the throughput of the client over real sockets, e.g. with
+    the :class:`~inveniordm_py.testing.app.FakeInvenioRDM`.
+
+    Usage:
+
+    .. code-block:: python
+
+        with LocalServer(FakeInvenioRDM()) as server:
+            client = InvenioAPI(server.url, "token")
+    """
+
+    def __init__(self, app, host="127.0.0.1", port=0):
+        """Initialize server.
+
+        :param port: port to listen on, ``0`` for any free port.
+        """
+        self.app = app
+        self._server = make_server(
+            host,
+            port,
+            app,
+            server_class=_ThreadingWSGIServer,
+            handler_class=_QuietHandler,
+        )
+        self._thread = None
+
+    @property
+    def url(self):
+        """Base URL of the REST API."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api"
+
+    def start(self):
+        """Start serving in a background thread."""
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}
+        )
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the socket."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self):
+        """Start serving."""
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        """Stop serving."""
+        self.stop()
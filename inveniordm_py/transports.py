@@ -0,0 +1,501 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# inveniordm-py is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Transports sending the HTTP requests of a client.
+
+All the requests of the resources of an
+:class:`~inveniordm_py.client.InvenioAPI` go through its transport, which
+takes the keyword arguments of ``requests`` (``params``, ``data``,
+``headers``, ``stream`` and ``timeout``) and returns a ``requests.Response``,
+whatever the HTTP stack underneath.
+"""
+
+import io
+import threading
+import time
+from datetime import timedelta
+from urllib.parse import urlencode
+
+import requests
+import urllib3
+from requests import Response, Session
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers, super_len
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+class ChunksReader(io.RawIOBase):
+    """Readable binary stream of the chunks of an iterable.
+
+    Used as the ``raw`` stream of the responses of the transports that do not
+    build on ``urllib3``.
+    """
+
+    def __init__(self, chunks, close=None):
+        """Initialize stream.
+
+        :param chunks: iterable of ``bytes``.
+        :param close: callable called when the stream is closed.
+        """
+        self._chunks = iter(chunks)
+        self._buffer = b""
+        self._close = close
+
+    def readable(self):
+        """Whether the stream is readable."""
+        return True
+
+    def readinto(self, buffer):
+        """Read the next bytes into a buffer."""
+        while not self._buffer:
+            try:
+                self._buffer = bytes(next(self._chunks))
+            except StopIteration:
+                return 0
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+    def close(self):
+        """Close the stream."""
+        if not self.closed and self._close is not None:
+            self._close()
+        super().close()
+
+
+def merge_headers(defaults, headers):
+    """Merge the headers of a request into the default ones.
+
+    As with ``requests``, headers set to ``None`` are removed.
+    """
+    merged = CaseInsensitiveDict(defaults)
+    for name, value in (headers or {}).items():
+        if value is None:
+            merged.pop(name, None)
+        else:
+            merged[name] = value
+    return merged
+
+
+def encode_params(url, params):
+    """Add query parameters to a URL, skipping the ``None`` values."""
+    if not params:
+        return url
+    query = urlencode([(k, v) for k, v in params.items() if v is not None], True)
+    if not query:
+        return url
+    return f"{url}{'&' if '?' in url else '?'}{query}"
+
+
+def build_response(request_url, status, reason, headers, raw, elapsed):
+    """Build a ``requests.Response``."""
+    response = Response()
+    response.status_code = status
+    response.reason = reason
+    response.headers = CaseInsensitiveDict(headers)
+    response.encoding = get_encoding_from_headers(response.headers)
+    response.raw = raw
+    response.url = request_url
+    response.elapsed = timedelta(seconds=elapsed)
+    return response
+
+
+def httpx_content(data, headers, chunk_size=1024 * 1024):
+    """Convert a request body to ``httpx`` content.
+
+    Memory views and file objects are sent in chunks of ``chunk_size``
+    bytes, and their length is set in the ``headers`` when known.
+    """
+    if data is None or isinstance(data, (bytes, str)):
+        return data
+    if isinstance(data, memoryview):
+        # httpx iterates over memory views item by item, send slices.
+        headers.setdefault("Content-Length", str(data.nbytes))
+        return (
+            bytes(data[i : i + chunk_size]) for i in range(0, data.nbytes, chunk_size)
+        )
+    if hasattr(data, "read"):
+        length = super_len(data)
+        if length:
+            headers.setdefault("Content-Length", str(length))
+        return iter(lambda: data.read(chunk_size), b"")
+    return data
+
+
+class Transport:
+    """Base class of the transports.
+
+    :attr headers: default headers of the requests, e.g. the authorization.
+    """
+
+    headers = None
+
+    def request(self, method, url, **kwargs):
+        """Send a request, taking the keyword arguments of ``requests``.
+
+        :returns: a ``requests.Response``.
+        """
+        raise NotImplementedError()
+
+    def set_pool_size(self, pool_connections, pool_maxsize):
+        """Resize the connection pools, if the transport has any."""
+
+    def close(self):
+        """Close the connections."""
+
+
+class RequestsTransport(Transport):
+    """Transport sending the requests with a ``requests`` session.
+
+    This is the default transport. The requests are dispatched to the
+    methods of the session named after the HTTP method (e.g.
+    ``session.get``), so that any object implementing them can be used.
+    """
+
+    def __init__(self, session=None):
+        """Initialize transport.
+
+        :param session: a ``requests.Session`` to use instead of creating one.
+        """
+        self.session = session if session is not None else Session()
+
+    @property
+    def headers(self):
+        """Default headers of the requests, i.e. those of the session."""
+        return self.session.headers
+
+    def request(self, method, url, **kwargs):
+        """Send a request with the session."""
+        return getattr(self.session, method.lower())(url, **kwargs)
+
+    def set_pool_size(self, pool_connections, pool_maxsize):
+        """Resize the connection pools of the HTTP adapters of the session.
+
+        The pool managers of the adapters are replaced, keeping their other
+        settings (e.g. ``max_retries``). The replaced pool managers are
+        cleared: their idle connections are closed, and those in use are
+        closed once released.
+        """
+        if not isinstance(self.session, Session):
+            return
+        adapters = {id(a): a for a in self.session.adapters.values()}
+        for adapter in adapters.values():
+            if not isinstance(adapter, HTTPAdapter):
+                continue
+            replaced = [adapter.poolmanager, *adapter.proxy_manager.values()]
+            adapter.init_poolmanager(
+                pool_connections, pool_maxsize, block=adapter._pool_block
+            )
+            adapter.proxy_manager = {}
+            for manager in replaced:
+                manager.clear()
+
+    def close(self):
+        """Close the session."""
+        self.session.close()
+
+
+class Urllib3Transport(Transport):
+    """Transport sending the requests with ``urllib3`` directly.
+
+    Skips the per-request work of a ``requests`` session (merging settings,
+    cookies, hooks and redirects), which are not used by the REST API.
+    Redirects are not followed.
+    """
+
+    def __init__(self, pool_connections=10, pool_maxsize=10, **pool_kwargs):
+        """Initialize transport.
+
+        :param pool_kwargs: keyword arguments of the ``urllib3.PoolManager``,
+            e.g. ``ca_certs``.
+        """
+        self.headers = CaseInsensitiveDict()
+        self._pool_kwargs = pool_kwargs
+        self.pool = None
+        self.set_pool_size(pool_connections, pool_maxsize)
+
+    def set_pool_size(self, pool_connections, pool_maxsize):
+        """Replace the pool manager, clearing the previous one.
+
+        The idle connections of the previous pools are closed, and those in
+        use are closed once released.
+        """
+        replaced = getattr(self, "pool", None)
+        self.pool = urllib3.PoolManager(
+            num_pools=pool_connections, maxsize=pool_maxsize, **self._pool_kwargs
+        )
+        if replaced is not None:
+            replaced.clear()
+
+    def _timeout(self, timeout):
+        """Convert a ``requests`` timeout."""
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            return urllib3.Timeout(connect=connect, read=read)
+        return urllib3.Timeout(connect=timeout, read=timeout)
+
+    def request(
+        self,
+        method,
+        url,
+        params=None,
+        data=None,
+        headers=None,
+        stream=False,
+        timeout=None,
+    ):
+        """Send a request."""
+        url = encode_params(url, params)
+        headers = merge_headers(self.headers, headers)
+        chunked = False
+        if data is not None and not isinstance(data, (bytes, str, memoryview)):
+            length = super_len(data)
+            if length:
+                headers.setdefault("Content-Length", str(length))
+            else:
+                chunked = "Content-Length" not in headers
+        start = time.perf_counter()
+        try:
+            raw = self.pool.urlopen(
+                method,
+                url,
+                body=data,
+                headers=dict(headers),
+                redirect=False,
+                retries=False,
+                preload_content=False,
+                decode_content=False,
+                chunked=chunked,
+                timeout=self._timeout(timeout),
+            )
+        except urllib3.exceptions.ConnectTimeoutError as e:
+            raise requests.ConnectTimeout(e)
+        except urllib3.exceptions.ReadTimeoutError as e:
+            raise requests.ReadTimeout(e)
+        except urllib3.exceptions.HTTPError as e:
+            raise requests.ConnectionError(e)
+        response = build_response(
+            url,
+            raw.status,
+            raw.reason,
+            raw.headers,
+            raw,
+            time.perf_counter() - start,
+        )
+        if not stream:
+            response.content
+            raw.release_conn()
+        return response
+
+    def close(self):
+        """Close the connections."""
+        self.pool.clear()
+
+
+class HTTPXTransport(Transport):
+    """Transport sending the requests with an ``httpx.Client``.
+
+    Supports HTTP/2 (``http2=True``, requires ``pip install
+    inveniordm-py[http2]``), where concurrent requests to a host are
+    multiplexed as streams of a single connection. The number of requests in
+    flight can be bounded with ``max_concurrent_streams``: further requests
+    wait for a stream to be released, i.e. for the body of a response to be
+    read or the response to be closed. A streamed response that is neither
+    read nor closed holds its stream until it is garbage collected, so close
+    them, e.g. with ``with response:``.
+
+    Requires the optional ``httpx`` dependency (``pip install
+    inveniordm-py[async]``).
+    """
+
+    def __init__(
+        self,
+        client=None,
+        http2=False,
+        max_connections=100,
+        max_keepalive_connections=20,
+        max_concurrent_streams=None,
+        **client_kwargs,
+    ):
+        """Initialize transport.
+
+        :param client: an ``httpx.Client`` to use instead of creating one.
+        :param http2: negotiate HTTP/2 with the servers supporting it.
+        :param max_concurrent_streams: maximum number of requests in flight,
+            unbounded by default.
+        :param client_kwargs: keyword arguments of the ``httpx.Client``.
+        """
+        if httpx is None:
+            raise RuntimeError(
+                "The HTTPX transport requires 'httpx', install it with "
+                "'pip install inveniordm-py[async]'."
+            )
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                raise RuntimeError(
+                    "HTTP/2 requires 'h2', install it with "
+                    "'pip install inveniordm-py[http2]'."
+                )
+        self.headers = CaseInsensitiveDict()
+        self.http2 = http2
+        self.max_concurrent_streams = max_concurrent_streams
+        self._streams = (
+            threading.BoundedSemaphore(max_concurrent_streams)
+            if max_concurrent_streams
+            else None
+        )
+        client_kwargs.setdefault("timeout", None)
+        self.client = client or httpx.Client(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+            ),
+            **client_kwargs,
+        )
+
+    def _timeout(self, timeout):
+        """Convert a ``requests`` timeout."""
+        if timeout is None:
+            return httpx.USE_CLIENT_DEFAULT
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            return httpx.Timeout(read, connect=connect)
+        return httpx.Timeout(timeout)
+
+    def _translate(self, error):
+        """Convert an ``httpx`` error to a ``requests`` one."""
+        if isinstance(error, httpx.ConnectTimeout):
+            return requests.ConnectTimeout(error)
+        if isinstance(error, httpx.TimeoutException):
+            return requests.ReadTimeout(error)
+        if isinstance(error, httpx.TransportError):
+            return requests.ConnectionError(error)
+        return requests.RequestException(error)
+
+    def _acquire_stream(self):
+        """Wait for a stream to be available.
+
+        :returns: a callable releasing the stream, which can be called more
+            than once.
+        """
+        if self._streams is None:
+            return lambda: None
+        self._streams.acquire()
+        released = []
+
+        def release():
+            if not released:
+                released.append(True)
+                self._streams.release()
+
+        return release
+
+    def _iter_bytes(self, response, release):
+        """Iterate over the decoded body of a response.
+
+        The stream is released once the body is read, without waiting for the
+        response to be closed.
+        """
+        try:
+            yield from response.iter_bytes()
+        except httpx.HTTPError as e:
+            raise self._translate(e)
+        finally:
+            release()
+
+    def request(
+        self,
+        method,
+        url,
+        params=None,
+        data=None,
+        headers=None,
+        stream=False,
+        timeout=None,
+    ):
+        """Send a request."""
+        url = encode_params(url, params)
+        headers = merge_headers(self.headers, headers)
+        content = httpx_content(data, headers)
+        release = self._acquire_stream()
+        start = time.perf_counter()
+        try:
+            request = self.client.build_request(
+                method,
+                url,
+                content=content,
+                headers=dict(headers),
+                timeout=self._timeout(timeout),
+            )
+            resp = self.client.send(request, stream=True)
+        except httpx.HTTPError as e:
+            release()
+            raise self._translate(e)
+        except BaseException:
+            release()
+            raise
+
+        def close():
+            try:
+                resp.close()
+            finally:
+                release()
+
+        response = build_response(
+            url,
+            resp.status_code,
+            resp.reason_phrase,
+            resp.headers.items(),
+            ChunksReader(self._iter_bytes(resp, release), close=close),
+            time.perf_counter() - start,
+        )
+        # The body is already decoded.
+        for name in ("Content-Encoding", "Transfer-Encoding"):
+            response.headers.pop(name, None)
+        if not stream:
+            try:
+                response.content
+            finally:
+                close()
+        return response
+
+    def close(self):
+        """Close the connections."""
+        self.client.close()
+
+
+class WSGITransport(RequestsTransport):
+    """Transport sending the requests to an in-process WSGI application.
+
+    Used to run the client against e.g. the
+    :class:`~inveniordm_py.testing.app.FakeInvenioRDM`, without sockets.
+    """
+
+    def __init__(self, app):
+        """Initialize transport.
+
+        :param app: the WSGI application.
+        """
+        from .testing.adapter import WSGIAdapter
+
+        super().__init__()
+        self.app = app
+        adapter = WSGIAdapter(app)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def set_pool_size(self, pool_connections, pool_maxsize):
+        """There is no connection pool."""
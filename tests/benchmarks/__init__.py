@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# inveniordm-py is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+"""Benchmarks of the client hot paths.
+
+Run them with ``python -m tests.benchmarks``, see ``--help`` for the options.
+"""
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# inveniordm-py is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+"""Synthetic payloads of the benchmarks."""
+
+import json
+
+from ..mock.handlers import RecordsListHandler
+
+
+def make_creator(i):
+    """Create a synthetic creator."""
+    return {
+        "person_or_org": {
+            "family_name": f"Family {i}",
+            "given_name": f"Given {i}",
+            "type": "personal",
+            "identifiers": [{"scheme": "orcid", "identifier": "0000-0001-8135-3489"}],
+        },
+        "affiliations": [{"name": f"Affiliation {i % 7}"}],
+    }
+
+
+def make_record(id_, size=1024):
+    """Create a synthetic record of about ``size`` bytes once encoded.
+
+    About half of the size is made of creators, i.e. small nested objects,
+    and the rest of a long description.
+    """
+    record = {
+        **RecordsListHandler().base,
+        "id": str(id_),
+        "metadata": {
+            "resource_type": {"id": "image-photo"},
+            "title": f"Synthetic record {id_}",
+            "publication_date": "2020-06-01",
+            "creators": [],
+            "description": "",
+        },
+    }
+    creators = record["metadata"]["creators"]
+    while len(json.dumps(record)) < size // 2 or not creators:
+        creators.append(make_creator(len(creators)))
+    padding = size - len(json.dumps(record))
+    record["metadata"]["description"] = "Lorem ipsum. " * max(0, padding // 13)
+    return record
+
+
+def make_page(url, page, size, total, record_size=1024):
+    """Create a synthetic page of search results."""
+    start, end = (page - 1) * size, min(page * size, total)
+    links = {"self": f"{url}?page={page}&size={size}"}
+    if end < total:
+        links["next"] = f"{url}?page={page + 1}&size={size}"
+    return {
+        "aggregations": {},
+        "hits": {
+            "hits": [make_record(i, record_size) for i in range(start, end)],
+            "total": total,
+        },
+        "links": links,
+        "sortBy": "newest",
+    }
+
+
+def make_file(size):
+    """Create the synthetic contents of a file."""
+    pattern = bytes(range(256))
+    return (pattern * (size // len(pattern) + 1))[:size]
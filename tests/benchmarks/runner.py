@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# inveniordm-py is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+"""Runner of the benchmarks, writing their results as JSON."""
+
+import argparse
+import datetime
+import fnmatch
+import json
+import platform
+import statistics
+import sys
+import time
+
+from inveniordm_py import __version__
+
+from .suite import benchmarks
+
+
+def measure(run, repeat):
+    """Time ``repeat`` runs of an operation, after a warmup run."""
+    run()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def run_benchmarks(pattern="*", repeat=5, quick=False):
+    """Run the benchmarks whose name matches a pattern.
+
+    :returns: the results, as a JSON serializable dictionary.
+    """
+    results = []
+    for name, spec in benchmarks.items():
+        if not fnmatch.fnmatch(name, pattern):
+            continue
+        for params in spec["quick" if quick else "params"]:
+            run, quantity = spec["func"](**params)
+            timings = measure(run, repeat)
+            median = statistics.median(timings)
+            results.append(
+                {
+                    "name": name,
+                    "params": params,
+                    "unit": spec["unit"],
+                    "quantity": quantity,
+                    "timings": timings,
+                    "min": min(timings),
+                    "median": median,
+                    "mean": statistics.mean(timings),
+                    "throughput": quantity / median if median else None,
+                }
+            )
+    return {
+        "version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "date": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "quick": quick,
+        "results": results,
+    }
+
+
+def _key(result):
+    """Identify a result across runs."""
+    return result["name"], json.dumps(result["params"], sort_keys=True)
+
+
+def compare(baseline, results):
+    """Compare the median timings of two runs.
+
+    :returns: a list of ``(name, params, ratio)``, where a ratio above 1
+        means the benchmark became slower than in the baseline.
+    """
+    previous = {_key(r): r for r in baseline["results"]}
+    ratios = []
+    for result in results["results"]:
+        old = previous.get(_key(result))
+        if old is not None and old["median"]:
+            ratios.append(
+                (result["name"], result["params"], result["median"] / old["median"])
+            )
+    return ratios
+
+
+def main(argv=None):
+    """Run the benchmarks from the command line."""
+    parser = argparse.ArgumentParser(
+        prog="python -m tests.benchmarks", description=__doc__
+    )
+    parser.add_argument("-k", "--filter", default="*", help="benchmark name pattern")
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    parser.add_argument("-o", "--output", help="file to write the JSON results to")
+    parser.add_argument("--compare", help="JSON results of a previous run")
+    parser.add_argument("--quick", action="store_true", help="small parameters")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.filter, repeat=args.repeat, quick=args.quick)
+    for r in results["results"]:
+        params = " ".join(f"{k}={v}" for k, v in r["params"].items())
+        print(
+            f"{r['name']:<24} {params:<40} {r['median'] * 1000:10.3f} ms "
+            f"{r['throughput']:14.1f} {r['unit']}/s",
+            file=sys.stderr,
+        )
+    if args.compare:
+        with open(args.compare) as fp:
+            baseline = json.load(fp)
+        for name, params, ratio in compare(baseline, results):
+            params = " ".join(f"{k}={v}" for k, v in params.items())
+            print(f"{name:<24} {params:<40} x{ratio:.2f}", file=sys.stderr)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as fp:
+            fp.write(output)
+    else:
+        print(output)
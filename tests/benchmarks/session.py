@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# inveniordm-py is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+"""Mock session of the benchmarks, with synthetic payloads and latency."""
+
+import json
+import re
+import time
+from urllib.parse import parse_qsl, urlsplit
+
+from ..mock.session import FakeSession
+from .payloads import make_file, make_page, make_record
+
+
+class PayloadResponse:
+    """Response with a synthetic body.
+
+    Lighter than the mocked responses, so that the benchmarks measure the
+    client rather than the mocks.
+    """
+
+    def __init__(self, content=b"", status_code=200, headers=None):
+        """Constructor."""
+        self.content = content
+        self.status_code = status_code
+        self.headers = {"Content-Length": str(len(content)), **(headers or {})}
+
+    def json(self):
+        """Decode the body."""
+        return json.loads(self.content)
+
+    def iter_content(self, chunk_size=1):
+        """Iterate over the chunks of the body."""
+        content = self.content
+        for start in range(0, len(content), chunk_size):
+            yield content[start : start + chunk_size]
+
+    def raise_for_status(self):
+        """Mock function."""
+
+    def close(self):
+        """Mock function."""
+
+
+def consume(data, chunk_size=1024 * 1024):
+    """Read a request body as a server would, returning its size."""
+    if data is None:
+        return 0
+    if isinstance(data, (bytes, str)):
+        return len(data)
+    if isinstance(data, memoryview):
+        return data.nbytes
+    if hasattr(data, "read"):
+        size = 0
+        while True:
+            chunk = data.read(chunk_size)
+            if not chunk:
+                return size
+            size += len(chunk)
+    return sum(len(chunk) for chunk in data)
+
+
+class BenchmarkSession(FakeSession):
+    """Mock session serving synthetic payloads, after a configurable latency.
+
+    Searches return pages of ``total`` records of about ``record_size`` bytes,
+    file contents are ``file_size`` bytes long, and created drafts are echoed
+    back. The payloads are generated once, so that their generation is not
+    measured. Other requests are handled by the :class:`MockSession`.
+    """
+
+    FILE_CONTENT = re.compile(r"/records/[^/]+(/draft)?/files/([^/]+)/content$")
+    RECORD = re.compile(r"/records/([^/]+)(/draft)?$")
+
+    def __init__(self, latency=0.0, record_size=1024, file_size=1024**2, total=1000):
+        """Constructor.
+
+        :param latency: time (in seconds) waited before answering a request.
+        """
+        super().__init__()
+        self.latency = latency
+        self.record_size = record_size
+        self.total = total
+        self.file = make_file(file_size)
+        self.received = 0
+        self._bodies = {}
+
+    def _wait(self):
+        """Simulate the latency of the network and the server."""
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _body(self, key, factory):
+        """Get a cached encoded body."""
+        body = self._bodies.get(key)
+        if body is None:
+            body = self._bodies[key] = json.dumps(factory()).encode()
+        return body
+
+    def get(self, *args, **kwargs):
+        """Serve searches, records and file contents."""
+        url = args[0]
+        parts = urlsplit(url)
+        path = parts.path
+        if self.FILE_CONTENT.search(path):
+            self._wait()
+            return PayloadResponse(self.file)
+        if path.endswith("/records"):
+            self._wait()
+            query = {**dict(parse_qsl(parts.query)), **(kwargs.get("params") or {})}
+            page, size = int(query.get("page", 1)), int(query.get("size", 10))
+            base_url = f"{parts.scheme}://{parts.netloc}{path}"
+            return PayloadResponse(
+                self._body(
+                    ("page", page, size),
+                    lambda: make_page(
+                        base_url, page, size, self.total, self.record_size
+                    ),
+                )
+            )
+        match = self.RECORD.search(path)
+        if match:
+            self._wait()
+            id_ = match.group(1)
+            return PayloadResponse(
+                self._body(("record", id_), lambda: make_record(id_, self.record_size))
+            )
+        return super().get(*args, **kwargs)
+
+    def post(self, *args, **kwargs):
+        """Echo created drafts."""
+        if urlsplit(args[0]).path.endswith("/records"):
+            self._wait()
+            data = kwargs.get("data")
+            return PayloadResponse(data.encode() if isinstance(data, str) else data)
+        return super().post(*args, **kwargs)
+
+    def put(self, *args, **kwargs):
+        """Receive file contents."""
+        match = self.FILE_CONTENT.search(urlsplit(args[0]).path)
+        if match:
+            self.received += consume(kwargs.get("data"))
+            self._wait()
+            return PayloadResponse(
+                json.dumps({"key": match.group(2), "status": "pending"}).encode()
+            )
+        return super().put(*args, **kwargs)
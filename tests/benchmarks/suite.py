@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# inveniordm-py is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+"""Benchmarks of the client hot paths.
+
+A benchmark is a function called with its parameters, which returns the
+operation to time and the number of units (items or bytes) processed by one
+run of the operation. Each benchmark declares the full grid of parameters
+and a smaller one, used by ``--quick`` runs and the tests.
+"""
+
+import json
+
+from inveniordm_py import InvenioAPI
+from inveniordm_py.pagination import SimplePagination
+from inveniordm_py.records.metadata import DraftMetadata, RecordListMetadata
+from inveniordm_py.records.resources import Record
+
+from .payloads import make_page, make_record
+from .session import BenchmarkSession, PayloadResponse
+
+BASE_URL = "https://127.0.0.1/api"
+
+#: Registered benchmarks, by name.
+benchmarks = {}
+
+
+def benchmark(unit, params, quick):
+    """Register a benchmark.
+
+    :param unit: unit of the processed quantities, e.g. ``"items"``.
+    :param params: list of parameter dictionaries.
+    :param quick: smaller list of parameter dictionaries.
+    """
+
+    def register(func):
+        benchmarks[func.__name__] = {
+            "func": func,
+            "unit": unit,
+            "params": params,
+            "quick": quick,
+        }
+        return func
+
+    return register
+
+
+def make_client(**kwargs):
+    """Create a client on a benchmark session."""
+    return InvenioAPI(BASE_URL, "token", session=BenchmarkSession(**kwargs))
+
+
+@benchmark(
+    "items",
+    params=[{"hits": 100, "record_size": s} for s in (1024, 10 * 1024)],
+    quick=[{"hits": 10, "record_size": 1024}],
+)
+def hits_iteration(hits, record_size):
+    """Iterate over the hits of a page, creating their resources."""
+    client = make_client()
+    page = make_page(f"{BASE_URL}/records", 1, hits, hits, record_size)
+    factory = client.records._make_factory(Record)
+
+    def run():
+        data = RecordListMetadata(**page)
+        for record in SimplePagination(data, factory, None, None):
+            record.data["id"]
+
+    return run, hits
+
+
+@benchmark(
+    "items",
+    params=[{"hits": 100, "record_size": s} for s in (1024, 10 * 1024)],
+    quick=[{"hits": 10, "record_size": 1024}],
+)
+def search(hits, record_size):
+    """Search, decoding the response and iterating over its hits."""
+    client = make_client(record_size=record_size, total=hits)
+
+    def run():
+        for record in client.records.search(size=hits):
+            record.data["id"]
+
+    return run, hits
+
+
+@benchmark(
+    "bytes",
+    params=[{"record_size": s} for s in (1024, 10 * 1024, 100 * 1024)],
+    quick=[{"record_size": 1024}],
+)
+def metadata_to_request(record_size):
+    """Encode a record to a request body."""
+    data = DraftMetadata(**make_record(1, record_size))
+    size = len(data.to_request())
+    return data.to_request, size
+
+
+@benchmark(
+    "bytes",
+    params=[{"record_size": s} for s in (1024, 10 * 1024, 100 * 1024)],
+    quick=[{"record_size": 1024}],
+)
+def metadata_from_response(record_size):
+    """Decode a record from a response body."""
+    response = PayloadResponse(json.dumps(make_record(1, record_size)).encode())
+
+    def run():
+        DraftMetadata.from_response(response)["id"]
+
+    return run, len(response.content)
+
+
+@benchmark(
+    "bytes",
+    params=[{"file_size": 64 * 1024**2, "latency": 0.001}],
+    quick=[{"file_size": 1024**2, "latency": 0}],
+)
+def file_download(file_size, latency):
+    """Download a file, chunk by chunk."""
+    client = make_client(file_size=file_size, latency=latency)
+    file = client.records("1").files("data.bin")
+
+    def run():
+        for _ in file.iter_content():
+            pass
+
+    return run, file_size
+
+
+@benchmark(
+    "bytes",
+    params=[{"file_size": 64 * 1024**2, "latency": 0.001}],
+    quick=[{"file_size": 1024**2, "latency": 0}],
+)
+def file_upload(file_size, latency):
+    """Upload the contents of a file held in memory."""
+    client = make_client(latency=latency)
+    file = client.records("1").draft.files("data.bin")
+    data = bytes(file_size)
+
+    def run():
+        file.set_contents(data)
+
+    return run, file_size
+
+
+@benchmark(
+    "items",
+    params=[{"items": 64, "concurrency": c, "latency": 0.01} for c in (1, 4, 16)],
+    quick=[{"items": 4, "concurrency": 2, "latency": 0}],
+)
+def bulk_create(items, concurrency, latency):
+    """Create drafts concurrently, with the latency of a server."""
+    client = make_client(latency=latency)
+    records = [make_record(i) for i in range(items)]
+
+    def run():
+        for result in client.records.bulk_create(records, concurrency=concurrency):
+            assert result.ok, result.error
+
+    return run, items
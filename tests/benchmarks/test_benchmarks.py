@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# inveniordm-py is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+"""Test the benchmarks run, with small parameters."""
+
+import json
+
+from .runner import compare, main, run_benchmarks
+from .suite import benchmarks
+
+
+def test_run_benchmarks():
+    """Test all the benchmarks run and report their throughput."""
+    results = run_benchmarks(repeat=1, quick=True)
+    assert {r["name"] for r in results["results"]} == set(benchmarks)
+    for result in results["results"]:
+        assert result["median"] > 0
+        assert result["throughput"] > 0
+    assert json.loads(json.dumps(results)) == results
+
+
+def test_compare(tmp_path):
+    """Test results are written and compared to a baseline."""
+    output = tmp_path / "results.json"
+    main(["--quick", "-r", "1", "-k", "metadata_*", "-o", str(output)])
+    baseline = json.loads(output.read_text())
+    assert {r["name"] for r in baseline["results"]} == {
+        "metadata_to_request",
+        "metadata_from_response",
+    }
+    ratios = compare(baseline, baseline)
+    assert [ratio for _, _, ratio in ratios] == [1.0, 1.0]
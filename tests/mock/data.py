@@ -0,0 +1,12 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# inveniordm-py is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+"""Data of the records populated in the fake InvenioRDM."""
+
+
+def dates(i):
+    """Distinct dates, increasing with ``i``, e.g. creation or update dates."""
+    return f"2020-01-{i % 28 + 1:02d}T{i // 28:02d}:00:00.000+00:00"
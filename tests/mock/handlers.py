@@ -6,9 +6,12 @@
 # it under the terms of the MIT License; see LICENSE file for more details.
 """Mock request handlers."""
 
-
 import json
+import re
 from abc import ABC, abstractmethod
+from urllib.parse import urlencode
+
+from inveniordm_py.pagination import parse_datetime
 
 
 class Handler(ABC):
@@ -156,16 +159,61 @@ class DraftFileHandler(Handler):
         raise NotImplementedError
 
 
+class DraftFileContentHandler(Handler):
+    """Handler for the contents of a draft file."""
+
+    def _handle_get(self, request):
+        """Handle GET requests, not implemented by the mock."""
+        raise NotImplementedError
+
+    def _handle_post(self, request):
+        """Handle POST requests, the API does not implement this endpoint."""
+        raise NotImplementedError
+
+    def _handle_delete(self, request):
+        """Handle DELETE requests, the API does not implement this endpoint."""
+        raise NotImplementedError
+
+    def _handle_put(self, request):
+        """Handle PUT requests (i.e. upload the contents of a file)."""
+        filename = request.url.split("/")[-2]
+        return {
+            "key": filename,
+            "updated": "2020-11-27 11:26:04.607831",
+            "created": "2020-11-27 11:17:10.998919",
+            "metadata": None,
+            "status": "pending",
+        }
+
+
 class RecordsListHandler(Handler):
     """Handler for records list."""
 
+    total = 25
+
     def _handle_get(self, request):
-        """Handle GET requests (i.e. list all records)."""
+        """Handle GET requests (i.e. list all records).
+
+        Returns a page of ``total`` records, the page and its size are taken
+        from the query parameters.
+        """
+        url = request.url.split("?")[0]
+        page = int(request.query.get("page", 1))
+        size = int(request.query.get("size", 10))
+        start, end = (page - 1) * size, min(page * size, self.total)
+        links = {"self": f"{url}?page={page}&size={size}"}
+        if page > 1:
+            links["prev"] = f"{url}?page={page - 1}&size={size}"
+        if end < self.total:
+            links["next"] = f"{url}?page={page + 1}&size={size}"
         return {
-            "aggregations": {...},
-            "hits": {...},
-            "links": {...},
-            "sortBy": ...,
+            "aggregations": {},
+            "hits": {
+                "hits": [{**self.base, "id": i} for i in range(start, end)],
+                "total": self.total,
+            },
+            "links": links,
+            "sortBy": "newest",
         }
 
     @property
@@ -334,3 +382,37 @@ class DraftHandler(Handler):
             "updated": "2020-11-27 10:52:23.969244",
             "versions": {"index": 1, "is_latest": False, "is_latest_draft": True},
         }
+
+
+class PartitionedRecordsHandler(RecordsListHandler):
+    """Handler searching records by creation date, with a result window."""
+
+    window = 10
+
+    def __init__(self, records):
+        """Constructor."""
+        self.records = records
+
+    def _handle_get(self, request):
+        """Handle GET requests (i.e. search the records of a date range)."""
+        url = request.url.split("?")[0]
+        params = request.query
+        page, size = int(params.get("page", 1)), int(params["size"])
+        if page * size > self.window:
+            raise ValueError("Result window is too large")
+        hits = self.records
+        match = re.search(r'created:\["(.+)" TO "(.+)"\}', params["q"])
+        if match:
+            lower, upper = map(parse_datetime, match.groups())
+            hits = [h for h in hits if lower <= parse_datetime(h["created"]) < upper]
+        hits = sorted(
+            hits, key=lambda h: h["created"], reverse=params["sort"] == "newest"
+        )
+        links = {}
+        if page * size < len(hits):
+            links["next"] = f"{url}?{urlencode({**params, 'page': page + 1})}"
+        return {
+            "hits": {"hits": hits[(page - 1) * size : page * size], "total": len(hits)},
+            "aggregations": {},
+            "links": links,
+        }
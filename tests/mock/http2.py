@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# inveniordm-py is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+"""Mock HTTP/2 server."""
+
+import json
+import socket
+import threading
+
+import pytest
+
+pytest.importorskip("h2")
+
+import h2.config  # noqa: E402
+import h2.connection  # noqa: E402
+import h2.events  # noqa: E402
+
+
+class HTTP2Server:
+    """Minimal cleartext HTTP/2 server, answering records by ID.
+
+    Clients must use HTTP/2 with prior knowledge, i.e. without an upgrade
+    from HTTP/1.1. The connections and streams opened are counted.
+    """
+
+    def __init__(self):
+        """Constructor."""
+        self._sock = socket.socket()
+        self._sock.bind(("127.0.0.1", 0))
+        self._sock.listen()
+        self.url = f"http://127.0.0.1:{self._sock.getsockname()[1]}/api"
+        self.connections = 0
+        self.streams = 0
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        """Start serving."""
+        threading.Thread(target=self._serve, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        """Stop serving."""
+        self._sock.close()
+
+    def _serve(self):
+        """Accept the connections."""
+        while True:
+            try:
+                sock, _ = self._sock.accept()
+            except OSError:
+                return
+            with self._lock:
+                self.connections += 1
+            threading.Thread(target=self._handle, args=(sock,), daemon=True).start()
+
+    def _handle(self, sock):
+        """Answer the requests of a connection."""
+        config = h2.config.H2Configuration(client_side=False)
+        conn = h2.connection.H2Connection(config=config)
+        conn.initiate_connection()
+        with sock:
+            sock.sendall(conn.data_to_send())
+            while True:
+                data = sock.recv(65535)
+                if not data:
+                    return
+                for event in conn.receive_data(data):
+                    if isinstance(event, h2.events.RequestReceived):
+                        self._respond(conn, event)
+                sock.sendall(conn.data_to_send())
+
+    def _respond(self, conn, event):
+        """Answer a request with the record of its path."""
+        with self._lock:
+            self.streams += 1
+        path = dict(event.headers)[b":path"].decode()
+        body = json.dumps({"id": path.rsplit("/", 1)[1]}).encode()
+        headers = [
+            (":status", "200"),
+            ("content-type", "application/json"),
+            ("content-length", str(len(body))),
+        ]
+        conn.send_headers(event.stream_id, headers)
+        conn.send_data(event.stream_id, body, end_stream=True)
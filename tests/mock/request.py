@@ -7,6 +7,7 @@
 """Mock requests module for inveniordm-py tests."""
 
 from unittest.mock import MagicMock
+from urllib.parse import parse_qsl, urlsplit
 
 
 class MockRequest(MagicMock):
@@ -22,3 +23,7 @@ class MockRequest(MagicMock):
         self.data = kwargs.get("data") or {}
         self.url = kwargs.get("url") or ""
         self.method = kwargs.get("method") or ""
+        self.query = {
+            **dict(parse_qsl(urlsplit(self.url).query)),
+            **(kwargs.get("params") or {}),
+        }
@@ -9,13 +9,20 @@
 import re
 from unittest.mock import MagicMock
 
-from .handlers import DraftFileHandler, DraftFilesHandler, RecordsListHandler
+from .handlers import (
+    DraftFileContentHandler,
+    DraftFileHandler,
+    DraftFilesHandler,
+    RecordsListHandler,
+)
 
 
 class MockResponse(MagicMock):
     """Mocked HTTP response.""" ""
 
     HANDLERS = {
+        r"records/[0-9]+/draft/files/[^/]+/content": DraftFileContentHandler,
+        r"records/[0-9]+/draft/files/[^/]+/commit": DraftFileHandler,
         r"records/[0-9]+/draft/files": DraftFilesHandler,
         r"records/[0-9]+/draft/files/filename": DraftFileHandler,
         r"records": RecordsListHandler,
@@ -6,8 +6,16 @@
 # it under the terms of the MIT License; see LICENSE file for more details.
 """Mock session."""
 
-from unittest.mock import MagicMock
+import datetime
+import hashlib
+import json
+import re
+from unittest.mock import MagicMock, Mock
 
+import requests
+from requests import HTTPError
+
+from .handlers import PartitionedRecordsHandler
 from .request import MockRequest
 from .response import MockResponse
 
@@ -40,7 +48,319 @@ class MockSession(MagicMock):
         req = MockRequest(
             data=kwargs.get("data"),
             headers=kwargs.get("headers"),
+            params=kwargs.get("params"),
             url=args[0],
             method="GET",
         )
         return MockResponse(request=req)
+
+
+class FakeSession(MockSession):
+    """Base of the sessions answering requests with purpose-built responses.
+
+    Subclasses implement the HTTP methods they need, the other attributes are
+    plain mocks.
+    """
+
+    def __init__(self):
+        """Constructor."""
+        super().__init__()
+        self.headers = {}
+
+    def _get_child_mock(self, **kwargs):
+        """Create the attributes of the session as plain mocks."""
+        return MagicMock(**kwargs)
+
+    def response(self, status=200, body=None, content=None, headers=None):
+        """Create a response with a JSON body, raising on error statuses."""
+        if content is None and body is not None:
+            content = json.dumps(body).encode()
+        response = Mock(status_code=status, headers=headers or {}, content=content)
+        response.json.side_effect = lambda: json.loads(content)
+        if status >= 400:
+            response.raise_for_status.side_effect = HTTPError(status, response=response)
+        return response
+
+
+class PartitionedSession(FakeSession):
+    """Session searching records by creation date, with a result window."""
+
+    def __init__(self, records):
+        """Constructor."""
+        super().__init__()
+        self.handler = PartitionedRecordsHandler(records)
+        self.records = records
+
+    def get(self, url, params=None, headers=None, **kwargs):
+        """Search the records."""
+        request = MockRequest(url=url, params=params, method="GET")
+        return self.response(body=self.handler.handle(request))
+
+
+class GetManySession(FakeSession):
+    """Session searching records by ID, some of them not being indexed."""
+
+    def __init__(self, indexed, restricted, failing=()):
+        """Constructor.
+
+        :param failing: IDs whose searches and gets fail with a server error.
+        """
+        super().__init__()
+        self.indexed = indexed
+        self.restricted = restricted
+        self.failing = set(failing)
+        self.queries = []
+        self.gets = []
+
+    def get(self, url, params=None, headers=None, **kwargs):
+        """Search records by ID, or get a record."""
+        if params:
+            self.queries.append(params["q"])
+            ids = re.findall(r'"(.*?)"', params["q"])
+            if self.failing.intersection(ids):
+                return self.response(500, body={})
+            hits = [{"id": id_} for id_ in ids if id_ in self.indexed]
+            body = {"hits": {"hits": hits, "total": len(hits)}, "aggregations": {}}
+            return self.response(body=body)
+        id_ = url.rsplit("/", 1)[1]
+        self.gets.append(id_)
+        if id_ in self.failing:
+            return self.response(500, body={})
+        if id_ in self.restricted:
+            return self.response(body={"id": id_})
+        return self.response(404, body={})
+
+
+class ContentSession(FakeSession):
+    """Session serving the metadata and contents of a file."""
+
+    def __init__(self, content):
+        """Constructor."""
+        super().__init__()
+        self.content = content
+        self.checksum = "md5:" + hashlib.md5(content).hexdigest()
+        self.requests = []
+        self.ranges = True
+        self.size = True
+        self.fail_ranges = set()
+
+    def get(self, url, headers=None, params=None, stream=False, **kwargs):
+        """Serve the file metadata or (a byte range of the) contents."""
+        range_ = (headers or {}).get("range") if self.ranges else None
+        self.requests.append((url, stream, range_))
+        if url.endswith("/content"):
+            content, status_code = self.content, 200
+            response_headers = {"Content-Length": str(len(content))}
+            if range_:
+                start, end = map(int, range_[len("bytes=") :].split("-"))
+                if start in self.fail_ranges:
+                    self.fail_ranges.remove(start)
+                    raise requests.ConnectionError()
+                content, status_code = self.content[start : end + 1], 206
+                response_headers = {
+                    "Content-Range": f"bytes {start}-{end}/{len(self.content)}"
+                }
+
+            def iter_content(chunk_size):
+                for i in range(0, len(content), chunk_size):
+                    yield content[i : i + chunk_size]
+
+            return Mock(
+                iter_content=iter_content,
+                status_code=status_code,
+                headers=response_headers,
+            )
+        body = {"key": "data.bin", "checksum": self.checksum}
+        if self.size:
+            body["size"] = len(self.content)
+        return self.response(body=body)
+
+
+class UploadSession(ContentSession):
+    """Session recording the uploaded contents."""
+
+    def __init__(self):
+        """Constructor."""
+        super().__init__(b"")
+        self.uploads = []
+
+    def put(self, url, data=None, headers=None, **kwargs):
+        """Consume the uploaded data like ``requests`` does."""
+        prepared = requests.Request("PUT", url, data=data).prepare()
+        if hasattr(data, "read"):
+            body = data.read()
+        elif isinstance(data, (bytes, memoryview)):
+            body = bytes(data)
+        else:
+            body = b"".join(data)
+        self.uploads.append((body, prepared.headers.get("Content-Length")))
+        return self.response(body={"key": "data.bin", "status": "pending"})
+
+
+class MultipartSession(ContentSession):
+    """Session implementing the multipart file transfer."""
+
+    def __init__(self, fail_parts=(), fail_statuses=None, fail_headers=None):
+        """Constructor."""
+        super().__init__(b"")
+        self.parts = {}
+        self.init = None
+        self.committed = False
+        self.fail_parts = set(fail_parts)
+        self.fail_statuses = dict(fail_statuses or {})
+        self.fail_headers = fail_headers
+        self.attempts = {}
+
+    def post(self, url, data=None, headers=None, **kwargs):
+        """Initialize or commit the multipart transfer."""
+        if url.endswith("/commit"):
+            self.committed = True
+            return self.response(body={"key": "data.bin", "status": "completed"})
+        self.init = json.loads(data)
+        entries = [
+            {
+                **entry,
+                "links": {
+                    "parts": [
+                        {"part": p, "url": f"https://storage/part/{p}"}
+                        for p in range(1, entry["transfer"]["parts"] + 1)
+                    ]
+                },
+            }
+            for entry in self.init
+        ]
+        return self.response(body={"entries": entries})
+
+    def put(self, url, data=None, headers=None, **kwargs):
+        """Upload a part."""
+        part = int(url.rsplit("/", 1)[1])
+        body = data.read() if hasattr(data, "read") else bytes(data)
+        assert len(body) == len(data)
+        assert headers["Authorization"] is None
+        self.attempts[part] = self.attempts.get(part, 0) + 1
+        if part in self.fail_parts:
+            self.fail_parts.remove(part)
+            raise requests.ConnectionError()
+        if part in self.fail_statuses:
+            status = self.fail_statuses.pop(part)
+            return self.response(status, body={}, headers=self.fail_headers)
+        self.parts[part] = body
+        return self.response(body={})
+
+
+class ThrottlingSession(FakeSession):
+    """Session answering with queued statuses and headers, then 200."""
+
+    def __init__(self, responses=()):
+        """Constructor."""
+        super().__init__()
+        self.responses = list(responses)
+        self.calls = []
+
+    def get(self, url, **kwargs):
+        """Answer a request."""
+        self.calls.append(("GET", url))
+        status, headers = self.responses.pop(0) if self.responses else (200, {})
+        return self.response(status, body={"id": "1234", "links": {}}, headers=headers)
+
+    post = put = delete = get
+
+
+class ETagSession(FakeSession):
+    """Session serving drafts with ETags."""
+
+    def __init__(self):
+        """Constructor."""
+        super().__init__()
+        self.revisions = {}
+        self.statuses = []
+
+    def _respond(self, status, content=b"", headers=None):
+        """Create a response, recording its status."""
+        self.statuses.append(status)
+        return self.response(status, content=content, headers=headers)
+
+    def get(self, url, headers=None, **kwargs):
+        """Answer a GET request, with 304 if the ETag matches."""
+        id_ = url.split("/")[4]
+        revision = self.revisions.setdefault(id_, 1)
+        etag = f'"{revision}"'
+        if headers.get("If-None-Match") == etag:
+            return self._respond(304)
+        data = {"id": id_, "revision_id": revision, "accept": headers["accept"]}
+        return self._respond(200, json.dumps(data).encode(), {"ETag": etag})
+
+    def put(self, url, headers=None, data=None, **kwargs):
+        """Update a draft, changing its ETag."""
+        id_ = url.split("/")[4]
+        self.revisions[id_] = self.revisions.get(id_, 1) + 1
+        return self._respond(200, data.encode())
+
+    def post(self, url, headers=None, data=None, **kwargs):
+        """Create a draft, or update one."""
+        if url.endswith("/records"):
+            return self._respond(201, data.encode())
+        return self.put(url, headers=headers, data=data, **kwargs)
+
+
+class EchoSession(FakeSession):
+    """Session echoing the request bodies, after queued statuses."""
+
+    def __init__(self, statuses=()):
+        """Constructor."""
+        super().__init__()
+        self.statuses = list(statuses)
+
+    def get(self, url, data=None, **kwargs):
+        """Answer a request."""
+        if url.endswith("/broken"):
+            raise requests.ConnectionError("broken")
+        status = self.statuses.pop(0) if self.statuses else 200
+        content = data.encode() if data else b'{"id": "1234", "links": {}}'
+        response = self.response(status, content=content)
+        response.elapsed = datetime.timedelta(milliseconds=5)
+        return response
+
+    post = put = delete = get
+
+
+class BytesSession(FakeSession):
+    """Session echoing the request bodies, whose responses have no ``json()``."""
+
+    def __init__(self):
+        """Constructor."""
+        super().__init__()
+        self.bodies = []
+
+    def post(self, url, data=None, headers=None, **kwargs):
+        """Echo the request body."""
+        self.bodies.append(data)
+        response = self.response(
+            content=data if isinstance(data, bytes) else data.encode()
+        )
+        response.json.side_effect = AssertionError("The body is decoded as text")
+        return response
+
+    get = put = post
+
+
+class StreamingSession(FakeSession):
+    """Session streaming a search response in small chunks."""
+
+    def __init__(self, body, chunk_size=10):
+        """Constructor."""
+        super().__init__()
+        self.body = body
+        self.chunk_size = chunk_size
+        self.closed = 0
+
+    def get(self, url, params=None, headers=None, stream=False, **kwargs):
+        """Stream the body."""
+        assert stream
+        body, size = self.body, self.chunk_size
+        response = Mock()
+        response.iter_content = lambda chunk_size: (
+            body[i : i + size] for i in range(0, len(body), size)
+        )
+        response.close = lambda: setattr(self, "closed", self.closed + 1)
+        return response
@@ -0,0 +1,414 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# inveniordm-py is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+"""Test the asynchronous client."""
+
+import asyncio
+import io
+import os
+import threading
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from inveniordm_py.aio.concurrency import bulk_map
+from inveniordm_py.aio.records import AsyncDraft, AsyncDraftFile, AsyncRecord
+from inveniordm_py.files.metadata import FilesListMetadata, OutgoingStream
+from inveniordm_py.records.metadata import DraftMetadata, RecordMetadata
+from inveniordm_py.testing import AsyncWSGITransport, FakeInvenioRDM
+
+from .mock.data import dates
+
+
+class Transport(AsyncWSGITransport):
+    """Transport to the fake InvenioRDM, recording the requests.
+
+    :attr errors: statuses answered instead of the app to the next request
+        of each path.
+    :attr ranges: whether the range requests are honoured.
+    """
+
+    def __init__(self, app):
+        """Constructor."""
+        super().__init__(app)
+        self.requests = []
+        self.errors = {}
+        self.ranges = True
+
+    async def handle_async_request(self, request):
+        """Record a request, and answer it with an injected error if any."""
+        self.requests.append(request)
+        if not self.ranges:
+            request.headers.pop("range", None)
+        status = self.errors.pop(request.url.path, None)
+        if status is not None:
+            return httpx.Response(status, json={"status": status})
+        return await super().handle_async_request(request)
+
+    def sent(self, method, path):
+        """Requests sent with a method to a path (under the API)."""
+        return [
+            r
+            for r in self.requests
+            if r.method == method and r.url.path == f"/api{path}"
+        ]
+
+
+@pytest.fixture()
+def app():
+    """Fake InvenioRDM, whose multipart parts are uploaded to a storage."""
+    return FakeInvenioRDM(seed=1, storage_url="https://storage.test/api")
+
+
+@pytest.fixture()
+def transport(app):
+    """Recording transport to the fake InvenioRDM."""
+    return Transport(app)
+
+
+def run(coro):
+    """Run a coroutine to completion."""
+    return asyncio.run(coro)
+
+
+def create_draft(app):
+    """Create a draft with the synchronous client, returning its ID."""
+    draft = app.client().records.create(DraftMetadata(metadata={"title": "Test"}))
+    return draft.data["id"]
+
+
+def publish_file(app, content, key="a.bin"):
+    """Publish a record with a file, returning the ID of the record."""
+    draft = app.client().records.create(DraftMetadata(metadata={"title": "Test"}))
+    draft.files.create(FilesListMetadata([{"key": key}]))
+    draft.files(key).set_contents(content)
+    draft.files(key).commit()
+    return draft.publish().data["id"]
+
+
+def test_async_deposit_workflow(app):
+    """Test creating, uploading to and publishing a draft."""
+
+    async def deposit():
+        async with app.async_client() as api:
+            draft = await api.records.create(DraftMetadata(metadata={"title": "T"}))
+            assert isinstance(draft, AsyncDraft)
+            assert draft.data["metadata"]["title"] == "T"
+
+            await draft.files.create(FilesListMetadata([{"key": "a.txt"}]))
+            await draft.files("a.txt").set_contents(memoryview(b"data"))
+            await draft.files("a.txt").commit()
+            files = [f async for f in draft.files]
+            assert len(files) == 1 and isinstance(files[0], AsyncDraftFile)
+
+            record = await draft.publish()
+            assert isinstance(record, AsyncRecord)
+            assert isinstance(record.data, RecordMetadata)
+            content = record.files("a.txt").iter_content()
+            return record, b"".join([c async for c in content])
+
+    record, content = run(deposit())
+    assert content == b"data"
+    assert record.data["id"] in app.records
+
+
+def test_async_set_contents(app, transport, tmp_path):
+    """Test uploading paths, file objects and generators."""
+    content = bytes(range(256)) * 10000
+    path = tmp_path / "data.bin"
+    path.write_bytes(content)
+    id_ = create_draft(app)
+    keys = ("path.bin", "file.bin", "gen.bin")
+
+    async def upload():
+        async with app.async_client(transport=transport) as api:
+            files = api.records(id_).draft.files
+            await files.create(FilesListMetadata([{"key": k} for k in keys]))
+            await files("path.bin").set_contents(str(path))
+            with open(path, "rb") as fp:
+                await files("file.bin").set_contents(OutgoingStream(data=fp))
+            await files("gen.bin").set_contents(
+                content[i : i + 1000] for i in range(0, len(content), 1000)
+            )
+
+    run(upload())
+    entries = app.files[id_, "draft"]
+    for key in keys:
+        assert entries[key]["_content"] == content
+
+    def headers(key):
+        path = f"/records/{id_}/draft/files/{key}/content"
+        return transport.sent("PUT", path)[0].headers
+
+    assert headers("path.bin")["content-length"] == str(len(content))
+    assert headers("file.bin")["content-length"] == str(len(content))
+    assert headers("gen.bin")["transfer-encoding"] == "chunked"
+
+
+def test_async_set_contents_off_loop(app):
+    """Test upload bodies are read outside of the event loop thread."""
+    threads = []
+
+    class File(io.BytesIO):
+        def read(self, size=-1):
+            threads.append(threading.current_thread())
+            return super().read(size)
+
+    def chunks():
+        for _ in range(3):
+            threads.append(threading.current_thread())
+            yield b"data"
+
+    id_ = create_draft(app)
+
+    async def upload():
+        async with app.async_client() as api:
+            files = api.records(id_).draft.files
+            await files.create(FilesListMetadata([{"key": "a"}, {"key": "b"}]))
+            await files("a").set_contents(OutgoingStream(data=File(b"data" * 3)))
+            await files("b").set_contents(chunks())
+            return threading.current_thread()
+
+    loop_thread = run(upload())
+    assert app.files[id_, "draft"]["a"]["_content"] == b"data" * 3
+    assert app.files[id_, "draft"]["b"]["_content"] == b"data" * 3
+    assert threads and loop_thread not in threads
+
+
+@pytest.mark.parametrize("as_path", [True, False])
+def test_async_upload_multipart(app, transport, tmp_path, monkeypatch, as_path):
+    """Test uploading a file in parts, retrying the server errors only."""
+
+    async def sleep(delay):
+        pass
+
+    monkeypatch.setattr("asyncio.sleep", sleep)
+    content = os.urandom(10 * 1000 + 1)
+    path = tmp_path / "data.bin"
+    path.write_bytes(content)
+    id_ = create_draft(app)
+    base = f"/api/records/{id_}/draft/files/data.bin"
+    transport.errors[f"{base}/content/2"] = 503
+
+    async def upload():
+        async with app.async_client(transport=transport) as api:
+            f = api.records(id_).draft.files("data.bin")
+            data = path if as_path else content
+            return await f.upload_multipart(data, part_size=1000, max_workers=3)
+
+    run(upload())
+    assert app.files[id_, "draft"]["data.bin"]["_content"] == content
+    parts = [r for r in transport.requests if r.url.path.startswith(f"{base}/content/")]
+    assert len(parts) == 12
+    # The token is only sent to the API, not to the storage.
+    for request in transport.requests:
+        on_storage = request.url.host == "storage.test"
+        assert on_storage == (request in parts)
+        assert ("authorization" in request.headers) != on_storage
+
+    transport.requests = []
+    transport.errors[f"{base}/content/3"] = 403
+    with pytest.raises(httpx.HTTPStatusError):
+        run(upload())
+    assert len([r for r in transport.requests if r.url.path.endswith("/3")]) == 1
+
+
+def test_async_search_and_concurrent_get(app):
+    """Test concurrent record fetches over the same connection pool."""
+    ids = [r["id"] for r in app.populate(20, created=dates)]
+
+    async def fetch():
+        async with app.async_client(max_connections=5) as api:
+            results = await asyncio.gather(*(api.records(id_).get() for id_ in ids))
+            page = await api.records.search(size=50)
+            return results, page
+
+    results, page = run(fetch())
+    assert [r.data["id"] for r in results] == ids
+    assert len(page) == 20
+    assert all(isinstance(r, AsyncRecord) for r in page)
+
+
+def test_async_scan(app):
+    """Test iterating over all the pages of a search."""
+    ids = [r["id"] for r in app.populate(25, created=dates)]
+
+    async def scan():
+        async with app.async_client() as api:
+            return [r async for r in api.records.scan(size=10, sort="oldest")]
+
+    records = run(scan())
+    assert [r.data["id"] for r in records] == ids
+    assert all(isinstance(r, AsyncRecord) for r in records)
+
+
+def test_async_download_to(app, tmp_path):
+    """Test streaming a file to disk."""
+    content = bytes(range(256)) * 1000
+    id_ = publish_file(app, content)
+
+    async def download():
+        async with app.async_client() as api:
+            f = api.records(id_).files("a.bin")
+            chunks = [c async for c in f.iter_content(chunk_size=1000)]
+            assert b"".join(chunks) == content
+            return await f.download_to(tmp_path / "a.bin")
+
+    path = run(download())
+    assert path.read_bytes() == content
+
+
+@pytest.mark.parametrize("ranges", [True, False])
+def test_async_download_segmented(app, transport, tmp_path, ranges):
+    """Test downloading a file in byte ranges, sized by its Content-Range."""
+    content = bytes(range(256)) * 1000
+    id_ = publish_file(app, content)
+    # The size of the file is taken from the Content-Range of a range request.
+    del app.files[id_, "record"]["a.bin"]["size"]
+    transport.ranges = ranges
+    # State of a previous download, with another segment size.
+    (tmp_path / "a.bin.segments").write_text('{"done": [0]}')
+
+    async def download():
+        async with app.async_client(transport=transport) as api:
+            f = api.records(id_).files("a.bin")
+            return await f.download_segmented(
+                tmp_path / "a.bin", segment_size=100000, max_workers=2
+            )
+
+    path = run(download())
+    assert path.read_bytes() == content
+    assert not (tmp_path / "a.bin.segments").exists()
+    assert not (tmp_path / "a.bin.part").exists()
+    if ranges:
+        requests = transport.sent("GET", f"/records/{id_}/files/a.bin/content")
+        assert sorted(r.headers["range"] for r in requests) == [
+            "bytes=0-0",
+            "bytes=0-99999",
+            "bytes=100000-199999",
+            "bytes=200000-255999",
+        ]
+
+
+def test_async_bulk_create(app):
+    """Test creating drafts concurrently."""
+
+    async def create():
+        async with app.async_client() as api:
+            items = [{"metadata": {"title": f"{i}"}} for i in range(10)]
+            return [r async for r in api.records.bulk_create(items, concurrency=3)]
+
+    results = run(create())
+    titles = [r.result.data["metadata"]["title"] for r in results]
+    assert titles == [f"{i}" for i in range(10)]
+    assert len(app.drafts) == 10
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_async_bulk_map_window(ordered):
+    """Test the items in flight and processed at a time are bounded."""
+    consumed, running, max_running = [], [0], [0]
+
+    def items():
+        for i in range(20):
+            consumed.append(i)
+            yield i
+
+    async def func(item):
+        running[0] += 1
+        max_running[0] = max(max_running[0], running[0])
+        await asyncio.sleep(0.001)
+        running[0] -= 1
+        return item
+
+    async def first():
+        results = bulk_map(func, items(), max_workers=3, ordered=ordered)
+        result = await results.__anext__()
+        await results.aclose()
+        return result
+
+    run(first())
+    assert len(consumed) == 6
+    assert max_running[0] == 3
+
+
+def test_async_raise_on_error(app):
+    """Test that HTTP errors are raised."""
+
+    async def fetch():
+        async with app.async_client() as api:
+            await api.records("missing").get()
+
+    with pytest.raises(httpx.HTTPStatusError):
+        run(fetch())
+
+
+def test_async_get_many(app, transport):
+    """Test getting many records by ID."""
+    ids = [r["id"] for r in app.populate(10, created=dates)]
+    app.records[ids[5]]["access"]["record"] = "restricted"
+    transport.errors["/api/records/e"] = 500
+
+    async def get_many():
+        async with app.async_client(transport=transport) as api:
+            return await api.records.get_many(
+                [ids[3], ids[5], "x", "e", ids[7]], chunk_size=2
+            )
+
+    records = run(get_many())
+    assert list(records) == [ids[3], ids[5], "x", "e", ids[7]]
+    assert records["x"] is None
+    assert records.missing == ["x", "e"]
+    assert list(records.errors) == ["e"]
+    assert records.errors["e"].response.status_code == 500
+    assert all(isinstance(records[id_], AsyncRecord) for id_ in ids[3:8:2])
+    assert records[ids[5]].data["id"] == ids[5]
+
+
+def test_async_sync(app, tmp_path):
+    """Test harvesting the records changed since the last sync."""
+    records = app.populate(12, created=dates, updated=dates)
+    checkpoint = str(tmp_path / "records.checkpoint")
+
+    async def sync():
+        async with app.async_client() as api:
+            return [r async for r in api.records.sync(checkpoint, size=4)]
+
+    harvested = run(sync())
+    assert sorted(r.data["id"] for r in harvested) == sorted(app.records)
+    assert all(isinstance(r, AsyncRecord) for r in harvested)
+    assert run(sync()) == []
+
+    app.update_record(records[3]["id"], metadata={"title": "Changed"})
+    assert [r.data["id"] for r in run(sync())] == [records[3]["id"]]
+
+
+def test_async_export(app, tmp_path):
+    """Test exports are refused by the async client."""
+    app.populate(3, created=dates)
+    with pytest.raises(TypeError, match="export"):
+        app.async_client().records.export("", str(tmp_path / "records.jsonl"))
+    assert not (tmp_path / "records.jsonl").exists()
+
+
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_async_deep_scan(max_workers):
+    """Test scanning beyond the result window, without duplicates or gaps."""
+    app = FakeInvenioRDM(max_result_window=20, seed=1)
+    ids = [r["id"] for r in app.populate(60, created=dates)]
+
+    async def deep_scan(q=""):
+        async with app.async_client() as api:
+            records = api.records.deep_scan(
+                q=q, size=5, partition_size=10, max_workers=max_workers
+            )
+            return [r async for r in records]
+
+    records = run(deep_scan())
+    assert sorted(r.data["id"] for r in records) == sorted(ids)
+    assert all(isinstance(r, AsyncRecord) for r in records)
+    assert run(deep_scan(q="NOT metadata.title:*")) == []
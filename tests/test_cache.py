@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# inveniordm-py is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+"""Test the HTTP cache."""
+
+from inveniordm_py import InvenioAPI
+from inveniordm_py.cache import CacheEntry, HTTPCache, MemoryBackend, SQLiteBackend
+from inveniordm_py.records.metadata import DraftMetadata, RecordMetadata
+
+from .mock.session import ETagSession
+
+
+def test_conditional_get(base_url, token):
+    """Test unchanged resources are served from the cache."""
+    session = ETagSession()
+    cache = HTTPCache(ttls={"draft": 0})
+    client = InvenioAPI(base_url, token, session=session, cache=cache)
+
+    draft = client.records("1234").draft.get()
+    assert session.statuses == [200]
+    again = client.records("1234").draft.get()
+    assert session.statuses == [200, 304]
+    assert isinstance(again.data, DraftMetadata)
+    assert again.data == draft.data
+    # The metadata decoded from the cache entry are reused.
+    assert client.records("1234").draft.get().data is again.data
+    assert session.statuses == [200, 304, 304]
+
+    # Records and drafts are cached separately, by URL and accept header.
+    record = client.records("1234").get()
+    assert isinstance(record.data, RecordMetadata)
+    assert record.data["accept"] == RecordMetadata.accept
+    assert len(client.cache) == 2
+    assert (cache.stats.hits, cache.stats.revalidated, cache.stats.misses) == (0, 2, 2)
+
+
+def test_invalidation(base_url, token):
+    """Test writes invalidate the cached responses of the record."""
+    session = ETagSession()
+    client = InvenioAPI(base_url, token, session=session, cache=HTTPCache())
+
+    draft = client.records("1234").draft.get()
+    client.records("1234").get()
+    client.records("5678").get()
+    client.records("12345").get()
+    assert len(client.cache) == 4
+
+    # Only the URLs of the record are invalidated, not those sharing a prefix.
+    draft.update(DraftMetadata(id="1234", title="Updated"))
+    assert len(client.cache) == 2
+    assert client.records("1234").draft.get().data["revision_id"] == 2
+    assert session.statuses[-1] == 200
+
+
+def test_collection_invalidation(base_url, token, tmp_path):
+    """Test writes to a collection do not invalidate the records below it."""
+    for backend in (MemoryBackend(), SQLiteBackend(tmp_path / "cache.db")):
+        session = ETagSession()
+        cache = HTTPCache(backend, ttls={"record": None})
+        client = InvenioAPI(base_url, token, session=session, cache=cache)
+        for id_ in ("1234", "5678", "9012"):
+            client.records(id_).get()
+        search = (f"{base_url}/records?q=test", "")
+        backend.set(search, CacheEntry(search[0], b"{}"))
+        assert len(cache) == 4
+
+        client.records.create(DraftMetadata(title="New"))
+        assert len(cache) == 3
+        assert cache.get(search) is None
+
+
+def test_ttl(base_url, token):
+    """Test fresh responses are served without requests."""
+    session = ETagSession()
+    cache = HTTPCache(ttls={"draft": 60})
+    client = InvenioAPI(base_url, token, session=session, cache=cache)
+
+    assert cache.ttls["record"] == 300
+    for _ in range(3):
+        client.records("1234").get()
+        client.records("1234").draft.get()
+    assert session.statuses == [200, 200]
+    assert cache.stats.hits == 4
+    assert cache.stats.hit_rate == 4 / 6
+
+    entry = cache.get(cache.key(f"{base_url}/records/1234/draft", {"accept": ""}))
+    assert entry is None
+    key = cache.key(f"{base_url}/records/1234/draft", {"accept": DraftMetadata.accept})
+    entry = cache.get(key)
+    entry.expires = 0
+    cache.backend.set(key, entry)
+    client.records("1234").draft.get()
+    assert session.statuses[-1] == 304
+    assert cache.get(key).fresh
+
+
+def test_sqlite_backend(base_url, token, tmp_path):
+    """Test the SQLite backend persists responses across clients."""
+    path = tmp_path / "cache.db"
+    session = ETagSession()
+    client = InvenioAPI(
+        base_url, token, session=session, cache=HTTPCache(SQLiteBackend(path))
+    )
+    client.records("1234").get()
+    client.records("5678").draft.get()
+    client.cache.backend.close()
+
+    cache = HTTPCache(SQLiteBackend(path))
+    client = InvenioAPI(base_url, token, session=session, cache=cache)
+    assert len(cache) == 2
+    assert client.records("1234").get().data["id"] == "1234"
+    assert session.statuses == [200, 200]
+    assert cache.stats.hits == 1
+
+    client.records("12345").get()
+    cache.invalidate(f"{base_url}/records/1234/draft/actions/publish")
+    assert len(cache) == 2
+    backend = SQLiteBackend(tmp_path / "small.db", max_entries=2)
+    for key in "abc":
+        backend.set((key, ""), CacheEntry(key, b"{}"))
+    assert len(backend) == 2
+    assert backend.get(("a", "")) is None
+
+
+def test_eviction():
+    """Test the cache is bounded by entries and bytes."""
+    cache = MemoryBackend(max_entries=2, max_bytes=10)
+    cache.set(("a", ""), CacheEntry("a", b"1234", etag="a"))
+    cache.set(("b", ""), CacheEntry("b", b"1234", etag="b"))
+    cache.get(("a", ""))
+    cache.set(("c", ""), CacheEntry("c", b"1234", etag="c"))
+    assert cache.get(("b", "")) is None
+    assert cache.size == 8
+
+    cache.set(("d", ""), CacheEntry("d", b"123456", etag="d"))
+    assert cache.get(("a", "")) is None
+    assert cache.size == 10
+    cache.set(("e", ""), CacheEntry("e", b"x" * 11, etag="e"))
+    assert cache.get(("e", "")) is None
+    assert HTTPCache().conditional_headers(cache.get(("d", ""))) == {
+        "If-None-Match": "d"
+    }
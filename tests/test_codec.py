@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# inveniordm-py is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+"""Test the JSON codecs."""
+
+import json
+
+import pytest
+
+from inveniordm_py import InvenioAPI
+from inveniordm_py.codec import JSONCodec, OrjsonCodec, codecs, get_codec
+from inveniordm_py.records.metadata import DraftMetadata, RecordCommunityMetadata
+
+from .mock.session import BytesSession
+
+
+def test_get_codec():
+    """Test getting codecs by name."""
+    assert isinstance(get_codec(), JSONCodec)
+    codec = OrjsonCodec()
+    assert get_codec(codec) is codec
+    auto = get_codec("auto")
+    assert auto.name == next(name for name, (_, m) in codecs.items() if m)
+    with pytest.raises(ValueError):
+        get_codec("yaml")
+
+
+def test_orjson_codec(base_url, token, minimal_record):
+    """Test bodies are encoded and decoded with the codec of the client."""
+    pytest.importorskip("orjson")
+    session = BytesSession()
+    client = InvenioAPI(base_url, token, session=session, codec="orjson")
+
+    draft = client.records.create(DraftMetadata(id="1234", **minimal_record))
+    assert isinstance(session.bodies[0], bytes)
+    assert json.loads(session.bodies[0]) == {"id": "1234", **minimal_record}
+    assert draft.data["metadata"]["title"] == "A Romans story"
+
+    client.lazy_metadata = True
+    draft = client.records.create(DraftMetadata(id="1234", **minimal_record))
+    assert draft.data._codec is client.codec
+    assert draft.data["id"] == "1234"
+
+
+def test_community_metadata_codec():
+    """Test community requests are encoded with the given codec."""
+    pytest.importorskip("orjson")
+    data = RecordCommunityMetadata(communities=["a", "b"])
+    expected = {"communities": [{"id": "a"}, {"id": "b"}]}
+    assert json.loads(data.to_request()) == expected
+    assert json.loads(data.to_request(codec=OrjsonCodec())) == expected
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# inveniordm-py is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+"""Test the export of search results."""
+
+import gzip
+import json
+
+import pytest
+import requests
+
+from inveniordm_py.records.resources import RecordList
+from inveniordm_py.testing import FakeInvenioRDM
+
+from .mock.data import dates
+
+
+@pytest.fixture()
+def app():
+    """Fake InvenioRDM with 25 records."""
+    app = FakeInvenioRDM(max_result_window=10, seed=1)
+    app.populate(25, created=dates)
+    return app
+
+
+def read_ids(path):
+    """Read the IDs of the exported records."""
+    open_ = gzip.open if str(path).endswith(".gz") else open
+    with open_(path, "rb") as fp:
+        return [json.loads(line)["id"] for line in fp]
+
+
+@pytest.mark.parametrize("name", ["records.jsonl", "records.jsonl.gz"])
+def test_export(app, tmp_path, name):
+    """Test an export beyond the result window."""
+    path = tmp_path / name
+    client = app.client()
+    assert client.records.export("", path, size=4, partition_size=10) == 25
+    assert sorted(read_ids(path)) == sorted(app.records)
+    assert not (tmp_path / f"{name}.cursor").exists()
+
+    assert client.records.export("", path, size=4, partition_size=10) == 25
+    assert len(read_ids(path)) == 25
+
+
+def test_resume(app, tmp_path, monkeypatch):
+    """Test an interrupted export continues from the last exported page."""
+    path = tmp_path / "records.jsonl.gz"
+    client = app.client()
+    search = RecordList.search
+    pages = []
+
+    def failing_search(self, *args, stream=False, **kwargs):
+        if stream:
+            pages.append(kwargs["page"])
+            if len(pages) == 4:
+                raise requests.ConnectionError()
+        return search(self, *args, stream=stream, **kwargs)
+
+    monkeypatch.setattr(RecordList, "search", failing_search)
+    with pytest.raises(requests.ConnectionError):
+        client.records.export("", path, size=4, partition_size=10)
+    cursor = json.loads((tmp_path / "records.jsonl.gz.cursor").read_text())
+    assert 0 < cursor["count"] == len(read_ids(path)) < 25
+
+    # A partially written page is discarded.
+    with open(path, "ab") as fp:
+        fp.write(b"garbage")
+    assert client.records.export("", path, size=4, partition_size=10) == 25
+    assert sorted(read_ids(path)) == sorted(app.records)
+    assert pages[4] == cursor["page"]
+
+
+def test_corrupt_cursor(app, tmp_path):
+    """Test an export starts over if its cursor cannot be read."""
+    path = tmp_path / "records.jsonl"
+    path.write_bytes(b"garbage\n")
+    (tmp_path / "records.jsonl.cursor").write_text('{"partition": 1, "pa')
+    assert app.client().records.export("", path, size=4, partition_size=10) == 25
+    assert sorted(read_ids(path)) == sorted(app.records)
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# inveniordm-py is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+"""Test the fake InvenioRDM."""
+
+import time
+
+import pytest
+import requests
+
+from inveniordm_py import InvenioAPI
+from inveniordm_py.files.metadata import FilesListMetadata
+from inveniordm_py.ratelimit import RateLimiter
+from inveniordm_py.records.metadata import DraftMetadata
+from inveniordm_py.testing import Conditions, FakeInvenioRDM, LocalServer
+from inveniordm_py.testing.search import Query
+
+from .mock.data import dates
+
+
+def test_deposit(minimal_record):
+    """Test the deposit workflow, without sockets."""
+    app = FakeInvenioRDM(seed=1)
+    client = app.client()
+
+    draft = client.records.create(DraftMetadata(**minimal_record))
+    draft.files.create(FilesListMetadata([{"key": "a.txt"}]))
+    with pytest.raises(requests.HTTPError) as e:
+        client.records(draft.data["id"]).draft.publish()
+    assert e.value.response.status_code == 400
+    draft.files("a.txt").set_contents(b"hello")
+    assert draft.files("a.txt").commit().data["checksum"].startswith("md5:")
+    record = draft.publish()
+    id_ = record.data["id"]
+    assert record.data["is_published"]
+    assert client.records(id_).get().data["metadata"] == minimal_record["metadata"]
+    assert b"".join(client.records(id_).files("a.txt").iter_content()) == b"hello"
+
+    new = client.records(id_).versions.create()
+    assert new.data["parent"] == record.data["parent"]
+    new.files.create(FilesListMetadata([{"key": "b.txt"}]))
+    new.files("b.txt").set_contents(iter([b"wo", b"rld"]))
+    new.files("b.txt").commit()
+    new.publish()
+    latest = client.records(id_).versions.latest()
+    assert latest.data["id"] == new.data["id"]
+    assert len(client.records(id_).versions.search()) == 2
+    assert client.records.search().total == 1
+
+    client.records(id_).communities.add(["c1", "c2"])
+    assert client.records(id_).communities.search().data.total == 2
+    assert app.stats["POST", "publish"] == 3
+
+
+def test_search():
+    """Test searches, their pagination and result window."""
+    app = FakeInvenioRDM(max_result_window=20, seed=1)
+    records = app.populate(
+        30, created=dates, metadata=lambda i: {"title": f"Record {i % 3}"}
+    )
+    app.records[records[0]["id"]]["access"]["record"] = "restricted"
+    app.delete_record(records[1]["id"])
+    client = app.client()
+
+    assert client.records.search(q="metadata.title:record*").total == 28
+    assert client.records.search(q='metadata.title:"Record 2"').total == 10
+    assert client.records.search(q="NOT metadata.title:record*").total == 0
+    page = client.records.search(q='created:[* TO "2020-01-03"}', sort="oldest")
+    assert [r.data["created"][:10] for r in page] == ["2020-01-01", "2020-01-02"]
+    # Only the first 20 hits can be paginated.
+    assert len(list(client.records.scan(size=5))) == 20
+    with pytest.raises(requests.HTTPError):
+        client.records.search(page=3, size=10)
+    assert len(list(client.records.deep_scan(partition_size=5, size=5))) == 28
+
+    ids = [records[0]["id"], records[1]["id"], records[2]["id"]]
+    found = client.records.get_many(ids)
+    assert [r is not None for r in found.values()] == [True, False, True]
+    with pytest.raises(requests.HTTPError) as e:
+        client.records(records[1]["id"]).get()
+    assert e.value.response.status_code == 410
+
+
+def test_query():
+    """Test the evaluation of queries."""
+    doc = {"id": "a", "metadata": {"title": "Hello world", "n": [1, 5]}}
+    assert Query("").matches(doc)
+    assert Query('id:("b" OR "a")').matches(doc)
+    assert Query("hello AND id:a").matches(doc)
+    assert not Query("hello AND NOT id:a").matches(doc)
+    assert Query("metadata.n:[2 TO 5]").matches(doc)
+    assert not Query("metadata.n:{1 TO 5}").matches(doc)
+    with pytest.raises(ValueError):
+        Query("id:(a OR b")
+
+
+def test_conditions():
+    """Test the simulated latency, rate limits and errors."""
+    app = FakeInvenioRDM(conditions=Conditions(latency=0.01, rate_limit=10, burst=1))
+    (record,) = app.populate(1)
+    client = app.client(rate_limiter=RateLimiter(backoff=0.01))
+    start = time.monotonic()
+    for _ in range(3):
+        client.records(record["id"]).get()
+    # The throttled requests were retried after the Retry-After delay.
+    assert time.monotonic() - start >= 0.2
+    assert sum(app.stats.values()) == 3
+
+    app.conditions = Conditions(error_rate=1, error_statuses=[503])
+    with pytest.raises(requests.HTTPError) as e:
+        app.client().records(record["id"]).get()
+    assert e.value.response.status_code == 503
+
+
+def test_local_server(tmp_path):
+    """Test the fake InvenioRDM over HTTP."""
+    app = FakeInvenioRDM(conditions=Conditions(bandwidth=1024**2), seed=1)
+    with LocalServer(app) as server:
+        client = InvenioAPI(server.url, "token")
+        draft = client.records.create(DraftMetadata(metadata={"title": "Test"}))
+        file = draft.files("data.bin")
+        file.upload_multipart(bytes(range(256)) * 40, part_size=4096)
+        record = draft.publish()
+
+        path = tmp_path / "data.bin"
+        record.files("data.bin").download_segmented(path, segment_size=1000)
+        assert path.read_bytes() == bytes(range(256)) * 40
+        assert app.stats["GET", "read_record_content"] == 11
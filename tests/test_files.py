@@ -6,14 +6,25 @@
 # it under the terms of the MIT License; see LICENSE file for more details.
 """Test client for files."""
 
+import array
+import hashlib
+import json
+import mmap
+import os
 import tempfile
 
 import pytest
+import requests
 
+from inveniordm_py import InvenioAPI
+from inveniordm_py.errors import ChecksumError
 from inveniordm_py.files.metadata import FilesListMetadata, OutgoingStream
+from inveniordm_py.files.transfer import SegmentedDownload
 from inveniordm_py.records.metadata import DraftMetadata
 from inveniordm_py.records.resources import DraftFile, DraftFilesList
 
+from .mock.session import ContentSession, MultipartSession, UploadSession
+
 #
 # Test draft files list (/record/_id/drafts)
 #
@@ -75,3 +86,257 @@ def test_draft_files_delete(draft, tmp_file):
 #
 # Test record files
 #
+
+
+@pytest.fixture()
+def content_session():
+    """Session serving a file of 100 KB."""
+    return ContentSession(os.urandom(100 * 1024))
+
+
+def test_record_file_iter_content(base_url, token, content_session):
+    """Test iterating over the chunks of a file."""
+    client = InvenioAPI(base_url, token, session=content_session)
+    f = client.records("1").files("data.bin")
+    chunks = list(f.iter_content(chunk_size=4096))
+    assert max(len(c) for c in chunks) == 4096
+    assert b"".join(chunks) == content_session.content
+    assert content_session.requests == [(f.url("/content"), True, None)]
+
+
+def test_draft_file_download_to(base_url, token, content_session, tmp_path):
+    """Test downloading a file to disk, verifying its checksum."""
+    client = InvenioAPI(base_url, token, session=content_session)
+    f = DraftFile(client, id_="1", filename="data.bin")
+    path = f.download_to(tmp_path / "data.bin", chunk_size=1000)
+    assert path.read_bytes() == content_session.content
+
+
+def test_download_to_checksum_mismatch(base_url, token, content_session, tmp_path):
+    """Test downloading a file with a wrong checksum."""
+    content_session.checksum = "md5:" + hashlib.md5(b"other").hexdigest()
+    client = InvenioAPI(base_url, token, session=content_session)
+    f = client.records("1").files("data.bin")
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"previous")
+    with pytest.raises(ChecksumError):
+        f.download_to(path)
+    # The corrupt download does not replace the previous file.
+    assert path.read_bytes() == b"previous"
+    assert not (tmp_path / "data.bin.part").exists()
+    f.download_to(path, verify=False)
+    assert path.read_bytes() == content_session.content
+
+
+def test_download_segmented(base_url, token, content_session, tmp_path):
+    """Test downloading a file in byte ranges."""
+    client = InvenioAPI(base_url, token, session=content_session)
+    f = client.records("1").files("data.bin")
+    path = f.download_segmented(tmp_path / "data.bin", segment_size=30 * 1024)
+    assert path.read_bytes() == content_session.content
+    # The ranges are fetched concurrently, in any order.
+    assert sorted(r[2] for r in content_session.requests[1:]) == [
+        "bytes=0-30719",
+        "bytes=30720-61439",
+        "bytes=61440-92159",
+        "bytes=92160-102399",
+    ]
+    assert not os.path.exists(f"{path}.segments")
+
+
+def test_download_segmented_no_size(base_url, token, content_session, tmp_path):
+    """Test the size is taken from the Content-Range if not in the metadata."""
+    content_session.size = False
+    client = InvenioAPI(base_url, token, session=content_session)
+    f = client.records("1").files("data.bin")
+    path = f.download_segmented(tmp_path / "data.bin", segment_size=60 * 1024)
+    assert path.read_bytes() == content_session.content
+    assert sorted(r[2] for r in content_session.requests[1:]) == [
+        "bytes=0-0",
+        "bytes=0-61439",
+        "bytes=61440-102399",
+    ]
+
+
+def test_download_segmented_no_range(base_url, token, content_session, tmp_path):
+    """Test falling back to a single stream if ranges are not supported."""
+    content_session.ranges = False
+    # State of a previous download, with another segment size.
+    (tmp_path / "data.bin.segments").write_text(json.dumps({"done": [0]}))
+    client = InvenioAPI(base_url, token, session=content_session)
+    f = client.records("1").files("data.bin")
+    path = f.download_segmented(tmp_path / "data.bin", segment_size=30 * 1024)
+    assert path.read_bytes() == content_session.content
+    assert not (tmp_path / "data.bin.segments").exists()
+
+
+def test_download_segmented_fsync(
+    base_url, token, content_session, tmp_path, monkeypatch
+):
+    """Test the segments reach the disk before being recorded as done."""
+    events = []
+    part = tmp_path / "data.bin.part"
+    fsync, save_state = os.fsync, SegmentedDownload._save_state
+
+    def record_fsync(fd):
+        if os.fstat(fd).st_ino == part.stat().st_ino:
+            events.append("segment")
+        fsync(fd)
+
+    def record_save_state(self):
+        events.append("state")
+        save_state(self)
+
+    monkeypatch.setattr(os, "fsync", record_fsync)
+    monkeypatch.setattr(SegmentedDownload, "_save_state", record_save_state)
+    client = InvenioAPI(base_url, token, session=content_session)
+    f = client.records("1").files("data.bin")
+    f.download_segmented(tmp_path / "data.bin", segment_size=30 * 1024, max_workers=1)
+    assert events == ["segment", "state"] * 4
+
+
+def test_download_segmented_resume(base_url, token, content_session, tmp_path):
+    """Test resuming an interrupted download."""
+    path = tmp_path / "data.bin"
+    (tmp_path / "data.bin.part").write_bytes(content_session.content[: 50 * 1024])
+    state = {
+        "size": len(content_session.content),
+        "segment_size": 25 * 1024,
+        "checksum": content_session.checksum,
+        "done": [0, 1],
+    }
+    (tmp_path / "data.bin.segments").write_text(json.dumps(state))
+
+    client = InvenioAPI(base_url, token, session=content_session)
+    f = client.records("1").files("data.bin")
+    f.download_segmented(path, segment_size=25 * 1024)
+    assert path.read_bytes() == content_session.content
+    assert sorted(r[2] for r in content_session.requests[1:]) == [
+        "bytes=51200-76799",
+        "bytes=76800-102399",
+    ]
+
+
+def test_download_segmented_interrupted(base_url, token, content_session, tmp_path):
+    """Test an interrupted download is kept out of the output path."""
+    content_session.fail_ranges = {30720}
+    client = InvenioAPI(base_url, token, session=content_session)
+    f = client.records("1").files("data.bin")
+    path = tmp_path / "data.bin"
+    with pytest.raises(requests.ConnectionError):
+        f.download_segmented(path, segment_size=30 * 1024, max_workers=1)
+    assert not path.exists()
+    assert (tmp_path / "data.bin.part").exists()
+
+    # The segments already written are not fetched again.
+    content_session.requests = []
+    f.download_segmented(path, segment_size=30 * 1024, max_workers=1)
+    assert path.read_bytes() == content_session.content
+    assert not (tmp_path / "data.bin.part").exists()
+    assert "bytes=0-30719" not in [r[2] for r in content_session.requests]
+
+
+def map_file(path):
+    """Memory-map a file."""
+    with open(path, "rb") as fp:
+        return mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+@pytest.mark.parametrize(
+    "source,length",
+    [
+        (lambda p: p, "1000"),
+        (lambda p: str(p), "1000"),
+        (lambda p: open(p, "rb"), "1000"),
+        (lambda p: OutgoingStream(data=p), "1000"),
+        (lambda p: p.read_bytes(), "1000"),
+        (lambda p: memoryview(array.array("i", p.read_bytes())), "1000"),
+        (map_file, "1000"),
+        (lambda p: iter([p.read_bytes()[:500], p.read_bytes()[500:]]), None),
+    ],
+)
+def test_set_contents_sources(base_url, token, tmp_path, source, length):
+    """Test uploading the supported sources of data."""
+    path = tmp_path / "data.bin"
+    path.write_bytes(os.urandom(1000))
+    session = UploadSession()
+    client = InvenioAPI(base_url, token, session=session)
+    f = DraftFile(client, id_="1", filename="data.bin")
+    f.set_contents(source(path))
+    assert session.uploads == [(path.read_bytes(), length)]
+
+
+@pytest.mark.parametrize("as_path", [True, False])
+def test_upload_multipart(base_url, token, tmp_path, monkeypatch, as_path):
+    """Test uploading a file in parts, retrying the failed ones."""
+    monkeypatch.setattr("time.sleep", lambda s: None)
+    path = tmp_path / "data.bin"
+    path.write_bytes(os.urandom(10 * 1000 + 1))
+    session = MultipartSession(fail_parts=[2, 5])
+    client = InvenioAPI(base_url, token, session=session)
+    f = DraftFile(client, id_="1", filename="data.bin")
+
+    data = path if as_path else bytearray(path.read_bytes())
+    f.upload_multipart(data, part_size=1000)
+    assert session.init == [
+        {
+            "key": "data.bin",
+            "size": 10001,
+            "transfer": {"type": "M", "parts": 11, "part_size": 1000},
+        }
+    ]
+    assert b"".join(session.parts[p] for p in range(1, 12)) == path.read_bytes()
+    assert session.committed
+
+
+def test_upload_multipart_failure(base_url, token, tmp_path, monkeypatch):
+    """Test giving up on a part after the maximum number of retries."""
+    monkeypatch.setattr("time.sleep", lambda s: None)
+    session = MultipartSession(fail_parts=[1])
+    client = InvenioAPI(base_url, token, session=session)
+    f = DraftFile(client, id_="1", filename="data.bin")
+    with pytest.raises(requests.ConnectionError):
+        f.upload_multipart(b"data", max_retries=0)
+    assert not session.committed
+
+
+def test_upload_multipart_statuses(base_url, token, monkeypatch):
+    """Test only server errors of the parts are retried."""
+    monkeypatch.setattr("time.sleep", lambda s: None)
+    session = MultipartSession(fail_statuses={1: 503})
+    f = DraftFile(InvenioAPI(base_url, token, session=session), id_="1", filename="a")
+    f.upload_multipart(b"data")
+    assert session.attempts == {1: 2}
+    assert session.committed
+
+    session = MultipartSession(fail_statuses={1: 403})
+    f = DraftFile(InvenioAPI(base_url, token, session=session), id_="1", filename="a")
+    with pytest.raises(requests.HTTPError):
+        f.upload_multipart(b"data")
+    assert session.attempts == {1: 1}
+    assert not session.committed
+
+
+@pytest.mark.parametrize("status", [408, 429])
+def test_upload_multipart_throttled(base_url, token, monkeypatch, status):
+    """Test throttled parts are retried after their Retry-After delay."""
+    delays = []
+    monkeypatch.setattr("time.sleep", delays.append)
+    session = MultipartSession(
+        fail_statuses={1: status}, fail_headers={"Retry-After": "7"}
+    )
+    f = DraftFile(InvenioAPI(base_url, token, session=session), id_="1", filename="a")
+    f.upload_multipart(b"data")
+    assert session.attempts == {1: 2}
+    assert delays == [7.0]
+    assert session.committed
+
+
+def test_upload_multipart_cancel(base_url, token):
+    """Test the pending parts are cancelled when a part fails."""
+    session = MultipartSession(fail_statuses={1: 403})
+    f = DraftFile(InvenioAPI(base_url, token, session=session), id_="1", filename="a")
+    with pytest.raises(requests.HTTPError):
+        f.upload_multipart(b"0123456789", part_size=1, max_workers=1)
+    # The part started while the failure is handled may still be uploaded.
+    assert len(session.attempts) <= 2
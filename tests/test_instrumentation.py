@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# inveniordm-py is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+"""Test the instrumentation of the requests."""
+
+import json
+
+import pytest
+import requests
+
+from inveniordm_py import InvenioAPI
+from inveniordm_py.instrumentation import Histogram, Instrumentation, RequestEvent
+from inveniordm_py.ratelimit import RateLimiter
+from inveniordm_py.records.metadata import DraftMetadata
+
+from .mock.session import EchoSession
+
+
+def test_requests_are_recorded(base_url, token, minimal_record):
+    """Test requests are recorded per endpoint template."""
+    instrumentation = Instrumentation()
+    events = []
+    instrumentation.add_callback(events.append)
+    client = InvenioAPI(
+        base_url, token, session=EchoSession(), instrumentation=instrumentation
+    )
+
+    client.records.create(DraftMetadata(id="1234", **minimal_record))
+    client.records("1234").get()
+    client.records("5678").get()
+    client.records("1234").draft.get()
+
+    assert [(e.method, e.endpoint) for e in events] == [
+        ("POST", "/records"),
+        ("GET", "/records/{id_}"),
+        ("GET", "/records/{id_}"),
+        ("GET", "/records/{id_}/draft"),
+    ]
+    post = events[0]
+    assert post.status == 200
+    assert post.ttfb == 0.005
+    assert post.request_bytes == post.response_bytes > 100
+    assert events[1].request_bytes == 0
+
+    metrics = instrumentation.as_dict()
+    assert metrics["GET /records/{id_}"]["latency"]["count"] == 2
+    assert metrics["GET /records/{id_}"]["statuses"] == {"200": 2}
+    assert json.loads(instrumentation.to_json()) == metrics
+
+
+def test_retries_and_errors(base_url, token):
+    """Test retries and failed requests are recorded."""
+    instrumentation = Instrumentation()
+    events = []
+    instrumentation.add_callback(events.append)
+    limiter = RateLimiter(backoff=0.001)
+    session = EchoSession([503, 503])
+    client = InvenioAPI(
+        base_url,
+        token,
+        session=session,
+        rate_limiter=limiter,
+        instrumentation=instrumentation,
+    )
+
+    client.records("1234").get()
+    assert events[-1].retries == 2
+    with pytest.raises(requests.ConnectionError):
+        client.records("broken").get()
+    assert events[-1].status is None
+    assert isinstance(events[-1].error, requests.ConnectionError)
+
+    metrics = instrumentation.as_dict()["GET /records/{id_}"]
+    assert metrics["retries"] == 2
+    assert metrics["statuses"] == {"200": 1, "error": 1}
+
+
+def test_prometheus():
+    """Test the Prometheus text export."""
+    instrumentation = Instrumentation()
+    instrumentation.record(
+        RequestEvent("GET", '/a"b', "u", status=200, latency=0.02, retries=1)
+    )
+    instrumentation.record(RequestEvent("GET", '/a"b', "u", status=404, latency=2))
+    text = instrumentation.to_prometheus()
+    labels = 'method="GET",endpoint="/a\\"b"'
+    assert f'inveniordm_request_duration_seconds_bucket{{{labels},le="0.025"}} 1' in (
+        text
+    )
+    assert f'inveniordm_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in (
+        text
+    )
+    assert f"inveniordm_request_duration_seconds_count{{{labels}}} 2" in text
+    assert f'inveniordm_requests_total{{{labels},status="404"}} 1' in text
+    assert f"inveniordm_request_retries_total{{{labels}}} 1" in text
+    assert "# TYPE inveniordm_response_size_bytes histogram" in text
+
+
+def test_histogram():
+    """Test the cumulative buckets of a histogram."""
+    histogram = Histogram([1, 10])
+    for value in (0.5, 1, 5, 50):
+        histogram.observe(value)
+    assert histogram.cumulative() == [(1, 2), (10, 3), (float("inf"), 4)]
+    assert histogram.sum == 56.5
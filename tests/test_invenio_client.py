@@ -7,6 +7,18 @@
 
 """Module tests."""
 
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock
+
+from requests import Session
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
+from urllib3.util.retry import Retry
+
+from inveniordm_py import InvenioAPI
+
+from .mock.session import MockSession
+
 # from inveniordm_py import InvenioAPI
 
 
@@ -25,3 +37,77 @@
 
 #     assert r.data is not None
 #     assert r.versions.latest() is not None
+
+
+def test_connection_pool(base_url, token):
+    """Test the connection pools of the client."""
+    client = InvenioAPI(base_url, token, pool_maxsize=4)
+    adapter = client.session.get_adapter(base_url)
+    assert adapter._pool_maxsize == 4
+
+    client.ensure_pool_size(2)
+    manager = adapter.poolmanager
+    manager.connection_from_url(base_url)
+    client.ensure_pool_size(16)
+    assert client.pool_maxsize == 16
+    assert adapter._pool_maxsize == 16
+    # The replaced pool manager is cleared.
+    assert adapter.poolmanager is not manager
+    assert len(manager.pools) == 0
+
+
+def test_session_adapters(base_url, token):
+    """Test the adapters of a given session keep their settings."""
+    session = Session()
+    session.mount("https://", HTTPAdapter(max_retries=Retry(total=5)))
+    client = InvenioAPI(base_url, token, session=session)
+    adapter = session.get_adapter("https://")
+    assert adapter.max_retries.total == 5
+    assert adapter._pool_maxsize == DEFAULT_POOLSIZE
+
+    client.ensure_pool_size(16)
+    assert session.get_adapter("https://") is adapter
+    assert adapter.max_retries.total == 5
+    assert adapter._pool_maxsize == 16
+
+
+def test_keep_alive(base_url, token):
+    """Test disabling keep-alive."""
+    assert InvenioAPI(base_url, token).session.headers["Connection"] == "keep-alive"
+    client = InvenioAPI(base_url, token, keep_alive=False)
+    assert client.session.headers["Connection"] == "close"
+
+
+def test_timeout(base_url, token):
+    """Test the default timeout is passed to the requests."""
+    session = MockSession()
+    session.get = Mock(wraps=session.get)
+    client = InvenioAPI(base_url, token, session=session, timeout=(1, 5))
+    client.records.search()
+    assert session.get.call_args.kwargs["timeout"] == (1, 5)
+
+
+def test_warmup(token):
+    """Test opening connections ahead of requests."""
+    connections = set()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_HEAD(self):
+            connections.add(self.client_address)
+            self.send_response(200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        client = InvenioAPI(f"http://127.0.0.1:{server.server_port}/api", token)
+        assert client.warmup(4) == 4
+        assert len(connections) == 4
+    finally:
+        server.shutdown()
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# inveniordm-py is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+"""Test the deposit pipeline."""
+
+from inveniordm_py.pipeline import Deposit, DepositPipeline
+from inveniordm_py.records.resources import Draft, Record
+
+
+def test_pipeline(client, minimal_record):
+    """Test depositing records through the pipeline."""
+    deposits = [
+        Deposit(
+            minimal_record,
+            files={"a.txt": b"a" * i, "b.txt": memoryview(b"b" * i)},
+            publish=i % 2 == 0,
+        )
+        for i in range(10)
+    ]
+    # Invalid metadata, failing the first stage.
+    deposits.append(Deposit(42))
+
+    pipeline = DepositPipeline(client, create_workers=2, upload_workers=3)
+    report = pipeline.run(iter(deposits))
+
+    assert report.succeeded == 10
+    assert report.errors == [deposits[-1]]
+    assert deposits[-1].stage == "create"
+    assert isinstance(deposits[-1].error, TypeError)
+    for i, deposit in enumerate(deposits[:-1]):
+        assert isinstance(deposit.draft, Draft)
+        assert isinstance(deposit.record, Record) == (i % 2 == 0)
+
+    stages = report.stages
+    assert (stages["create"].succeeded, stages["create"].failed) == (10, 1)
+    assert (stages["upload"].succeeded, stages["publish"].succeeded) == (10, 10)
+    assert "10 succeeded, 1 failed" in str(report)
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# inveniordm-py is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+"""Test client-side rate limiting."""
+
+import time
+from unittest.mock import Mock
+
+import pytest
+import requests
+
+from inveniordm_py import InvenioAPI
+from inveniordm_py.ratelimit import RateLimiter, TokenBucket
+
+from .mock.session import ThrottlingSession
+
+
+def test_retry_after(base_url, token):
+    """Test throttled requests are retried after the given delay."""
+    session = ThrottlingSession([(429, {"Retry-After": "0.05"}), (503, {})])
+    limiter = RateLimiter(backoff=0.01)
+    client = InvenioAPI(base_url, token, session=session, rate_limiter=limiter)
+
+    start = time.monotonic()
+    record = client.records("1234").get()
+    assert time.monotonic() - start >= 0.05
+    assert record.data["id"] == "1234"
+    assert len(session.calls) == 3
+    # The server throttled the requests, the rate was lowered.
+    assert limiter.buckets["read"].rate is not None
+    assert limiter.buckets["search"].rate is None
+
+
+def test_max_retries(base_url, token):
+    """Test the error is raised once the retries are exhausted."""
+    session = ThrottlingSession([(429, {"Retry-After": "0"})] * 3)
+    limiter = RateLimiter(max_retries=1)
+    client = InvenioAPI(base_url, token, session=session, rate_limiter=limiter)
+
+    with pytest.raises(requests.HTTPError):
+        client.records("1234").get()
+    assert len(session.calls) == 2
+
+
+def test_categories(base_url, token):
+    """Test requests are limited by endpoint category."""
+    client = InvenioAPI(base_url, token, session=ThrottlingSession())
+    record = client.records("1234")
+    assert record._rate_limit_category("GET", record.url()) == "read"
+    assert record._rate_limit_category("POST", record.url()) == "write"
+    url = f"{base_url}/records/1234/files/data.csv/content"
+    assert record._rate_limit_category("GET", url) == "files"
+    assert record._rate_limit_category("PUT", f"{url}/2") == "files"
+
+
+def test_token_bucket():
+    """Test the token bucket limits and adapts the rate."""
+    bucket = TokenBucket(max_rate=20, burst=1)
+    start = time.monotonic()
+    for _ in range(3):
+        bucket.acquire()
+    assert time.monotonic() - start >= 0.09
+
+    bucket.throttled()
+    assert bucket.rate == 10
+    bucket.succeeded()
+    assert bucket.rate == pytest.approx(10.1)
+    assert bucket.pace(remaining=5, seconds=1)
+    assert bucket.rate == 5
+    assert not bucket.pace(remaining=50, seconds=1)
+    for _ in range(200):
+        bucket.succeeded()
+    assert bucket.rate == 20
+
+
+def test_rate_limit_headers():
+    """Test the requests are paced with the rate limit headers."""
+    limiter = RateLimiter()
+    reset = str(time.time() + 10)
+    response = Mock(
+        status_code=200,
+        headers={"X-RateLimit-Remaining": "20", "X-RateLimit-Reset": reset},
+    )
+    assert limiter.feedback("search", response, 0) is None
+    # The paced rate is not raised by the success of the same response.
+    assert limiter.buckets["search"].rate == pytest.approx(2, rel=0.01)
+    response.headers["X-RateLimit-Remaining"] = "1000"
+    limiter.feedback("search", response, 0)
+    assert limiter.buckets["search"].rate == pytest.approx(2.1, rel=0.01)
+
+    response.headers["X-RateLimit-Remaining"] = "0"
+    limiter.feedback("write", response, 0)
+    assert limiter.buckets["write"]._paused_until > time.monotonic() + 5
@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# inveniordm-py is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+"""Test client for records."""
+
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from urllib.parse import quote_plus
+
+import pytest
+
+from inveniordm_py import InvenioAPI
+from inveniordm_py.metadata import LazyHits
+from inveniordm_py.pagination import PartitionedPagination
+from inveniordm_py.records.metadata import RecordListMetadata
+from inveniordm_py.records.resources import Draft, Record, RecordList
+
+from .mock.handlers import RecordsListHandler
+from .mock.session import GetManySession, PartitionedSession
+
+
+def test_search(client):
+    """Test searching a page of records."""
+    page = client.records.search(size=10)
+    assert len(page) == 10
+    assert all(isinstance(r, Record) for r in page)
+    assert len(page.next_page()) == 10
+
+
+def test_search_memoized(client):
+    """Test the hits of a page are created once."""
+    page = client.records.search(size=10)
+    first, second = list(page), list(page)
+    assert all(a is b for a, b in zip(first, second))
+    assert not hasattr(first[0], "__dict__")
+    assert not hasattr(first[0].data, "__dict__")
+    data = RecordListMetadata(hits={"hits": [{"id": "1"}, {"id": "2"}]})
+    assert data.hits is data.hits
+    assert data.hits[0] is data.hits[0]
+    data["hits"] = {"hits": [{"id": "3"}]}
+    assert [h["id"] for h in data.hits] == ["3"]
+
+
+def test_search_hits_not_copied(client):
+    """Test the hits share their dictionaries with the page."""
+    page = client.records.search(size=10)
+    record = next(iter(page))
+    assert record.data._data is page._data_list._data["hits"]["hits"][0]
+    assert record.endpoint_args == {"id_": record.data["id"]}
+    assert record.url().endswith(f"/records/{record.data['id']}")
+
+
+@pytest.mark.parametrize("prefetch", [0, 1, 2])
+def test_scan(client, prefetch):
+    """Test iterating over all the pages of a search."""
+    ids = [r.data["id"] for r in client.records.scan(size=10, prefetch=prefetch)]
+    assert ids == list(range(RecordsListHandler.total))
+
+
+def test_scan_pages(client):
+    """Test the next links are followed until the last page."""
+    pages = list(client.records.scan(size=10).pages())
+    assert [len(p.hits) for p in pages] == [10, 10, 5]
+
+
+def test_scan_stop_early(client):
+    """Test stopping the iteration before the last page."""
+    for i, record in enumerate(client.records.scan(size=5, prefetch=1)):
+        if i == 7:
+            break
+    assert record.data["id"] == 7
+
+
+def test_scan_error(client, monkeypatch):
+    """Test errors of the background fetching are raised to the consumer."""
+
+    def raise_on_error(self, response):
+        raise RuntimeError("failed")
+
+    monkeypatch.setattr(RecordList, "raise_on_error", raise_on_error)
+    with pytest.raises(RuntimeError):
+        list(client.records.scan())
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_deep_scan(base_url, token, max_workers):
+    """Test scanning beyond the result window, without duplicates or gaps."""
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    records = [
+        # Some records share the same creation date.
+        {"id": str(i), "created": (start + timedelta(minutes=i // 3)).isoformat()}
+        for i in range(95)
+    ]
+    client = InvenioAPI(base_url, token, session=PartitionedSession(records))
+    ids = [
+        r.data["id"]
+        for r in client.records.deep_scan(
+            size=5, max_workers=max_workers, partition_size=10
+        )
+    ]
+    assert sorted(ids, key=int) == [r["id"] for r in records]
+
+
+def test_lazy_metadata(base_url, token):
+    """Test search pages are decoded lazily."""
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    records = [{"id": str(i), "created": start.isoformat()} for i in range(8)]
+    session = PartitionedSession(records)
+    client = InvenioAPI(base_url, token, session=session, lazy_metadata=True)
+
+    page = client.records.search(size=5, sort="oldest", q="")
+    assert page._data_list._raw is not None
+    assert len(page) == 5
+    assert page.total == 8
+    assert [r.data["id"] for r in page] == ["0", "1", "2", "3", "4"]
+
+    data = RecordListMetadata.from_response(
+        session.get(base_url, params={"size": 5, "sort": "newest", "q": ""}), lazy=True
+    )
+    assert data._raw is not None
+    assert isinstance(data.hits, LazyHits)
+    assert data._raw is None
+    assert data.hits[1] == {"id": "1", "created": start.isoformat()}
+    assert [h["id"] for h in data.hits[-2:]] == ["3", "4"]
+
+
+def test_deep_scan_empty(base_url, token):
+    """Test scanning an empty search."""
+    client = InvenioAPI(base_url, token, session=PartitionedSession([]))
+    assert list(client.records.deep_scan()) == []
+
+
+def test_deep_scan_buffer():
+    """Test the partitions are streamed through bounded buffers."""
+    produced = Counter()
+    counts = iter([150])
+
+    def scan(q):
+        for i in range(100):
+            produced[q] += 1
+            yield {"id": i}
+
+    pagination = PartitionedPagination(
+        lambda q: next(counts, 50),
+        scan,
+        "",
+        "created",
+        "2024-01-01T00:00:00+00:00",
+        "2024-01-02T00:00:00+00:00",
+        partition_size=100,
+        max_workers=2,
+        buffer_size=5,
+    )
+    hits = iter(pagination)
+    assert next(hits) == {"id": 0}
+    time.sleep(0.2)
+    assert len(produced) == 2
+    assert all(n <= 7 for n in produced.values())
+    hits.close()
+
+
+def test_get_many(base_url, token):
+    """Test getting many records by ID."""
+    indexed = {str(i) for i in range(100)}
+    session = GetManySession(indexed, restricted={"r1", "r2"})
+    client = InvenioAPI(base_url, token, session=session)
+
+    ids = ["5", "r1", "missing", "42", "r2", "5"] + [str(i) for i in range(50, 80)]
+    records = client.records.get_many(ids, chunk_size=8)
+    assert list(records) == list(dict.fromkeys(ids))
+    assert records["missing"] is None
+    assert all(isinstance(r, Record) for id_, r in records.items() if id_ != "missing")
+    assert records["r1"].data["id"] == "r1"
+    assert len(session.queries) == 5
+    assert sorted(session.gets) == ["missing", "r1", "r2"]
+
+    # Queries are bounded by their length.
+    session.queries.clear()
+    client.records.get_many([str(i) for i in range(20)], max_query_length=60)
+    assert all(len(quote_plus(q)) <= 60 for q in session.queries)
+    assert len(session.queries) > 1
+
+
+def test_get_many_errors(base_url, token):
+    """Test errors are returned with the records fetched."""
+    ids = {str(i) for i in range(10)}
+    session = GetManySession(indexed=ids, restricted=ids, failing={"3"})
+    client = InvenioAPI(base_url, token, session=session)
+
+    records = client.records.get_many([str(i) for i in range(10)], chunk_size=5)
+    # The IDs of the failed search are fetched one by one.
+    assert len(records.search_errors) == 1
+    assert sorted(session.gets) == ["0", "1", "2", "3", "4"]
+    assert records.missing == ["3"]
+    assert list(records.errors) == ["3"]
+    assert records.errors["3"].response.status_code == 500
+    assert all(records[str(i)].data["id"] == str(i) for i in range(10) if i != 3)
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_bulk_create(client, monkeypatch, ordered):
+    """Test creating drafts concurrently, isolating the failed ones."""
+    post = RecordList._post
+
+    def failing_post(self, metadata_class, data=None, **kwargs):
+        if data["title"] == "fail":
+            raise ValueError("failed")
+        return post(self, metadata_class, data=data, **kwargs)
+
+    monkeypatch.setattr(RecordList, "_post", failing_post)
+    items = [{"title": "fail" if i % 7 == 3 else f"{i}"} for i in range(30)]
+    results = list(
+        client.records.bulk_create(iter(items), concurrency=3, ordered=ordered)
+    )
+
+    assert sorted(r.index for r in results) == list(range(30))
+    if ordered:
+        assert [r.index for r in results] == list(range(30))
+    for r in results:
+        assert r.item is items[r.index]
+        if r.item["title"] == "fail":
+            assert not r.ok and isinstance(r.error, ValueError)
+        else:
+            assert r.ok and isinstance(r.result, Draft)
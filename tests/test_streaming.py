@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# inveniordm-py is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+"""Test the incremental parsing of search responses."""
+
+import json
+
+import pytest
+
+from inveniordm_py import InvenioAPI
+from inveniordm_py.records.resources import Record
+from inveniordm_py.streaming import HitsParser
+
+from .mock.session import StreamingSession
+
+HITS = [
+    {"id": "1", "metadata": {"title": 'Brackets ]}[{ and "quotes\\"'}},
+    {"id": "2", "hits": {"hits": [1, 2]}, "links": {"self": "x"}},
+    {"id": "3", "metadata": {"title": "Unicode éè \U0001f600"}},
+]
+
+DOCUMENT = {
+    "hits": {"hits": HITS, "total": 42},
+    "aggregations": {"type": {"buckets": [{"key": "hits", "doc_count": 3}]}},
+    "links": {"next": "https://127.0.0.1/api/records?page=2"},
+}
+
+
+def chunks(data, size):
+    """Split bytes in chunks."""
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("size", [1, 3, 17, 1024])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_parser(size, indent):
+    """Test hits are parsed whatever the chunk boundaries."""
+    body = json.dumps(DOCUMENT, indent=indent, ensure_ascii=False).encode()
+    parser = HitsParser()
+    hits = []
+    for chunk in chunks(body, size):
+        hits.extend(parser.feed(chunk))
+    hits.extend(parser.feed(b"", final=True))
+    assert hits == HITS
+    assert parser.close() == {**DOCUMENT, "hits": {"hits": [], "total": 42}}
+
+
+def test_parser_incremental():
+    """Test each hit is returned as soon as it is complete."""
+    body = json.dumps(DOCUMENT).encode()
+    parser = HitsParser()
+    end = body.index(b"}}", body.index(b'"id": "1"')) + 2
+    assert parser.feed(body[:end]) == HITS[:1]
+    # Only the incomplete hit is buffered.
+    assert len(parser._buffer) < 10
+    assert parser.feed(body[end:], final=True) == HITS[1:]
+    assert parser.close()["hits"]["total"] == 42
+
+
+def test_parser_large_hit():
+    """Test hits larger than the chunks are decoded."""
+    body = json.dumps({"hits": {"hits": [{"data": "x" * 10000}], "total": 1}})
+    parser = HitsParser()
+    hits = []
+    for chunk in chunks(body.encode(), 100):
+        hits.extend(parser.feed(chunk))
+        # The incomplete hit is only decoded again once the buffer doubled.
+        assert parser._retry_size <= 2 * len(parser._buffer)
+    hits.extend(parser.feed(b"", final=True))
+    assert hits == [{"data": "x" * 10000}]
+
+
+def test_parser_incomplete():
+    """Test truncated documents are detected."""
+    parser = HitsParser()
+    parser.feed(json.dumps(DOCUMENT).encode()[:-10])
+    with pytest.raises(ValueError):
+        parser.close()
+
+
+def test_search_stream(base_url, token):
+    """Test streaming the hits of a search."""
+    session = StreamingSession(json.dumps(DOCUMENT).encode())
+    client = InvenioAPI(base_url, token, session=session)
+
+    page = client.records.search(size=3, stream=True)
+    records = iter(page)
+    first = next(records)
+    assert isinstance(first, Record)
+    assert first.data["id"] == "1"
+    # Reading the total parses the rest of the page.
+    assert page.total == 42
+    assert session.closed == 1
+    assert [r.data["id"] for r in records] == ["2", "3"]
+    assert page.aggregations["type"]["buckets"][0]["key"] == "hits"
+    assert list(page) == []
+
+    page = client.records.search(size=3, stream=True)
+    assert page.total == 42
+    assert [r.data["id"] for r in page] == ["1", "2", "3"]
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# inveniordm-py is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+"""Test the incremental sync of records."""
+
+import json
+from datetime import timedelta
+
+import pytest
+
+from inveniordm_py.pagination import parse_datetime
+from inveniordm_py.testing import FakeInvenioRDM
+
+from .mock.data import dates
+
+
+def test_sync(tmp_path):
+    """Test only new and changed records are yielded."""
+    app = FakeInvenioRDM(max_result_window=10, seed=1)
+    records = app.populate(15, created=dates, updated=dates)
+    client = app.client()
+    checkpoint = tmp_path / "records.checkpoint"
+
+    def sync():
+        return [r.data["id"] for r in client.records.sync(str(checkpoint), size=4)]
+
+    # The first sync pages past the result window.
+    assert sorted(sync()) == sorted(app.records)
+    assert json.loads(checkpoint.read_text())["updated"] == dates(14)
+    assert sync() == []
+
+    app.update_record(records[3]["id"], metadata={"title": "Changed"})
+    (new,) = app.populate(1)
+    assert sorted(sync()) == sorted([records[3]["id"], new["id"]])
+    assert sync() == []
+
+    # A record indexed late, but within the overlap, is not missed.
+    mark = parse_datetime(json.loads(checkpoint.read_text())["updated"])
+    late = (mark - timedelta(seconds=10)).isoformat(timespec="milliseconds")
+    (skewed,) = app.populate(1, updated=late)
+    assert sync() == [skewed["id"]]
+
+
+def test_sync_ties(tmp_path):
+    """Test a sync cannot page past more ties than the result window."""
+    app = FakeInvenioRDM(max_result_window=4, seed=1)
+    app.populate(6, updated=dates(0))
+    with pytest.raises(ValueError):
+        list(app.client().records.sync(str(tmp_path / "checkpoint"), size=2))
+
+
+def test_sync_corrupt_checkpoint(tmp_path):
+    """Test an unreadable checkpoint starts the harvest over."""
+    app = FakeInvenioRDM(max_result_window=10, seed=1)
+    app.populate(5, created=dates, updated=dates)
+    checkpoint = tmp_path / "records.checkpoint"
+    checkpoint.write_bytes(b"\x00" * 10)
+    client = app.client()
+    ids = [r.data["id"] for r in client.records.sync(str(checkpoint), size=4)]
+    assert sorted(ids) == sorted(app.records)
+    assert json.loads(checkpoint.read_text())["updated"] == dates(4)
+    assert not (tmp_path / "records.checkpoint.tmp").exists()
+
+
+def test_sync_concurrent_update(tmp_path):
+    """Test a record updated during a sync does not shift another out."""
+    app = FakeInvenioRDM(max_result_window=100, seed=1)
+    records = app.populate(12, created=dates, updated=dates)
+    client = app.client()
+    checkpoint = str(tmp_path / "records.checkpoint")
+
+    ids = []
+    for record in client.records.sync(checkpoint, size=4):
+        if not ids:
+            app.update_record(records[0]["id"], metadata={"title": "Changed"})
+        ids.append(record.data["id"])
+    assert set(ids) == set(app.records)
+    assert [r.data["id"] for r in client.records.sync(checkpoint, size=4)] == []
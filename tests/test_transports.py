@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2024 CERN.
+#
+# inveniordm-py is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+"""Test the transports."""
+
+import gc
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from inveniordm_py import InvenioAPI
+from inveniordm_py.files.metadata import FilesListMetadata
+from inveniordm_py.records.metadata import DraftMetadata
+from inveniordm_py.testing import Conditions, FakeInvenioRDM, LocalServer
+from inveniordm_py.transports import (
+    HTTPXTransport,
+    RequestsTransport,
+    Urllib3Transport,
+    WSGITransport,
+    merge_headers,
+)
+
+
+@pytest.fixture(scope="module")
+def app():
+    """Fake InvenioRDM."""
+    return FakeInvenioRDM(seed=1)
+
+
+@pytest.fixture(scope="module")
+def server(app):
+    """Fake InvenioRDM on localhost."""
+    with LocalServer(app) as server:
+        yield server
+
+
+def httpx_transport():
+    """Create an HTTPX transport."""
+    pytest.importorskip("httpx")
+    return HTTPXTransport()
+
+
+@pytest.fixture(
+    params=[RequestsTransport, Urllib3Transport, httpx_transport, WSGITransport]
+)
+def client(request, app, server):
+    """Client of the fake InvenioRDM, with each transport."""
+    if request.param is WSGITransport:
+        return InvenioAPI(app.base_url, "token", transport=WSGITransport(app))
+    return InvenioAPI(server.url, "token", transport=request.param())
+
+
+def test_workflow(client, tmp_path):
+    """Test a deposit and the downloads of its files."""
+    path = tmp_path / "c.bin"
+    path.write_bytes(b"c" * 5000)
+
+    draft = client.records.create(DraftMetadata(metadata={"title": "Test"}))
+    entries = [{"key": "a.bin"}, {"key": "b.bin"}, {"key": "c.bin"}]
+    draft.files.create(FilesListMetadata(entries))
+    draft.files("a.bin").set_contents(memoryview(b"a" * 3000))
+    draft.files("b.bin").set_contents(iter([b"b" * 1000, b"b" * 1000]))
+    draft.files("c.bin").set_contents(str(path))
+    for entry in entries:
+        draft.files(entry["key"]).commit()
+    record = draft.publish()
+    id_ = record.data["id"]
+
+    assert client.records(id_).get().data["metadata"]["title"] == "Test"
+    assert id_ in [r.data["id"] for r in client.records.search(q=f'id:"{id_}"')]
+    chunks = list(client.records(id_).files("b.bin").iter_content(chunk_size=512))
+    assert max(map(len, chunks)) <= 512
+    assert b"".join(chunks) == b"b" * 2000
+    client.records(id_).files("c.bin").download_segmented(
+        tmp_path / "out", segment_size=1024
+    )
+    assert (tmp_path / "out").read_bytes() == path.read_bytes()
+
+    new = client.records(id_).versions.create()
+    files = new.import_files()
+    assert sorted(e["key"] for e in files.data["entries"]) == [
+        "a.bin",
+        "b.bin",
+        "c.bin",
+    ]
+
+    with pytest.raises(requests.HTTPError) as e:
+        client.records("missing").get()
+    assert e.value.response.status_code == 404
+
+
+def test_default_headers(app, server):
+    """Test the default headers, and that headers set to None are removed."""
+    transport = Urllib3Transport()
+    client = InvenioAPI(server.url, "secret", transport=transport)
+    assert client.session is None
+    assert transport.headers["Authorization"] == "Bearer secret"
+    headers = merge_headers(transport.headers, {"authorization": None, "X-A": "1"})
+    assert "Authorization" not in headers and headers["x-a"] == "1"
+    response = transport.request("GET", f"{server.url}/records", params={"q": None})
+    assert response.json()["hits"]["total"] == len(app.records)
+
+
+def test_pool_size(app, server):
+    """Test resizing the pools clears the replaced pool manager."""
+    transport = Urllib3Transport()
+    client = InvenioAPI(server.url, "secret", transport=transport)
+    client.records.search()
+    pool = transport.pool
+    assert len(pool.pools) == 1
+    client.ensure_pool_size(16)
+    assert transport.pool is not pool and len(pool.pools) == 0
+    assert transport.pool.connection_pool_kw["maxsize"] == 16
+    client.records.search()
+
+
+def test_session_and_transport(base_url, token):
+    """Test a session cannot be given with a transport."""
+    with pytest.raises(ValueError):
+        InvenioAPI(
+            base_url, token, session=requests.Session(), transport=Urllib3Transport()
+        )
+
+
+def test_connection_errors():
+    """Test connection errors are raised as the ones of requests."""
+    client = InvenioAPI(
+        "http://127.0.0.1:9/api", "token", transport=Urllib3Transport(), timeout=1
+    )
+    with pytest.raises(requests.ConnectionError):
+        client.records("1").get()
+
+
+def test_http2(base_url, token):
+    """Test the HTTP/2 mode of the client."""
+    pytest.importorskip("h2")
+    client = InvenioAPI(base_url, token, http2=True, max_streams=8)
+    assert client.transport.http2 and client.transport.max_concurrent_streams == 8
+    assert client.transport.headers["Authorization"] == f"Bearer {token}"
+    with pytest.raises(ValueError):
+        InvenioAPI(base_url, token, http2=True, transport=Urllib3Transport())
+
+
+def test_http2_multiplexing():
+    """Test concurrent requests are multiplexed over one HTTP/2 connection."""
+    pytest.importorskip("h2")
+    from .mock.http2 import HTTP2Server
+
+    with HTTP2Server() as server:
+        # Without TLS, HTTP/2 is only used with prior knowledge.
+        transport = HTTPXTransport(http2=True, http1=False, max_concurrent_streams=4)
+        client = InvenioAPI(server.url, "token", transport=transport)
+        assert client.records("0").get().data["id"] == "0"
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            records = list(
+                executor.map(lambda i: client.records(str(i)).get(), range(16))
+            )
+        assert [r.data["id"] for r in records] == [str(i) for i in range(16)]
+        assert server.streams == 17
+        assert server.connections == 1
+        transport.close()
+
+
+def test_max_concurrent_streams():
+    """Test the requests in flight are bounded by the number of streams."""
+    httpx = pytest.importorskip("httpx")
+    app = FakeInvenioRDM(conditions=Conditions(latency=0.02), seed=1)
+    records = app.populate(12)
+    lock = threading.Lock()
+    in_flight = [0, 0]
+
+    def counting_app(environ, start_response):
+        with lock:
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight)
+        try:
+            return list(app(environ, start_response))
+        finally:
+            with lock:
+                in_flight[0] -= 1
+
+    transport = HTTPXTransport(
+        client=httpx.Client(transport=httpx.WSGITransport(app=counting_app)),
+        max_concurrent_streams=2,
+    )
+    client = InvenioAPI(app.base_url, "token", transport=transport)
+    found = client.records.get_many(
+        [r["id"] for r in records], chunk_size=1, concurrency=6
+    )
+    assert all(r is not None for r in found.values())
+    assert in_flight[0] == 0 and in_flight[1] <= 2
+
+    # Streamed responses hold a stream until their body is read.
+    streams = transport._streams
+    response = transport.request("GET", f"{app.base_url}/records", stream=True)
+    response.raw.read(1)
+    assert streams.acquire(blocking=False) and not streams.acquire(blocking=False)
+    streams.release()
+    response.content
+    response.close()
+    assert streams.acquire(blocking=False) and streams.acquire(blocking=False)
+    streams.release()
+    streams.release()
+
+    # Or until they are garbage collected, if never read nor closed.
+    response = transport.request("GET", f"{app.base_url}/records", stream=True)
+    del response
+    gc.collect()
+    assert streams.acquire(blocking=False) and streams.acquire(blocking=False)